@@ -13,9 +13,10 @@ from __future__ import annotations
 import os
 from datetime import date
 from functools import wraps
+import hashlib
 import json
 from urllib.parse import urlencode
-import markdown as _md
+import click
 import PIL.Image
 
 from flask import (
@@ -30,10 +31,11 @@ from flask import (
     flash,
     jsonify,
     Response,
+    make_response,
 )
 from werkzeug.security import check_password_hash
 
-from py.db import init_db, get_conn
+from py.db import init_db, get_conn, close_conn
 from py.users import (
     create_user,
     login_user,
@@ -42,7 +44,7 @@ from py.users import (
     get_user_by_id,
     update_user_lang,
     get_all_users,
-    record_user_login,
+    touch_user_login,
     generate_api_key,
     revoke_api_key,
     get_user_by_api_key,
@@ -52,6 +54,7 @@ from py.users import (
 from py.helpers import (
     # data helpers
     load_data,
+    load_summaries,
     load_one,
     save_new_plant,
     update_plant,
@@ -86,8 +89,18 @@ from py.helpers import (
     duplicate_plant,
     build_location_tree,
     compute_attention,
+    end_current_phase,
+    rebuild_plant_summary,
+    verify_plant_summary,
+    data_version,
+    get_plant_owner_id,
+    render_markdown,
+    prewarm_all_translations,
+    translatable_texts,
 )
 from py.processing import sort_key, get_unique_locations
+from py.memo import LRUCache
+from py.label_cache import LabelCache, label_key
 from py.mcp import blueprint as mcp_blueprint
 from py.label_printer import (
     create_label_classic, create_label_circular,
@@ -108,16 +121,36 @@ app.template_filter("dateadd")(dateadd)
 def mdrender_filter(text):
     if not text:
         return ""
-    from markupsafe import Markup
-    return Markup(_md.markdown(text, extensions=["nl2br", "fenced_code", "tables"]))
+    return render_markdown(text)
 
 from py.translate import (
     translate_content, translate_html, tr,
-    list_cached_translations, update_cached_translation, delete_cached_translation,
-    backfill_source_text,
+    search_cached_translations, update_cached_translation, delete_cached_translation,
+    backfill_source_text, source_text_backfill_pending, prefetch_translations,
+    translation_cache_stats, run_translation_worker, translation_queue_counts,
+    collect_translation_garbage, last_translation_gc,
+    flush_translation_misses, translations_pending, translations_generation,
 )
 
 
+def _prefetch_translations(plants, notes=False):
+    """Look up every translation the plant templates will ask for (names and
+    event notes via t_content) in one query, so the filters below are served
+    from memory. ``notes`` adds the rendered plant notes, for the views that
+    show them through tr_md (plant pages, /list); rendering them costs a
+    Markdown pass per plant, so the other views leave it off."""
+    target = getattr(g, "lang", None)
+    if not plants or not target or not CONFIG.get("features", {}).get("translate_content", True):
+        return
+    texts = []
+    for p in plants:
+        texts.append(p.get("common"))
+        if notes and p.get("notes"):
+            texts.append(str(mdrender_filter(p["notes"])))
+        texts.extend(h.get("custom_note") for h in p.get("history") or ())
+    prefetch_translations(texts, target, getattr(g, "content_lang", None))
+
+
 @app.template_filter("t_content")
 def t_content_filter(text):
     """Translate user-generated free text into the current UI language."""
@@ -156,6 +189,21 @@ def _tr_md_global(text):
 init_db()
 app.register_blueprint(mcp_blueprint)
 
+
+@app.teardown_request
+def queue_translation_misses(exc):
+    """Queue the strings this request showed untranslated, in one write, and
+    run the translation prewarms its writes deferred; both off the render
+    path (see py.translate.flush_translation_misses)."""
+    flush_translation_misses()
+
+
+@app.teardown_appcontext
+def close_db_connection(exc):
+    """Release the request thread's SQLite connection."""
+    close_conn()
+
+
 def load_config():
     """Load configuration from config.json file."""
     config_path = "config.json"
@@ -166,6 +214,13 @@ def load_config():
             "public_profiles": True,
             "translate_content": True
         },
+        "http": {
+            "public_max_age": 300   # seconds proxies may serve /u/ and /p/ pages to anonymous visitors
+        },
+        "label_cache": {
+            "memory_mb": 32,   # rendered label bytes kept per worker
+            "disk_mb": 256     # shared files under data/label_cache; 0 disables
+        },
         "mcp": {
             "enabled": False,
             "user_id": 1,
@@ -246,8 +301,9 @@ def load_logged_in_user_and_language():
     g.user = get_user_by_id(uid) if uid else None
 
     if g.user:
-        # This handles both true logins and session resumes
-        record_user_login(g.user["id"])
+        # This handles both true logins and session resumes (throttled, so
+        # ordinary page views and AJAX calls don't each cost a write).
+        touch_user_login(g.user["id"])
 
     lang_param = request.args.get("lang")
 
@@ -266,8 +322,8 @@ def load_logged_in_user_and_language():
     # Resolve the active language with a clear precedence:
     #   1. a manual temporary override (the ?lang picker), for this session,
     #   2. logged-in users follow their saved account preference,
-    #   3. returning visitors keep their detected session choice,
-    #   4. first-time visitors are detected once from the browser, then remembered.
+    #   3. a session that has one keeps its language (e.g. after logging out),
+    #   4. anonymous visitors follow the browser's Accept-Language.
     override = session.get("lang_override")
     if override in AVAILABLE_LANGS:
         g.lang = override
@@ -279,7 +335,13 @@ def load_logged_in_user_and_language():
         browser_langs: LanguageAccept = request.accept_languages
         g.lang = browser_langs.best_match(AVAILABLE_LANGS) or "en"
 
-    session["lang"] = g.lang
+    # Remember a logged-in user's language for after they log out. Anonymous
+    # visitors get nothing written: a new session cookie would make every
+    # public page private, and Accept-Language is already in its Vary. Only
+    # write when it changes: assigning marks the session modified, and a
+    # modified session means a Set-Cookie on every response.
+    if g.user and session.get("lang") != g.lang:
+        session["lang"] = g.lang
 
     # Hint for translating user content: assume it was authored in the content
     # owner's language. Defaults to the logged-in user; views that display
@@ -332,12 +394,36 @@ def login_required_for_action(view):
 # Routes – dashboard & list views
 ###############################################################################
 
-def build_dashboard_context(user_obj, lang):
-    """Return the kwargs needed by either dashboard template."""
+# Computed dashboard contexts by (user id, lang), stored with the
+# data_version and date they were built for. Any plant/event write bumps
+# data_version, and the date makes the day-dependent parts (sorting,
+# attention, ages) roll over at midnight; either mismatch rebuilds the entry
+# in place, so a user never holds more than one context per language.
+_dashboard_cache = LRUCache(maxsize=256)
+
+
+def build_dashboard_context(user_obj, lang, notes=False):
+    """Return the kwargs needed by either dashboard template. ``notes`` is
+    passed on to _prefetch_translations, for templates that show them."""
     # Content shown here belongs to user_obj, so treat its language as theirs.
     g.content_lang = user_obj["lang"]
+    today = date.today()
+    key = (user_obj["id"], lang)
+    version = data_version(user_obj["id"])
+    entry = _dashboard_cache.get(key)
+    if entry is not None and entry[0] == version and entry[1] == today:
+        ctx = entry[2]
+    else:
+        ctx = _compute_dashboard_context(user_obj["id"], lang, today)
+        _dashboard_cache.put(key, (version, today, ctx))
+    _prefetch_translations(ctx["plants"], notes=notes)
+    # The owner row is not part of the key, so it is never cached.
+    return dict(ctx, owner=user_obj)
+
+
+def _compute_dashboard_context(user_id, lang, today):
     translations = get_translations(lang)
-    plants       = sorted(load_data(user_obj["id"]), key=sort_key)
+    plants       = sorted(load_data(user_id), key=sort_key)
     state_groups = group_plants_by_state(plants)
     left_col, right_col = build_state_cards(state_groups, include_dead=False)
     dead_count   = len(state_groups.get("Dead", []))
@@ -347,9 +433,8 @@ def build_dashboard_context(user_obj, lang):
         lang      = lang,
         t         = translations,
         plants    = plants,
-        today     = date.today(),
+        today     = today,
         duration_to_days = duration_to_days,
-        owner     = user_obj,
         state_groups = state_groups,
         left_col  = left_col,
         right_col = right_col,
@@ -376,26 +461,27 @@ def garden():
 @app.route("/list")
 @login_required
 def list_view():
-    ctx = build_dashboard_context(g.user, g.lang)
+    ctx = build_dashboard_context(g.user, g.lang, notes=True)
     return render_template("index.html", **ctx)
 
 @app.route("/graveyard")
 @login_required
 def graveyard():
     t      = get_translations(g.lang)
-    plants = load_data(g.user["id"])
+    plants = load_summaries(g.user["id"])
     dead   = sorted(
         [p for p in plants if p.get("state") and p["state"].get("label", "").lower() == "dead"],
         key=lambda p: (p.get("current") or {}).get("start", ""),
         reverse=True,
     )
+    _prefetch_translations(dead)
     return render_template("graveyard.html", dead=dead, t=t, lang=g.lang, today=date.today())
 
 @app.route("/stash")
 @login_required
 def stash():
     t      = get_translations(g.lang)
-    plants = load_data(g.user["id"])
+    plants = load_summaries(g.user["id"])
     ordered = sorted(
         [p for p in plants if p.get("state") and p["state"].get("label", "").lower() == "ordered"],
         key=lambda p: (p.get("current") or {}).get("start", ""),
@@ -406,6 +492,7 @@ def stash():
         key=lambda p: (p.get("current") or {}).get("start", ""),
         reverse=True,
     )
+    _prefetch_translations(ordered + stashed)
     return render_template("stash.html", ordered=ordered, stashed=stashed, t=t, lang=g.lang, today=date.today())
 
 
@@ -443,13 +530,51 @@ def receive_plant(idx):
     return redirect(url_for("stash"))
 
 
+def _conditional_public(owner, render):
+    """Serve a public page with an ETag, answering If-None-Match with 304
+    before render() loads any plants or runs a template.
+
+    The tag covers everything the page depends on: the path, the owner's
+    data_version and language (content translation), the translations
+    generation (admin corrections), the viewer's language and login, and the
+    date (ages and countdowns). A page that showed strings still waiting for translation
+    gets no tag and must be revalidated, since nothing in the tag changes
+    when they land. Anonymous responses may be cached by a proxy; anything
+    tied to a login or a new session cookie stays private."""
+    parts = (request.path, owner["id"], data_version(owner["id"]), owner["lang"], translations_generation(),
+             g.lang, g.user["id"] if g.user else None, date.today().isoformat())
+    etag = hashlib.sha1(repr(parts).encode()).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        resp = make_response(render())
+    if translations_pending():
+        resp.cache_control.no_cache = True
+        if g.user or session.modified:
+            resp.cache_control.private = True
+        return resp
+    resp.set_etag(etag)
+    if g.user or session.modified:
+        resp.cache_control.private = True
+        resp.cache_control.no_cache = True
+    else:
+        resp.cache_control.public = True
+        resp.cache_control.max_age = CONFIG.get("http", {}).get("public_max_age", 300)
+        resp.vary.add("Accept-Language")
+    return resp
+
+
 @app.route("/u/<username>")
 def public_view(username):
     user = get_user_by_username(username) or abort(404)
-    # Show the page in the viewer's resolved language; the owner's content is
-    # auto-translated (build_dashboard_context sets g.content_lang accordingly).
-    ctx  = build_dashboard_context(user, g.lang)
-    return render_template("new_home.html", public_view=True, **ctx)
+
+    def render():
+        # Show the page in the viewer's resolved language; the owner's content is
+        # auto-translated (build_dashboard_context sets g.content_lang accordingly).
+        ctx = build_dashboard_context(user, g.lang)
+        return render_template("new_home.html", public_view=True, **ctx)
+
+    return _conditional_public(user, render)
 
 @app.route("/plant/<int:idx>")
 @login_required
@@ -458,6 +583,7 @@ def view_plant(idx):
     if plant is None or plant["id"] is None:
         abort(404)
 
+    _prefetch_translations([plant], notes=True)
     return render_template(
         "plant.html",
         plant=plant,
@@ -469,26 +595,31 @@ def view_plant(idx):
 
 @app.route("/p/<int:idx>")
 def public_view_plant(idx):
-    plant = load_one(idx)
-    if plant is None or plant["id"] is None:
+    owner_id = get_plant_owner_id(idx)
+    if owner_id is None:
         abort(404)
 
-    if g.user and plant.get("user_id") == g.user["id"]:
+    if g.user and owner_id == g.user["id"]:
         return redirect(url_for("view_plant", idx=idx))
 
-    # Content belongs to the plant's owner; use their language as the hint.
-    owner = get_user_by_id(plant["user_id"])
-    g.content_lang = owner["lang"] if owner else None
+    owner = get_user_by_id(owner_id) or abort(404)
+
+    def render():
+        plant = load_one(idx) or abort(404)
+        # Content belongs to the plant's owner; use their language as the hint.
+        g.content_lang = owner["lang"]
+        _prefetch_translations([plant], notes=True)
+        return render_template(
+            "plant.html",
+            plant=plant,
+            lang=g.lang,
+            t=get_translations(g.lang),
+            duration_to_days = duration_to_days,
+            public_view=True,
+            today=date.today()
+        )
 
-    return render_template(
-        "plant.html",
-        plant=plant,
-        lang=g.lang,
-        t=get_translations(g.lang),
-        duration_to_days = duration_to_days,
-        public_view=True,
-        today=date.today()
-    )
+    return _conditional_public(owner, render)
 
 ###############################################################################
 # Routes – Admin
@@ -507,7 +638,7 @@ def admin_users():
     all_users = get_all_users()
     user_data = []
     for user in all_users:
-        plants = load_data(user["id"])
+        plants = load_summaries(user["id"])
         last_login = user["last_login"]
         user_data.append({
             "id":          user["id"],
@@ -534,27 +665,6 @@ def admin_users():
     )
 
 
-def _translation_source_candidates():
-    """Every stored string the app may have machine-translated, used to recover
-    the source text of cache rows that predate the source_text column."""
-    candidates = set()
-    with get_conn() as conn:
-        for r in conn.execute(
-                "SELECT common, location, notes FROM plants").fetchall():
-            for col in ("common", "location", "notes"):
-                if r[col]:
-                    candidates.add(r[col])
-            if r["notes"]:
-                # Notes are also cached as rendered-Markdown HTML (tr_md).
-                candidates.add(str(mdrender_filter(r["notes"])))
-        for r in conn.execute(
-                "SELECT custom_label, custom_note FROM events").fetchall():
-            for col in ("custom_label", "custom_note"):
-                if r[col]:
-                    candidates.add(r[col])
-    return candidates
-
-
 @app.route("/admin/translations")
 @login_required
 def admin_translations():
@@ -562,18 +672,25 @@ def admin_translations():
     if g.user["id"] != 1:
         abort(403)
     # Recover source text for entries cached before that column existed, so they
-    # become visible/editable here. A no-op once every row has it.
-    backfill_source_text(_translation_source_candidates())
+    # become visible/editable here. Runs once; `flask backfill-source-text` can
+    # do it ahead of time.
+    if source_text_backfill_pending():
+        backfill_source_text(translatable_texts())
     query       = (request.args.get("q") or "").strip() or None
     target_lang = request.args.get("lang_filter") or None
     if target_lang not in AVAILABLE_LANGS:
         target_lang = None
-    rows = list_cached_translations(query=query, target_lang=target_lang)
+    after       = request.args.get("after") or None
+    rows, next_after = search_cached_translations(query=query, target_lang=target_lang, after=after)
     return render_template(
         "admin_translations.html",
         rows=rows,
         query=query or "",
         lang_filter=target_lang or "",
+        after=after,
+        next_after=next_after,
+        cache_stats=translation_cache_stats(),
+        gc_report=last_translation_gc(),
         lang=g.lang,
         t=get_translations(g.lang),
     )
@@ -859,40 +976,88 @@ def _tr_label(text, target_lang, source_lang):
     return translate_content(text, target_lang, source_lang)
 
 
-def _make_label_image(plant, style, extra_notes=None, base_url=None,
-                      target_lang=None, source_lang=None):
+def _label_inputs(style, common, latin, date_str, variety, nickname, location,
+                  notes, extra_notes, plant_url):
+    """Everything a plant label renders from, as passed to _render_label and
+    hashed into its cache key. The URL only matters to the styles with a QR
+    code, so it is dropped for the rest."""
+    return {
+        "common": common, "latin": latin, "date": date_str,
+        "variety": variety, "nickname": nickname, "location": location,
+        "notes": notes, "extra_notes": extra_notes,
+        "plant_url": plant_url if style in ("detailed_h", "qr") else None,
+    }
+
+
+def _plant_label_inputs(plant, style, extra_notes=None, base_url=None,
+                        target_lang=None, source_lang=None):
     # Descriptive free-text is translated into the display language; the Latin
     # (scientific) name, variety and nickname are proper names shown verbatim —
     # the same split the plant page uses (common + notes translate, rest don't).
-    common      = _tr_label(plant.get("common", ""), target_lang, source_lang)
-    latin       = plant.get("latin",  "")
-    variety     = plant.get("variety") or None
-    nickname    = plant.get("nickname") or None
-    location    = _tr_label(plant.get("location"), target_lang, source_lang) or None
-    notes       = _tr_label(plant.get("notes"), target_lang, source_lang) or None
-    extra_notes = _tr_label(extra_notes, target_lang, source_lang) or None
     history     = plant.get("history") or []
     # Prefer the sown/planted date over the (earlier) order/acquire date, so the
     # label reflects when the plant actually started growing.
     label_ev    = next((e for e in history if e["action"] in ("sow", "plant")), None) \
                   or (history[0] if history else None)
-    date_str    = _format_date(label_ev["start"] if label_ev else None)
+    return _label_inputs(
+        style,
+        common      = _tr_label(plant.get("common", ""), target_lang, source_lang),
+        latin       = plant.get("latin",  ""),
+        date_str    = _format_date(label_ev["start"] if label_ev else None),
+        variety     = plant.get("variety") or None,
+        nickname    = plant.get("nickname") or None,
+        location    = _tr_label(plant.get("location"), target_lang, source_lang) or None,
+        notes       = _tr_label(plant.get("notes"), target_lang, source_lang) or None,
+        extra_notes = _tr_label(extra_notes, target_lang, source_lang) or None,
+        plant_url   = (base_url or request.url_root).rstrip("/") + "/p/" + str(plant.get("id", "")),
+    )
+
 
+def _render_label(style, f):
+    """Draw the label for ``style`` from _label_inputs / freetext inputs."""
+    if style == "freetext":
+        return create_label_freetext(f["title"], f["subtitle"], f["body"], qr_data=f["qr"])
+    args = (f["common"], f["latin"], f["date"], f["variety"], f["nickname"])
     if style == "circular":
-        return create_label_circular(common, latin, date_str, variety, nickname, extra_notes)
+        return create_label_circular(*args, f["extra_notes"])
     if style == "minimal":
-        return create_label_minimal(common, latin, date_str, variety, nickname, extra_notes)
+        return create_label_minimal(*args, f["extra_notes"])
     if style == "detailed_v":
-        return create_label_detailed_v(common, latin, date_str, variety, nickname, location, notes, extra_notes)
+        return create_label_detailed_v(*args, f["location"], f["notes"], f["extra_notes"])
     if style == "detailed_h":
-        plant_url = (base_url or request.url_root).rstrip("/") + "/p/" + str(plant.get("id", ""))
-        return create_label_detailed_h(common, latin, date_str, variety, nickname, location, notes, extra_notes, plant_url=plant_url)
+        return create_label_detailed_h(*args, f["location"], f["notes"], f["extra_notes"], plant_url=f["plant_url"])
     if style == "qr":
-        plant_url = (base_url or request.url_root).rstrip("/") + "/p/" + str(plant.get("id", ""))
-        return create_label_qr(common, latin, date_str, plant_url, variety, nickname, extra_notes)
+        common, latin, date_str, variety, nickname = args
+        return create_label_qr(common, latin, date_str, f["plant_url"], variety, nickname, f["extra_notes"])
     if style == "stake_wrap":
-        return create_label_stake_wrap(common, latin, date_str, variety, nickname, extra_notes)
-    return create_label_classic(common, latin, date_str, variety, nickname, extra_notes)
+        return create_label_stake_wrap(*args, f["extra_notes"])
+    return create_label_classic(*args, f["extra_notes"])
+
+
+# Rendered labels, content-addressed by style + inputs (see py/label_cache.py).
+# A miss renders once and stores both the preview PNG and the printer bytes.
+_label_cache_conf = CONFIG.get("label_cache", {})
+_label_cache = LabelCache(
+    max_memory_bytes=int(_label_cache_conf.get("memory_mb", 32) * 2**20),
+    max_disk_bytes=int(_label_cache_conf.get("disk_mb", 256) * 2**20),
+    directory=_label_cache_conf.get("directory"),
+)
+
+
+def _label_bytes(fmt, style, inputs):
+    """``"png"`` preview or ``"escpos"`` printer bytes for a label."""
+    key  = label_key(style, inputs)
+    data = _label_cache.get(key, fmt)
+    if data is None:
+        img = _render_label(style, inputs)
+        # Rotate the preview into reading orientation for sideways-printed
+        # labels. The bytes sent to the printer are unchanged.
+        preview = img.transpose(PIL.Image.ROTATE_90) if style in ("detailed_h", "stake_wrap") else img
+        rendered = {"png": label_to_png_bytes(preview), "escpos": label_to_printer_bytes(img)}
+        for kind, blob in rendered.items():
+            _label_cache.put(key, kind, blob)
+        data = rendered[fmt]
+    return data
 
 
 @app.route("/label_preview/<int:idx>")
@@ -904,15 +1069,11 @@ def label_preview(idx):
     style       = request.args.get("style", "classic")
     extra_notes = request.args.get("extra") or None
     base_url    = request.args.get("base_url") or None
-    img = _make_label_image(plant, style, extra_notes, base_url=base_url,
-                            target_lang=g.lang, source_lang=g.content_lang)
-    # Rotate the preview into reading orientation for sideways-printed labels.
-    # The bytes sent to the printer are unchanged; this only affects the preview.
-    if style in ("detailed_h", "stake_wrap"):
-        img = img.transpose(PIL.Image.ROTATE_90)
+    inputs = _plant_label_inputs(plant, style, extra_notes, base_url=base_url,
+                                 target_lang=g.lang, source_lang=g.content_lang)
     # The preview depends on the session display language, so it must never be
     # served from the browser cache after a language switch.
-    return Response(label_to_png_bytes(img), mimetype="image/png",
+    return Response(_label_bytes("png", style, inputs), mimetype="image/png",
                     headers={"Cache-Control": "no-store"})
 
 
@@ -954,8 +1115,8 @@ def freetext_label_preview():
     subtitle = request.args.get("subtitle") or None
     body     = request.args.get("body") or None
     qr       = request.args.get("qr") or None
-    img = create_label_freetext(title, subtitle, body, qr_data=qr)
-    return Response(label_to_png_bytes(img), mimetype="image/png",
+    inputs = {"title": title, "subtitle": subtitle, "body": body, "qr": qr}
+    return Response(_label_bytes("png", "freetext", inputs), mimetype="image/png",
                     headers={"Cache-Control": "no-store"})
 
 
@@ -1032,18 +1193,8 @@ def end_phase(idx):
         abort(403)
     data = request.get_json(silent=True) or {}
     ended = data.get("date") or date.today().isoformat()
-    with get_conn() as conn:
-        row = conn.execute(
-            """SELECT e.id, et.code FROM events e
-               JOIN event_types et ON et.id = e.event_type_id
-               WHERE e.plant_id = ? AND et.code IN ('flower','fruit')
-               ORDER BY e.happened_on DESC, e.id DESC LIMIT 1""",
-            (idx,),
-        ).fetchone()
-        if row is None:
-            return jsonify({"ok": False, "error": "No flower/fruit event found"}), 400
-        conn.execute("UPDATE events SET ended_on = ? WHERE id = ?", (ended, row["id"]))
-        conn.commit()
+    if not end_current_phase(idx, ended):
+        return jsonify({"ok": False, "error": "No flower/fruit event found"}), 400
     return jsonify({"ok": True})
 
 
@@ -1227,11 +1378,55 @@ def _event_detail(h):
     return ev
 
 
+_API_PLANT_FIELDS = ("id", "common", "latin", "variety", "location", "notes", "state", "last_event")
+_API_MAX_LIMIT = 1000
+
+
 @app.route("/api/plants", methods=["GET"])
 @_api_auth_required
 def api_list_plants():
-    plants = load_data(g.api_user["id"])
-    return jsonify([_plant_summary(p) for p in plants])
+    """All of the caller's plants, or one page of them.
+
+    Query parameters, all optional: ``limit`` (at most _API_MAX_LIMIT) and
+    ``cursor`` page in id order; the cursor of the next page comes back in
+    X-Next-Cursor and as a Link rel="next" URL. ``fields=id,common,…``
+    returns only those keys. ``state=`` (comma-separated codes or labels)
+    and ``location=`` (that location and everything below it, segments
+    compared trimmed, as in the location tree) filter."""
+    args = request.args
+    fields = [f.strip() for f in (args.get("fields") or "").split(",") if f.strip()]
+    unknown = [f for f in fields if f not in _API_PLANT_FIELDS]
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+    try:
+        limit = int(args["limit"]) if args.get("limit") else None
+        after_id = int(args["cursor"]) if args.get("cursor") else None
+    except ValueError:
+        return jsonify({"error": "limit and cursor must be integers"}), 400
+    if limit is not None:
+        limit = max(1, min(limit, _API_MAX_LIMIT))
+    states = [st.strip() for st in (args.get("state") or "").split(",") if st.strip()]
+
+    plants = load_summaries(
+        g.api_user["id"],
+        after_id=after_id,
+        limit=None if limit is None else limit + 1,  # one extra tells us there is a next page
+        states=states or None,
+        location=(args.get("location") or "").strip() or None,
+        with_current=not fields or "last_event" in fields,
+    )
+    more = limit is not None and len(plants) > limit
+    if more:
+        plants = plants[:limit]
+    rows = [_plant_summary(p) for p in plants]
+    if fields:
+        rows = [{f: row[f] for f in fields} for row in rows]
+    resp = jsonify(rows)
+    if more:
+        cursor = str(plants[-1]["id"])
+        resp.headers["X-Next-Cursor"] = cursor
+        resp.headers["Link"] = f'<{url_for("api_list_plants", **{**args.to_dict(), "cursor": cursor})}>; rel="next"'
+    return resp
 
 
 @app.route("/api/plants/<int:idx>", methods=["GET"])
@@ -1435,42 +1630,29 @@ def api_print_job_bytes(job_id):
     if not row:
         abort(404)
     if row["kind"] == "freetext":
-        img = create_label_freetext(row["title"], row["subtitle"], row["body"], qr_data=row["qr"])
-        return Response(label_to_printer_bytes(img), mimetype="application/octet-stream")
-    date_str    = _format_date(row["earliest_date"])
+        inputs = {"title": row["title"], "subtitle": row["subtitle"],
+                  "body": row["body"], "qr": row["qr"]}
+        return Response(_label_bytes("escpos", "freetext", inputs),
+                        mimetype="application/octet-stream")
     # Translate descriptive fields into the language chosen when the job was
     # queued. Source is the plant owner's account language. Latin name, variety
-    # and nickname stay verbatim — see _make_label_image.
+    # and nickname stay verbatim — see _plant_label_inputs.
     target_lang = row["lang"]
     source_lang = g.api_user["lang"]
-    common      = _tr_label(row["common"], target_lang, source_lang)
-    variety     = row["variety"]  or None
-    nickname    = row["nickname"] or None
-    location    = _tr_label(row["location"], target_lang, source_lang) or None
-    notes       = _tr_label(row["notes"], target_lang, source_lang) or None
-    extra_notes = _tr_label(row["extra_notes"], target_lang, source_lang) or None
     style       = row["style"]
-    latin       = row["latin"]
-
-    if style == "circular":
-        img = create_label_circular(common, latin, date_str, variety, nickname, extra_notes)
-    elif style == "minimal":
-        img = create_label_minimal(common, latin, date_str, variety, nickname, extra_notes)
-    elif style == "detailed_v":
-        img = create_label_detailed_v(common, latin, date_str, variety, nickname, location, notes, extra_notes)
-    elif style == "detailed_h":
-        base_url  = (row["base_url"] or request.url_root).rstrip("/")
-        plant_url = base_url + "/p/" + str(row["plant_id"])
-        img = create_label_detailed_h(common, latin, date_str, variety, nickname, location, notes, extra_notes, plant_url=plant_url)
-    elif style == "qr":
-        base_url  = (row["base_url"] or request.url_root).rstrip("/")
-        plant_url = base_url + "/p/" + str(row["plant_id"])
-        img = create_label_qr(common, latin, date_str, plant_url, variety, nickname, extra_notes)
-    elif style == "stake_wrap":
-        img = create_label_stake_wrap(common, latin, date_str, variety, nickname, extra_notes)
-    else:
-        img = create_label_classic(common, latin, date_str, variety, nickname, extra_notes)
-    return Response(label_to_printer_bytes(img), mimetype="application/octet-stream")
+    inputs = _label_inputs(
+        style,
+        common      = _tr_label(row["common"], target_lang, source_lang),
+        latin       = row["latin"],
+        date_str    = _format_date(row["earliest_date"]),
+        variety     = row["variety"]  or None,
+        nickname    = row["nickname"] or None,
+        location    = _tr_label(row["location"], target_lang, source_lang) or None,
+        notes       = _tr_label(row["notes"], target_lang, source_lang) or None,
+        extra_notes = _tr_label(row["extra_notes"], target_lang, source_lang) or None,
+        plant_url   = (row["base_url"] or request.url_root).rstrip("/") + "/p/" + str(row["plant_id"]),
+    )
+    return Response(_label_bytes("escpos", style, inputs), mimetype="application/octet-stream")
 
 
 @app.route("/api/print_queue/<int:job_id>/done", methods=["POST"])
@@ -1500,6 +1682,68 @@ def api_print_job_error(job_id):
     return jsonify({"ok": True})
 
 
+###############################################################################
+# CLI commands
+###############################################################################
+
+@app.cli.command("rebuild-plant-summary")
+@click.option("--check", is_flag=True, help="Only compare plant_summary with the event history.")
+def rebuild_plant_summary_command(check):
+    """Rebuild plant_summary from the events table and verify it."""
+    if not check:
+        rebuild_plant_summary()
+    problems = verify_plant_summary()
+    for plant_id, column, stored, expected in problems:
+        click.echo(f"plant {plant_id}: {column} is {stored!r}, expected {expected!r}")
+    if problems:
+        raise SystemExit(1)
+    click.echo("plant_summary matches the event history.")
+
+
+@app.cli.command("translation-worker")
+@click.option("--once", is_flag=True, help="Exit when the queue is empty.")
+def translation_worker_command(once):
+    """Run the background content translator in the foreground."""
+    done = run_translation_worker(stop_when_idle=once)
+    click.echo(f"{done} translation jobs processed; queue: {translation_queue_counts()}")
+
+
+@app.cli.command("backfill-source-text")
+def backfill_source_text_command():
+    """Recover the source text of translation cache rows that predate it."""
+    if not source_text_backfill_pending():
+        click.echo("Nothing to backfill.")
+        return
+    click.echo(f"{backfill_source_text(translatable_texts())} cache rows backfilled")
+
+
+@app.cli.command("gc-translations")
+def gc_translations_command():
+    """Delete cached translations whose source text no longer exists."""
+    report = collect_translation_garbage()
+    before, after = report["before"], report["after"]
+    click.echo(f"{report['deleted']} cached translations deleted: "
+               f"{before['rows']} -> {after['rows']} rows, "
+               f"{before['bytes'] / 1048576:.1f} -> {after['bytes'] / 1048576:.1f} MB")
+
+
+@app.cli.command("prewarm-translations")
+@click.option("--concurrency", default=4, show_default=True, type=click.IntRange(1),
+              help="Translation requests in flight at once.")
+@click.option("--user", "user_id", type=int, help="Only this user's content.")
+@click.option("--queue-only", is_flag=True, help="Queue the jobs but leave them to the workers.")
+def prewarm_translations_command(concurrency, user_id, queue_only):
+    """Translate existing content into every supported language ahead of time."""
+    from concurrent.futures import ThreadPoolExecutor
+    queued = prewarm_all_translations(user_id, start_workers=False)
+    click.echo(f"{queued} translation jobs queued")
+    if queue_only:
+        return
+    with ThreadPoolExecutor(concurrency) as pool:
+        done = sum(pool.map(lambda _: run_translation_worker(stop_when_idle=True), range(concurrency)))
+    click.echo(f"{done} translation jobs processed; queue: {translation_queue_counts()}")
+
+
 ###############################################################################
 # Main entry point
 ###############################################################################
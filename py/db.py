@@ -1,14 +1,62 @@
 import sqlite3
 import os
+import threading
 
 BASE_DIR   = os.path.dirname(os.path.abspath(__file__))
 DB_PATH    = os.path.join(BASE_DIR, '../data/plants.db')
 
-def get_conn():
+# Applied to every connection. WAL lets readers carry on while another worker
+# commits, and synchronous=NORMAL is crash-safe in WAL mode (only a power loss
+# can drop the last transactions). busy_timeout makes writers queue for the
+# lock instead of failing immediately with "database is locked".
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",       # negative = KiB, so ~16 MB
+    "PRAGMA mmap_size = 134217728",     # 128 MB
+    "PRAGMA busy_timeout = 5000",       # ms
+)
+
+_local = threading.local()
+
+# Stored in PRAGMA user_version once init_db() has brought a database up to
+# date. Bump it whenever SCHEMA, the seeded state/event types or _migrate()
+# change, otherwise existing databases will skip the new migration.
+SCHEMA_VERSION = 9
+
+
+def _connect():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+
+def get_conn():
+    """Return this thread's connection, opening it on first use.
+
+    Callers keep using ``with get_conn() as conn:`` — the block still commits
+    or rolls back on exit, it just no longer opens (and leaks) a fresh
+    connection each time. Flask closes it at the end of every request via
+    close_conn()."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path != DB_PATH:
+        close_conn()  # DB_PATH was repointed (scripts, benchmarks)
+        conn = None
+    if conn is None:
+        conn = _local.conn = _connect()
+        _local.path = DB_PATH
+    return conn
+
+
+def close_conn():
+    """Close this thread's connection, if any."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
+        conn.close()
+
 SCHEMA = """
 PRAGMA foreign_keys = ON;
 
@@ -18,7 +66,8 @@ CREATE TABLE IF NOT EXISTS users (
     pw_hash     TEXT        NOT NULL,
     lang        TEXT        NOT NULL DEFAULT 'en',
     created_at  TEXT NOT NULL DEFAULT (datetime('now')),
-    last_login  TEXT
+    last_login  TEXT,
+    data_version INTEGER NOT NULL DEFAULT 0  -- bumped on every plant/event write
 );
 
 CREATE TABLE IF NOT EXISTS user_daily_logins (
@@ -107,6 +156,7 @@ CREATE TABLE IF NOT EXISTS events (
 );
 
 CREATE TABLE IF NOT EXISTS translations_cache (
+  id          INTEGER PRIMARY KEY,     -- stable rowid, keys translations_fts
   source_hash TEXT NOT NULL,           -- sha256 of "<target_lang>:<original text>"
   target_lang TEXT NOT NULL,
   source_lang TEXT,                    -- optional, for "translated from X" labels
@@ -114,8 +164,47 @@ CREATE TABLE IF NOT EXISTS translations_cache (
   translated  TEXT NOT NULL,
   edited      INTEGER NOT NULL DEFAULT 0,  -- 1 = manually corrected by an admin
   created_at  TEXT NOT NULL DEFAULT (datetime('now')),
+  UNIQUE (source_hash, target_lang)
+);
+
+-- Pending machine translations, worked off by py.translate's background
+-- threads. One row per (source_hash, target_lang), like the cache itself.
+CREATE TABLE IF NOT EXISTS translation_jobs (
+  source_hash TEXT NOT NULL,
+  target_lang TEXT NOT NULL,
+  source_lang TEXT,
+  source_text TEXT NOT NULL,
+  fmt         TEXT NOT NULL DEFAULT 'text',     -- text | html
+  status      TEXT NOT NULL DEFAULT 'pending',  -- pending | running | failed
+  attempts    INTEGER NOT NULL DEFAULT 0,
+  error_msg   TEXT,
+  created_at  TEXT NOT NULL DEFAULT (datetime('now')),
+  updated_at  TEXT NOT NULL DEFAULT (datetime('now')),
   PRIMARY KEY (source_hash, target_lang)
 );
+CREATE INDEX IF NOT EXISTS idx_translation_jobs_status ON translation_jobs(status, created_at);
+
+-- Small process-wide settings and counters (see get_meta / bump_meta).
+CREATE TABLE IF NOT EXISTS app_meta (
+  key   TEXT PRIMARY KEY,
+  value                                  -- untyped: counters, flags, strings
+);
+
+-- One row per plant, derived from its events so list views need not load the
+-- full history. Kept current by refresh_plant_summary() on every event write.
+CREATE TABLE IF NOT EXISTS plant_summary (
+  plant_id         INTEGER PRIMARY KEY,
+  event_count      INTEGER NOT NULL DEFAULT 0,
+  current_event_id INTEGER,              -- newest event (happened_on, id)
+  first_sow_on     TEXT,
+  first_plant_on   TEXT,
+  first_sprout_on  TEXT,
+  measure_val      REAL,                 -- newest measurement
+  measure_unit     TEXT,
+  measure_on       TEXT,
+  phase_ended_on   TEXT,                 -- ended_on of the newest flower/fruit event
+  FOREIGN KEY(plant_id) REFERENCES plants(id) ON DELETE CASCADE
+);
 """
 
 def upsert_state_types(conn, state_types):
@@ -153,9 +242,59 @@ def upsert_event_types(conn, event_types):
         """, (label, color_class, icon_class, new_state_id, sort_rank, code))
 
 
-def init_and_fill_db():
+def get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM app_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_meta(conn, key, value):
+    conn.execute(
+        "INSERT INTO app_meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def bump_meta(conn, key):
+    """Increment an app_meta counter (starting at 1) and return its new value.
+    Runs in the caller's transaction."""
+    conn.execute(
+        "INSERT INTO app_meta (key, value) VALUES (?, 1) "
+        "ON CONFLICT(key) DO UPDATE SET value = value + 1",
+        (key,),
+    )
+    return get_meta(conn, key)
+
+
+def refresh_plant_summary(conn, plant_id=None):
+    """Recompute the plant_summary row of one plant, or of every plant when
+    plant_id is None. Runs on the caller's connection or cursor, inside its
+    transaction."""
+    newest = "ORDER BY e.happened_on DESC, e.id DESC LIMIT 1"
+    of_type = ("FROM events e JOIN event_types et ON et.id = e.event_type_id "
+               "WHERE e.plant_id = p.id AND et.code")
+    conn.execute(f"""
+        INSERT OR REPLACE INTO plant_summary
+            (plant_id, event_count, current_event_id,
+             first_sow_on, first_plant_on, first_sprout_on,
+             measure_val, measure_unit, measure_on, phase_ended_on)
+        SELECT p.id,
+               (SELECT COUNT(*) FROM events e WHERE e.plant_id = p.id),
+               (SELECT e.id FROM events e WHERE e.plant_id = p.id {newest}),
+               (SELECT MIN(e.happened_on) {of_type} = 'sow'),
+               (SELECT MIN(e.happened_on) {of_type} = 'plant'),
+               (SELECT MIN(e.happened_on) {of_type} = 'sprout'),
+               m.measure_val, m.measure_unit, m.happened_on,
+               (SELECT NULLIF(e.ended_on, '') {of_type} IN ('flower', 'fruit') {newest})
+        FROM plants p
+        LEFT JOIN events m ON m.id = (SELECT e.id {of_type} = 'measure' {newest})
+        {"" if plant_id is None else "WHERE p.id = ?"}
+    """, () if plant_id is None else (plant_id,))
+
+
+def init_and_fill_db(conn):
     # 1) create fresh schema if needed
-    with get_conn() as conn:
+    with conn:
         conn.executescript(SCHEMA)
         # 2) upsert state_types
         state_types = [
@@ -211,6 +350,30 @@ def _migrate(conn):
         conn.execute("ALTER TABLE translations_cache ADD COLUMN source_text TEXT")
     if "edited" not in tc_cols:
         conn.execute("ALTER TABLE translations_cache ADD COLUMN edited INTEGER NOT NULL DEFAULT 0")
+    # Give the table an INTEGER PRIMARY KEY so translations_fts can key on a
+    # rowid that VACUUM won't renumber. The old implicit rowids carry over as
+    # ids; the index is rebuilt on the new key below.
+    if "id" not in tc_cols:
+        conn.executescript("""
+            DROP TABLE IF EXISTS translations_fts;
+            CREATE TABLE translations_cache_new (
+              id          INTEGER PRIMARY KEY,
+              source_hash TEXT NOT NULL,
+              target_lang TEXT NOT NULL,
+              source_lang TEXT,
+              source_text TEXT,
+              translated  TEXT NOT NULL,
+              edited      INTEGER NOT NULL DEFAULT 0,
+              created_at  TEXT NOT NULL DEFAULT (datetime('now')),
+              UNIQUE (source_hash, target_lang)
+            );
+            INSERT INTO translations_cache_new
+              (id, source_hash, target_lang, source_lang, source_text, translated, edited, created_at)
+            SELECT rowid, source_hash, target_lang, source_lang, source_text, translated, edited, created_at
+            FROM translations_cache;
+            DROP TABLE translations_cache;
+            ALTER TABLE translations_cache_new RENAME TO translations_cache;
+        """)
 
     plant_cols = {row[1] for row in conn.execute("PRAGMA table_info(plants)").fetchall()}
     if "variety" not in plant_cols:
@@ -227,6 +390,8 @@ def _migrate(conn):
         conn.execute("ALTER TABLE users ADD COLUMN api_key_hash TEXT")
     if "api_key" not in user_cols:
         conn.execute("ALTER TABLE users ADD COLUMN api_key TEXT")
+    if "data_version" not in user_cols:
+        conn.execute("ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0")
 
     event_cols = {row[1] for row in conn.execute("PRAGMA table_info(events)").fetchall()}
     if "ended_on" not in event_cols:
@@ -290,6 +455,8 @@ def _migrate(conn):
               title       TEXT,
               subtitle    TEXT,
               body        TEXT,
+              lang        TEXT,
+              qr          TEXT,
               status      TEXT    NOT NULL DEFAULT 'pending',
               error_msg   TEXT,
               created_at  TEXT    NOT NULL DEFAULT (datetime('now')),
@@ -299,19 +466,105 @@ def _migrate(conn):
             );
             INSERT INTO print_jobs_new
               (id, user_id, plant_id, kind, style, extra_notes, base_url,
-               title, subtitle, body, status, error_msg, created_at, updated_at)
+               title, subtitle, body, lang, qr, status, error_msg, created_at, updated_at)
             SELECT id, user_id, plant_id, kind, style, extra_notes, base_url,
-                   title, subtitle, body, status, error_msg, created_at, updated_at
+                   title, subtitle, body, lang, qr, status, error_msg, created_at, updated_at
             FROM print_jobs;
             DROP TABLE print_jobs;
             ALTER TABLE print_jobs_new RENAME TO print_jobs;
         """)
 
+    # Locations are stored normalized so the location filter can compare
+    # them as strings; tidy rows saved before that.
+    from py.helpers import normalize_location  # helpers imports this module
+    conn.create_function("normalize_location", 1, normalize_location, deterministic=True)
+    conn.execute(
+        "UPDATE plants SET location = normalize_location(location) "
+        "WHERE location <> normalize_location(location)"
+    )
+
+    # Secondary indexes for the hot read paths (history loads, dashboard,
+    # state refresh, printer polling, API-key auth). Created last: rebuilding
+    # print_jobs above drops any index on the old table.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_events_plant ON events(plant_id, happened_on, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_plants_user ON plants(user_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_print_jobs_user_status ON print_jobs(user_id, status, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_users_api_key_hash ON users(api_key_hash)")
+    # Cache rows still awaiting backfill_source_text(); empty once it has run.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_translations_cache_no_source "
+        "ON translations_cache(target_lang) WHERE source_text IS NULL"
+    )
+    # Admin editor listing order, walked by keyset pagination.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_translations_cache_listing "
+        "ON translations_cache(edited, created_at)"
+    )
+    _migrate_translations_fts(conn)
+
     conn.commit()
 
 
-def init_db():
-    init_and_fill_db()
-    with get_conn() as conn:
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _migrate_translations_fts(conn):
+    """Full-text index over translations_cache (source and translated text)
+    for the admin editor's search. It is an external-content FTS5 table, so
+    it stores only the index. Triggers keep it in step with every write,
+    which is why translations_cache must be upserted, never REPLACEd: a
+    REPLACE deletes without firing the delete trigger. Keyed on the
+    table's INTEGER PRIMARY KEY, which VACUUM preserves (implicit rowids it
+    may renumber). Built from the existing rows on creation."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'translations_fts'"
+    ).fetchone()
+    conn.executescript("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS translations_fts USING fts5(
+          source_text, translated,
+          content = 'translations_cache', content_rowid = 'id',
+          tokenize = 'unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS translations_fts_ai AFTER INSERT ON translations_cache BEGIN
+          INSERT INTO translations_fts (rowid, source_text, translated)
+          VALUES (new.id, new.source_text, new.translated);
+        END;
+        CREATE TRIGGER IF NOT EXISTS translations_fts_ad AFTER DELETE ON translations_cache BEGIN
+          INSERT INTO translations_fts (translations_fts, rowid, source_text, translated)
+          VALUES ('delete', old.id, old.source_text, old.translated);
+        END;
+        CREATE TRIGGER IF NOT EXISTS translations_fts_au
+        AFTER UPDATE OF source_text, translated ON translations_cache BEGIN
+          INSERT INTO translations_fts (translations_fts, rowid, source_text, translated)
+          VALUES ('delete', old.id, old.source_text, old.translated);
+          INSERT INTO translations_fts (rowid, source_text, translated)
+          VALUES (new.id, new.source_text, new.translated);
+        END;
+    """)
+    if not exists:
+        conn.execute("INSERT INTO translations_fts (translations_fts) VALUES ('rebuild')")
+
+
+def init_db(force=False):
+    """Create or migrate the database, unless it is already at SCHEMA_VERSION.
+
+    Every worker calls this on import, so the common case is a single PRAGMA
+    read. ``force=True`` re-runs the full schema script and migrations."""
+    # A dedicated connection: SCHEMA switches foreign_keys on, which must not
+    # leak into the pooled per-thread connection.
+    conn = _connect()
+    try:
+        if not force and schema_version(conn) >= SCHEMA_VERSION:
+            return
+        init_and_fill_db(conn)
         _migrate(conn)
+        # Cheap next to the migrations, and covers databases created before
+        # plant_summary existed.
+        with conn:
+            refresh_plant_summary(conn)
+        # PRAGMA cannot take a bound parameter; SCHEMA_VERSION is an int.
+        conn.execute(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
+    finally:
+        conn.close()
 
@@ -14,14 +14,18 @@ that list views can show a plant’s latest status without an extra JOIN.
 
 from __future__ import annotations
 
+import hashlib
 import os
+import threading
 from datetime import datetime, timedelta
 from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 from markupsafe import Markup
+import markdown as _md
 import math
 
-from py.db import get_conn
+from py.db import get_conn, refresh_plant_summary
+from py.memo import LRUCache, cached, forget
 
 ###############################################################################
 # Utility helpers
@@ -124,10 +128,11 @@ def get_daily_unique_logins(start: str | None = None,
 @lru_cache(maxsize=None)
 def _event_type_map() -> Dict[str, Dict[str, Any]]:
     """Return a mapping {code: {id:…, new_state_id:…}} for all event types."""
-    with get_conn() as conn:
-        rows = conn.execute(
-            "SELECT id, code, new_state_id FROM event_types"
-        ).fetchall()
+    # No `with` block: the first call happens inside _insert_event, and leaving
+    # a `with` on the shared connection would commit the caller's transaction.
+    rows = get_conn().execute(
+        "SELECT id, code, new_state_id FROM event_types"
+    ).fetchall()
     return {r["code"]: {"id": r["id"], "new_state_id": r["new_state_id"]} for r in rows}
 
 
@@ -193,11 +198,8 @@ def build_state_cards(state_groups, include_dead=False):
     return left, right
 
 
-def _events_for_plant(conn, plant_id: int) -> List[Dict[str, Any]]:
-    """Return a list of event dicts (oldest→newest) for a given plant."""
-    rows = conn.execute(
-        """
-        SELECT e.id, et.code AS action, e.happened_on AS start,
+_EVENT_COLUMNS = """
+        SELECT e.id, e.plant_id, et.code AS action, e.happened_on AS start,
                e.range_min, e.range_min_u, e.range_max, e.range_max_u,
                e.dur_val,  e.dur_unit,
                e.measure_val, e.measure_unit,
@@ -205,65 +207,110 @@ def _events_for_plant(conn, plant_id: int) -> List[Dict[str, Any]]:
                e.ended_on, e.source, e.acquire_type, e.price, e.price_currency
         FROM events      e
         JOIN event_types et ON et.id = e.event_type_id
+"""
+
+
+def _event_from_row(a) -> Dict[str, Any]:
+    """Turn one events row (see _EVENT_COLUMNS) into a history event dict."""
+    ev: Dict[str, Any] = {
+        "id": a["id"],
+        "action": a["action"],
+        "start": a["start"],
+    }
+    if a["action"] == "sow":
+        ev["range"] = [a["range_min"], a["range_min_u"], a["range_max"], a["range_max_u"]]
+    elif a["action"] in ("soak", "strat"):
+        ev["duration"] = [a["dur_val"], a["dur_unit"]]
+    elif a["action"] == "measure":
+        ev["size"] = [a["measure_val"], a["measure_unit"]]
+    elif a["action"] == "custom":
+        ev["custom_label"] = a["custom_label"]
+        ev["custom_note"] = a["custom_note"]
+    elif a["action"] == "acquire":
+        ev["source"] = a["source"]
+        ev["acquire_type"] = a["acquire_type"]
+        if a["price"] is not None:
+            ev["price"] = a["price"]
+            ev["price_currency"] = a["price_currency"]
+    elif a["action"] == "order":
+        ev["source"] = a["source"]
+        if a["ended_on"]:
+            ev["expected_on"] = a["ended_on"]
+        if a["price"] is not None:
+            ev["price"] = a["price"]
+            ev["price_currency"] = a["price_currency"]
+    if a["action"] in ("flower", "fruit") and a["ended_on"]:
+        ev["ended_on"] = a["ended_on"]
+    return ev
+
+
+def _events_for_plant(conn, plant_id: int) -> List[Dict[str, Any]]:
+    """Return a list of event dicts (oldest→newest) for a given plant."""
+    rows = conn.execute(
+        _EVENT_COLUMNS + """
         WHERE e.plant_id = ?
         ORDER BY e.happened_on, e.id
         """,
         (plant_id,),
     ).fetchall()
+    return [_event_from_row(a) for a in rows]
 
-    hist: List[Dict[str, Any]] = []
+
+def _events_for_user(conn, user_id: int) -> Dict[int, List[Dict[str, Any]]]:
+    """Return {plant_id: [event dicts oldest→newest]} for every plant a user
+    owns, fetched with a single query instead of one per plant."""
+    rows = conn.execute(
+        _EVENT_COLUMNS + """
+        WHERE e.plant_id IN (SELECT id FROM plants WHERE user_id = ?)
+        ORDER BY e.plant_id, e.happened_on, e.id
+        """,
+        (user_id,),
+    )
+    by_plant: Dict[int, List[Dict[str, Any]]] = {}
     for a in rows:
-        ev: Dict[str, Any] = {
-            "id": a["id"],
-            "action": a["action"],
-            "start": a["start"],
-        }
-        if a["action"] == "sow":
-            ev["range"] = [a["range_min"], a["range_min_u"], a["range_max"], a["range_max_u"]]
-        elif a["action"] in ("soak", "strat"):
-            ev["duration"] = [a["dur_val"], a["dur_unit"]]
-        elif a["action"] == "measure":
-            ev["size"] = [a["measure_val"], a["measure_unit"]]
-        elif a["action"] == "custom":
-            ev["custom_label"] = a["custom_label"]
-            ev["custom_note"] = a["custom_note"]
-        elif a["action"] == "acquire":
-            ev["source"] = a["source"]
-            ev["acquire_type"] = a["acquire_type"]
-            if a["price"] is not None:
-                ev["price"] = a["price"]
-                ev["price_currency"] = a["price_currency"]
-        elif a["action"] == "order":
-            ev["source"] = a["source"]
-            if a["ended_on"]:
-                ev["expected_on"] = a["ended_on"]
-            if a["price"] is not None:
-                ev["price"] = a["price"]
-                ev["price_currency"] = a["price_currency"]
-        if a["action"] in ("flower", "fruit") and a["ended_on"]:
-            ev["ended_on"] = a["ended_on"]
-        hist.append(ev)
-    return hist
+        by_plant.setdefault(a["plant_id"], []).append(_event_from_row(a))
+    return by_plant
+
+
+def _phase_ended_on(history: List[Dict]) -> Optional[str]:
+    """ended_on of the most recent flower/fruit event, if any."""
+    for ev in reversed(history):
+        if ev["action"] in ("flower", "fruit"):
+            return ev.get("ended_on")
+    return None
 
 
 def _resolve_state(state: Optional[Dict], history: List[Dict], conn) -> Optional[Dict]:
     """If the most recent flower/fruit event has ended_on <= today, return Growing state instead."""
     if state is None or state.get("label") not in ("Flowering", "Fruiting"):
         return state
-    # Find the last flower/fruit event
-    for ev in reversed(history):
-        if ev["action"] in ("flower", "fruit"):
-            ended = ev.get("ended_on")
-            if ended and ended <= datetime.today().strftime("%Y-%m-%d"):
-                growing = conn.execute(
-                    "SELECT code, label, color_class, icon_class FROM state_types WHERE code = 'growing'"
-                ).fetchone()
-                return dict(growing) if growing else state
-            break
+    return _resolve_phase(state, _phase_ended_on(history), conn)
+
+
+def _resolve_phase(state: Optional[Dict], ended: Optional[str], conn) -> Optional[Dict]:
+    """_resolve_state() for callers that only have the phase's ended_on."""
+    if state is None or state.get("label") not in ("Flowering", "Fruiting"):
+        return state
+    if ended and ended <= datetime.today().strftime("%Y-%m-%d"):
+        growing = conn.execute(
+            "SELECT code, label, color_class, icon_class FROM state_types WHERE code = 'growing'"
+        ).fetchone()
+        return dict(growing) if growing else state
     return state
 
 
+def get_plant_owner_id(plant_id: int) -> Optional[int]:
+    """user_id of a plant, without loading it (None if it does not exist)."""
+    row = get_conn().execute("SELECT user_id FROM plants WHERE id = ?", (plant_id,)).fetchone()
+    return row[0] if row else None
+
+
 def load_one(plant_id: int) -> Optional[Dict[str, Any]]:
+    """Load one plant with its full history (memoized for the request)."""
+    return cached("plant", plant_id, lambda: _load_one(plant_id))
+
+
+def _load_one(plant_id: int) -> Optional[Dict[str, Any]]:
     with get_conn() as conn:
         p = conn.execute("SELECT * FROM plants WHERE id = ?", (plant_id,)).fetchone()
         if p is None:
@@ -311,6 +358,7 @@ def load_data(user_id: int) -> List[Dict[str, Any]]:
             LEFT JOIN state_types st ON st.id = p.current_state_id
             WHERE p.user_id = ?
         """, (user_id,)).fetchall()
+        histories = _events_for_user(conn, user_id)
 
         return [
             {
@@ -323,7 +371,7 @@ def load_data(user_id: int) -> List[Dict[str, Any]]:
                 "nickname": p["nickname"] if "nickname" in p.keys() else None,
                 "rusticity": p["rusticity"] if "rusticity" in p.keys() else None,
                 "count": p["count"] if "count" in p.keys() else 1,
-                "history": (hist := _events_for_plant(conn, p["id"])),
+                "history": (hist := histories.get(p["id"], [])),
                 "current": hist[-1] if hist else None,
                 "state": _resolve_state(
                     None if p["state_label"] is None else {
@@ -340,6 +388,167 @@ def load_data(user_id: int) -> List[Dict[str, Any]]:
         ]
 
 
+_SUMMARY_SELECT = """
+    SELECT p.*,
+           st.code        AS state_code,
+           st.label       AS state_label,
+           st.icon_class  AS state_icon,
+           st.color_class AS state_color,
+           st.sort_rank   AS state_rank,
+           s.event_count, s.current_event_id,
+           s.first_sow_on, s.first_plant_on, s.first_sprout_on,
+           s.measure_val, s.measure_unit, s.measure_on, s.phase_ended_on
+    FROM plants p
+    LEFT JOIN state_types   st ON st.id = p.current_state_id
+    LEFT JOIN plant_summary s  ON s.plant_id = p.id
+"""
+
+
+def load_summaries(
+    user_id: int,
+    *,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    states: Optional[List[str]] = None,
+    location: Optional[str] = None,
+    with_current: bool = True,
+) -> List[Dict[str, Any]]:
+    """Like load_data() but without ``history``: list views get ``current``,
+    ``state`` and a ``summary`` dict from plant_summary in two queries,
+    however many events the plants have.
+
+    The keyword filters run in SQL, for paging through big collections:
+    plants with ``id > after_id``, at most ``limit`` of them in id order;
+    ``states`` (codes or labels, any case) matched against the state as
+    shown, so an ended flowering counts as growing; ``location`` and any
+    location below it, compared after normalize_location().
+    ``with_current=False`` skips the second query and leaves ``current``
+    None."""
+    where, params = ["p.user_id = ?"], [user_id]
+    if after_id is not None:
+        where.append("p.id > ?")
+        params.append(after_id)
+    if states:
+        wanted = [st.lower() for st in states]
+        marks = ",".join("?" * len(wanted))
+        where.append(
+            "CASE WHEN st.label IN ('Flowering', 'Fruiting') AND s.phase_ended_on <= ? "
+            "THEN 'growing' ELSE st.code END IN ("
+            f"SELECT code FROM state_types WHERE lower(code) IN ({marks}) OR lower(label) IN ({marks}))"
+        )
+        params += [datetime.today().strftime("%Y-%m-%d"), *wanted, *wanted]
+    if location:
+        # A prefix compare rather than LIKE, which would ignore ASCII case
+        # where the location tree in the UI doesn't.
+        location = normalize_location(location)
+        prefix = location + LOCATION_SEP
+        where.append("(p.location = ? OR substr(p.location, 1, length(?)) = ?)")
+        params += [location, prefix, prefix]
+    sql = f"{_SUMMARY_SELECT} WHERE {' AND '.join(where)} ORDER BY p.id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    with get_conn() as conn:
+        plants = conn.execute(sql, params).fetchall()
+        current = {}
+        if with_current and plants:
+            current = {
+                a["plant_id"]: _event_from_row(a)
+                for a in conn.execute(
+                    _EVENT_COLUMNS + """
+                    JOIN plant_summary s ON s.current_event_id = e.id
+                    JOIN plants p ON p.id = s.plant_id
+                    WHERE p.user_id = ? AND p.id BETWEEN ? AND ?
+                    """,
+                    (user_id, plants[0]["id"], plants[-1]["id"]),
+                )
+            }
+
+        return [
+            {
+                "id": p["id"],
+                "common": p["common"],
+                "latin": p["latin"],
+                "location": p["location"],
+                "notes": p["notes"],
+                "variety": p["variety"],
+                "nickname": p["nickname"],
+                "rusticity": p["rusticity"],
+                "count": p["count"],
+                "current": current.get(p["id"]),
+                "state": _resolve_phase(
+                    None if p["state_label"] is None else {
+                        "code":        p["state_code"],
+                        "label":       p["state_label"],
+                        "icon_class":  p["state_icon"],
+                        "color_class": p["state_color"],
+                    },
+                    p["phase_ended_on"], conn
+                ),
+                "state_rank": p["state_rank"] if p["state_rank"] is not None else 999,
+                "summary": {
+                    "event_count":  p["event_count"] or 0,
+                    "first_sow":    p["first_sow_on"],
+                    "first_plant":  p["first_plant_on"],
+                    "first_sprout": p["first_sprout_on"],
+                    "last_measure": None if p["measure_on"] is None else {
+                        "val": p["measure_val"], "unit": p["measure_unit"], "date": p["measure_on"],
+                    },
+                },
+            }
+            for p in plants
+        ]
+
+
+def _summary_from_history(history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The plant_summary row for a history, computed the slow way."""
+    first: Dict[str, str] = {}
+    for ev in history:
+        first.setdefault(ev["action"], ev["start"])
+    measure = next((ev for ev in reversed(history) if ev["action"] == "measure"), None)
+    return {
+        "event_count":      len(history),
+        "current_event_id": history[-1]["id"] if history else None,
+        "first_sow_on":     first.get("sow"),
+        "first_plant_on":   first.get("plant"),
+        "first_sprout_on":  first.get("sprout"),
+        "measure_val":      measure["size"][0] if measure else None,
+        "measure_unit":     measure["size"][1] if measure else None,
+        "measure_on":       measure["start"] if measure else None,
+        "phase_ended_on":   _phase_ended_on(history),
+    }
+
+
+def verify_plant_summary() -> List[Tuple[int, str, Any, Any]]:
+    """Compare every plant_summary row with its full event history.
+    Returns (plant_id, column, stored, expected) for each difference."""
+    problems: List[Tuple[int, str, Any, Any]] = []
+    with get_conn() as conn:
+        stored = {r["plant_id"]: dict(r) for r in conn.execute("SELECT * FROM plant_summary")}
+        user_ids = [r[0] for r in conn.execute("SELECT DISTINCT user_id FROM plants")]
+        for user_id in user_ids:
+            histories = _events_for_user(conn, user_id)
+            for (plant_id,) in conn.execute("SELECT id FROM plants WHERE user_id = ?", (user_id,)):
+                row = stored.pop(plant_id, None)
+                if row is None:
+                    problems.append((plant_id, "*", None, "missing row"))
+                    continue
+                for col, want in _summary_from_history(histories.get(plant_id, [])).items():
+                    if row[col] != want:
+                        problems.append((plant_id, col, row[col], want))
+    problems.extend((plant_id, "*", "orphan row", None) for plant_id in stored)
+    return problems
+
+
+def rebuild_plant_summary() -> None:
+    """Recompute plant_summary for every plant from scratch."""
+    with get_conn() as conn:
+        conn.execute("DELETE FROM plant_summary")
+        refresh_plant_summary(conn)
+        conn.commit()
+
+
 ###############################################################################
 # Event insertion / update helpers
 ###############################################################################
@@ -420,6 +629,56 @@ def _insert_event(cur, plant_id: int, ev: Dict[str, Any]) -> None:
     # reflect new state (if any)
     if et["new_state_id"] is not None:
         cur.execute("UPDATE plants SET current_state_id = ? WHERE id = ?", (et["new_state_id"], plant_id))
+    refresh_plant_summary(cur, plant_id)
+
+
+def _touch_plant(cur, plant_id: int) -> None:
+    """Bump the owner's users.data_version; call inside every write that
+    changes a plant or its events. Caches of derived views key on it."""
+    cur.execute(
+        "UPDATE users SET data_version = data_version + 1"
+        " WHERE id = (SELECT user_id FROM plants WHERE id = ?)",
+        (plant_id,),
+    )
+
+
+def data_version(user_id: int) -> int:
+    """Current data_version of a user (0 for an unknown id)."""
+    row = get_conn().execute("SELECT data_version FROM users WHERE id = ?", (user_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def _forget_plant(plant_id: int) -> None:
+    """Drop request-memoized lookups that a write to ``plant_id`` made stale.
+    Event lookups embed the plant's names, so all of them go."""
+    forget("plant", plant_id)
+    forget("action")
+
+
+def _prewarm_plant(plant_id: int, plant_dict: Optional[Dict[str, Any]], ev: Optional[Dict[str, Any]]) -> None:
+    """Queue translations of the content just written to ``plant_id`` into
+    the other languages. Call after commit. Inside a request the work is
+    deferred until the response is built (see translate.defer_prewarm), so
+    the write's request never waits on it or fails because of it."""
+    from py.translate import content_translation_enabled, defer_prewarm  # translate imports this module
+    texts: List[Optional[str]] = []
+    notes: List[Optional[str]] = []
+    if plant_dict:
+        texts += (plant_dict.get("common"), normalize_location(plant_dict.get("location")))
+        notes.append(plant_dict.get("notes"))
+    if ev and ev.get("action") == "custom":
+        texts.append(ev.get("custom_note"))
+    if not (any(texts) or any(notes)) or not content_translation_enabled():
+        return
+    defer_prewarm(_prewarm_plant_texts, plant_id, texts, notes)
+
+
+def _prewarm_plant_texts(plant_id: int, texts, notes) -> None:
+    row = get_conn().execute(
+        "SELECT u.lang FROM plants p JOIN users u ON u.id = p.user_id WHERE p.id = ?", (plant_id,)
+    ).fetchone()
+    if row is not None:
+        _prewarm(row["lang"], texts, notes)
 
 
 ###############################################################################
@@ -435,7 +694,7 @@ def save_new_plant(plant_dict: Dict[str, Any], first_event: Dict[str, Any], user
             (
                 plant_dict["common"],
                 plant_dict["latin"],
-                plant_dict.get("location"),
+                normalize_location(plant_dict.get("location")),
                 plant_dict.get("notes"),
                 plant_dict.get("variety") or None,
                 plant_dict.get("nickname") or None,
@@ -446,8 +705,11 @@ def save_new_plant(plant_dict: Dict[str, Any], first_event: Dict[str, Any], user
         )
         plant_id = cur.lastrowid
         _insert_event(cur, plant_id, first_event)
+        _touch_plant(cur, plant_id)
         conn.commit()
-        return plant_id
+    _forget_plant(plant_id)
+    _prewarm_plant(plant_id, plant_dict, first_event)
+    return plant_id
 
 
 def update_plant(plant_id: int, plant_dict: Dict[str, Any], new_event: Optional[Dict[str, Any]] = None) -> None:
@@ -458,7 +720,7 @@ def update_plant(plant_id: int, plant_dict: Dict[str, Any], new_event: Optional[
             (
                 plant_dict["common"],
                 plant_dict["latin"],
-                plant_dict.get("location"),
+                normalize_location(plant_dict.get("location")),
                 plant_dict.get("notes"),
                 plant_dict.get("variety") or None,
                 plant_dict.get("nickname") or None,
@@ -469,7 +731,10 @@ def update_plant(plant_id: int, plant_dict: Dict[str, Any], new_event: Optional[
         )
         if new_event:
             _insert_event(cur, plant_id, new_event)
+        _touch_plant(cur, plant_id)
         conn.commit()
+    _forget_plant(plant_id)
+    _prewarm_plant(plant_id, plant_dict, new_event)
 
 
 ###############################################################################
@@ -541,10 +806,19 @@ def update_action(event_id: int, ev: Dict[str, Any]) -> None:  # ✓ kept name
         # Refresh plant state (may have changed if this is last event)
         plant_id = cur.execute("SELECT plant_id FROM events WHERE id = ?", (event_id,)).fetchone()[0]
         _refresh_current_state(cur, plant_id)
+        refresh_plant_summary(cur, plant_id)
+        _touch_plant(cur, plant_id)
         conn.commit()
+    _forget_plant(plant_id)
+    _prewarm_plant(plant_id, None, ev)
 
 
 def get_action_by_id(event_id: int) -> Optional[Dict[str, Any]]:  # ✓ kept name
+    """Load one event with its plant's names (memoized for the request)."""
+    return cached("action", event_id, lambda: _get_action_by_id(event_id))
+
+
+def _get_action_by_id(event_id: int) -> Optional[Dict[str, Any]]:
     with get_conn() as conn:
         a = conn.execute(
             """
@@ -615,16 +889,43 @@ def process_delete_action(event_id: int, user_id: int) -> None:  # ✓ kept name
         plant_id = row["plant_id"]
         cur.execute("DELETE FROM events WHERE id = ?", (event_id,))
         _refresh_current_state(cur, plant_id)
+        refresh_plant_summary(cur, plant_id)
+        _touch_plant(cur, plant_id)
         conn.commit()
+    _forget_plant(plant_id)
+
+
+def end_current_phase(plant_id: int, ended_on: str) -> bool:
+    """Set ``ended_on`` on the plant's most recent flower/fruit event.
+    Returns False if the plant has no such event."""
+    with get_conn() as conn:
+        row = conn.execute(
+            """SELECT e.id FROM events e
+               JOIN event_types et ON et.id = e.event_type_id
+               WHERE e.plant_id = ? AND et.code IN ('flower','fruit')
+               ORDER BY e.happened_on DESC, e.id DESC LIMIT 1""",
+            (plant_id,),
+        ).fetchone()
+        if row is None:
+            return False
+        conn.execute("UPDATE events SET ended_on = ? WHERE id = ?", (ended_on, row["id"]))
+        refresh_plant_summary(conn, plant_id)
+        _touch_plant(conn, plant_id)
+        conn.commit()
+    _forget_plant(plant_id)
+    return True
 
 
 def process_delete_plant(plant_id: int, user_id: int) -> None:
     with get_conn() as conn:
         cur = conn.cursor()
         if cur.execute("SELECT 1 FROM plants WHERE id = ? AND user_id = ?", (plant_id, user_id)).fetchone():
+            _touch_plant(cur, plant_id)  # while the plant row still exists
             cur.execute("DELETE FROM events WHERE plant_id = ?", (plant_id,))
+            cur.execute("DELETE FROM plant_summary WHERE plant_id = ?", (plant_id,))
             cur.execute("DELETE FROM plants WHERE id = ?", (plant_id,))
             conn.commit()
+    _forget_plant(plant_id)
 
 
 def _clone_plant_row(conn, src_id: int) -> int:
@@ -651,6 +952,7 @@ def _clone_plant_row(conn, src_id: int) -> int:
             "VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
             (new_id,) + tuple(ev),
         )
+    refresh_plant_summary(cur, new_id)
     return new_id
 
 
@@ -663,6 +965,7 @@ def duplicate_plant(plant_id: int, user_id: int, count: int = 1) -> List[int]:
     count = max(1, count)
     with get_conn() as conn:
         new_ids = [_clone_plant_row(conn, plant_id) for _ in range(count)]
+        _touch_plant(conn, plant_id)
         conn.commit()
     return new_ids
 
@@ -711,6 +1014,73 @@ AVAILABLE_LANGS = [lang["code"] for lang in LANGUAGES]
 LANG_FLAGS = {lang["code"]: lang["flag"] for lang in LANGUAGES}
 
 
+_MD_EXTENSIONS = ["nl2br", "fenced_code", "tables"]
+_md_local = threading.local()  # one configured Markdown converter per thread
+# Rendered notes by a hash of their source, shared by all threads. A note is
+# rendered for display, again for its translation lookup, and for every
+# backfill/GC pass, but only changes when its text does.
+_markdown_cache = LRUCache(4096)
+
+
+def render_markdown(text: str) -> Markup:
+    """Render user Markdown (plant notes) to HTML, as the ``mdrender`` filter
+    shows it. Translations of notes are cached under this exact HTML."""
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    html = _markdown_cache.get(key)
+    if html is None:
+        md = getattr(_md_local, "md", None)
+        if md is None:
+            md = _md_local.md = _md.Markdown(extensions=_MD_EXTENSIONS)
+        html = Markup(md.reset().convert(text))
+        _markdown_cache.put(key, html)
+    return html
+
+
+def _prewarm(source_lang: str, texts, notes, start_workers: bool = True) -> int:
+    from py.translate import content_translation_enabled, prewarm_translations  # translate imports this module
+    if not content_translation_enabled():
+        return 0
+    html = [str(render_markdown(n)) for n in notes if n]
+    return prewarm_translations([*texts, *notes], html, source_lang, start_workers=start_workers)
+
+
+def translatable_texts() -> set:
+    """Every stored string the app may show machine-translated: plant names,
+    locations and notes (also as rendered Markdown, which tr_md translates),
+    custom event notes, and label extra notes."""
+    conn = get_conn()
+    texts = set()
+    for r in conn.execute("SELECT common, location, notes FROM plants"):
+        texts.update((r["common"], r["location"], r["notes"]))
+        if r["notes"]:
+            texts.add(str(render_markdown(r["notes"])))
+    texts.update(r[0] for r in conn.execute(
+        "SELECT custom_note FROM events WHERE custom_note IS NOT NULL"))
+    texts.update(r[0] for r in conn.execute("SELECT extra_notes FROM print_jobs"))
+    texts.discard(None)
+    texts.discard("")
+    return texts
+
+
+def prewarm_all_translations(user_id: Optional[int] = None, start_workers: bool = True) -> int:
+    """Queue translations of every stored plant/event string (or one user's)
+    into each other language. Returns the number of jobs written."""
+    conn = get_conn()
+    where, params = ("WHERE u.id = ?", (user_id,)) if user_id is not None else ("", ())
+    queued = 0
+    for user in conn.execute(f"SELECT u.id, u.lang FROM users u {where}", params).fetchall():
+        texts: List[Optional[str]] = []
+        notes: List[Optional[str]] = []
+        for r in conn.execute("SELECT common, location, notes FROM plants WHERE user_id = ?", (user["id"],)):
+            texts += (r["common"], r["location"])
+            notes.append(r["notes"])
+        texts += (r[0] for r in conn.execute(
+            "SELECT e.custom_note FROM events e JOIN plants p ON p.id = e.plant_id "
+            "WHERE p.user_id = ? AND e.custom_note IS NOT NULL", (user["id"],)))
+        queued += _prewarm(user["lang"], texts, notes, start_workers=start_workers)
+    return queued
+
+
 def duration_to_days(val: int, unit: str) -> int:
     if unit == "months":
         return val * 30
@@ -734,6 +1104,16 @@ def parse_location_path(location_str: Optional[str]) -> List[str]:
     return [s.strip() for s in location_str.split(LOCATION_SEP) if s.strip()]
 
 
+def normalize_location(location_str: Optional[str]) -> Optional[str]:
+    """``location_str`` as the location tree spells it: segments trimmed,
+    empty ones dropped ("Garden / Bed 1 " -> "Garden/Bed 1"). Locations are
+    stored this way and filters are normalized the same, so the two compare
+    as plain strings."""
+    if not location_str:
+        return location_str
+    return LOCATION_SEP.join(parse_location_path(location_str))
+
+
 def build_location_tree(plants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Build a flat, depth-annotated list of location nodes from a list of plants.
@@ -741,71 +1121,39 @@ def build_location_tree(plants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     Sorted top-level alphabetically, children follow their parent immediately.
     Plants with no location accumulate under full_path=None.
     """
-    from collections import defaultdict, OrderedDict
-
-    # count how many plants live at each exact full_path
-    path_counts: Dict[str, int] = defaultdict(int)
+    # Prefix trie: segment -> [plants at exactly this path, {child segment -> node}]
+    root: Dict[str, list] = {}
     no_location_count = 0
 
     for p in plants:
         path = parse_location_path(p.get("location"))
         if not path:
             no_location_count += 1
-        else:
-            full = LOCATION_SEP.join(path)
-            path_counts[full] += 1
-            # also credit every ancestor
-            for depth in range(1, len(path)):
-                ancestor = LOCATION_SEP.join(path[:depth])
-                path_counts[ancestor] += 0  # ensure key exists but don't double-count
-
-    # build a set of all nodes (including intermediates)
-    all_nodes: Dict[str, List[str]] = {}  # full_path -> path segments
-    for p in plants:
-        path = parse_location_path(p.get("location"))
-        for depth in range(1, len(path) + 1):
-            fp = LOCATION_SEP.join(path[:depth])
-            if fp not in all_nodes:
-                all_nodes[fp] = path[:depth]
-
-    # compute cumulative count for each node (plants at node + all descendants)
-    def count_for(fp: str) -> int:
-        return sum(
-            cnt for pfp, cnt in path_counts.items()
-            if pfp == fp or pfp.startswith(fp + LOCATION_SEP)
-        )
-
-    # build flat sorted list depth-first
+            continue
+        children = root
+        for seg in path:
+            node = children.get(seg)
+            if node is None:
+                node = children[seg] = [0, {}]
+            children = node[1]
+        node[0] += 1
+
+    # Depth-first, siblings sorted. A node is appended before its subtree and
+    # its count (own plants + all descendants) filled in once that returns.
     result: List[Dict[str, Any]] = []
 
-    def _recurse(prefix: Optional[str], depth: int):
-        children = sorted(
-            (fp for fp, segs in all_nodes.items()
-             if len(segs) == depth + 1 and (
-                 prefix is None and depth == 0 or
-                 (prefix is not None and fp.startswith(prefix + LOCATION_SEP) and len(fp.split(LOCATION_SEP)) == depth + 1)
-                 or (depth == 0)
-             )),
-        )
-        # top level: segments of length 1
-        if depth == 0:
-            children = sorted(fp for fp, segs in all_nodes.items() if len(segs) == 1)
-        else:
-            children = sorted(
-                fp for fp, segs in all_nodes.items()
-                if len(segs) == depth + 1 and fp.startswith(prefix + LOCATION_SEP)
-            )
-        for fp in children:
-            segs = all_nodes[fp]
-            result.append({
-                "label":     segs[-1],
-                "full_path": fp,
-                "depth":     depth,
-                "count":     count_for(fp),
-            })
-            _recurse(fp, depth + 1)
-
-    _recurse(None, 0)
+    def _emit(children: Dict[str, list], prefix: str, depth: int) -> int:
+        total = 0
+        for label in sorted(children):
+            own, sub = children[label]
+            fp = prefix + label
+            entry = {"label": label, "full_path": fp, "depth": depth, "count": 0}
+            result.append(entry)
+            entry["count"] = own + _emit(sub, fp + LOCATION_SEP, depth + 1)
+            total += entry["count"]
+        return total
+
+    _emit(root, "", 0)
 
     if no_location_count:
         result.append({
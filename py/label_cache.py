@@ -0,0 +1,142 @@
+"""Content-addressed cache of rendered labels.
+
+A label is a pure function of its style and the final text that goes on it,
+so ``label_key()`` hashes exactly that (plus ``LABEL_RENDERER_VERSION``) and
+the PNG preview and ESC/POS printer bytes are stored under the key. Previewing
+a label fills both, so printing it afterwards skips rendering entirely.
+
+Entries live in an in-process LRU bounded by total bytes, backed by files
+under ``<directory>/<key[:2]>/<key>.<fmt>`` that are shared between workers
+and survive restarts. The directory is pruned, least recently used first,
+once it grows past its limit. The disk side is best-effort: an I/O error
+just means a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from py import db
+from py.label_printer import LABEL_RENDERER_VERSION
+from py.memo import LRUCache
+
+FORMATS = ("png", "escpos")
+
+
+def label_key(style: str, inputs: Dict[str, Any]) -> str:
+    """Hex digest identifying the label ``style`` renders from ``inputs``."""
+    blob = json.dumps([LABEL_RENDERER_VERSION, style, inputs],
+                      sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LabelCache:
+    """Rendered label bytes by (key, format), in memory and on disk.
+
+    ``directory`` defaults to ``label_cache`` next to the database, resolved
+    on use so scripts that repoint ``db.DB_PATH`` get their own. A
+    ``max_disk_bytes`` of 0 keeps the cache in memory only."""
+
+    def __init__(self, max_memory_bytes: int, max_disk_bytes: int,
+                 directory: Optional[str] = None):
+        self.max_disk_bytes = max_disk_bytes
+        self._directory = directory
+        self._memory = LRUCache(max_memory_bytes, weigh=len)
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None   # unknown until the first write
+
+    @property
+    def directory(self) -> str:
+        return self._directory or os.path.join(os.path.dirname(db.DB_PATH), "label_cache")
+
+    def _path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.{fmt}")
+
+    def get(self, key: str, fmt: str) -> Optional[bytes]:
+        data = self._memory.get((key, fmt))
+        if data is not None or not self.max_disk_bytes:
+            return data
+        path = self._path(key, fmt)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)   # mtime doubles as last use for pruning
+        except OSError:
+            return None
+        self._memory.put((key, fmt), data)
+        return data
+
+    def put(self, key: str, fmt: str, data: bytes) -> None:
+        self._memory.put((key, fmt), data)
+        if not self.max_disk_bytes:
+            return
+        path = self._path(key, fmt)
+        tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(data)
+            try:
+                old_size = os.stat(path).st_size   # overwriting: count the difference
+            except FileNotFoundError:
+                old_size = 0
+            os.replace(tmp, path)
+        except OSError:
+            # _files() skips temp files, so one left behind would never be
+            # counted or pruned.
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._files())
+            else:
+                self._disk_bytes += len(data) - old_size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune()
+
+    def _files(self):
+        """(mtime, size, path) for every cached file. Other writers'
+        in-flight temp files are left alone."""
+        out = []
+        for root, _dirs, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def _prune(self) -> None:
+        """Delete least recently used files until the directory is back under
+        90% of its limit, so pruning doesn't rerun on every write. Recounts
+        from disk, since other workers write here too."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        for _mtime, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"memory": self._memory.stats(), "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes}
@@ -0,0 +1,259 @@
+"""
+Single-pass layout for the label renderers in label_printer.py.
+
+Text is wrapped and measured once into layout objects that know their own
+height. A label sizes its canvas from those heights, places the layouts into a
+DisplayList, and rasterizes the list onto a 1-bit image in one go — instead of
+wrapping and measuring everything on a throwaway image to size the canvas and
+then doing it all again while drawing.
+"""
+
+import functools
+import re
+
+import PIL.Image
+import PIL.ImageDraw
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+# textbbox() only reads the font, so one shared 1-bit draw measures for every
+# label. Its font mode matches the label canvases, so metrics are the same.
+_MEASURE = PIL.ImageDraw.Draw(PIL.Image.new("1", (1, 1)))
+
+
+@functools.lru_cache(maxsize=8192)
+def text_bbox(text, font):
+    return _MEASURE.textbbox((0, 0), text, font=font)
+
+
+@functools.lru_cache(maxsize=1024)
+def multiline_bbox(text, font, align="left"):
+    return _MEASURE.multiline_textbbox((0, 0), text, font=font, align=align)
+
+
+@functools.lru_cache(maxsize=8192)
+def text_length(text, font):
+    return font.getlength(text)
+
+
+def text_h(text, font):
+    b = text_bbox(text, font)
+    return b[3] - b[1]
+
+def text_w(text, font):
+    b = text_bbox(text, font)
+    return b[2] - b[0]
+
+def ml_h(text, font):
+    b = multiline_bbox(text, font)
+    return b[3] - b[1]
+
+def ml_w(text, font):
+    b = multiline_bbox(text, font)
+    return b[2] - b[0]
+
+
+# ---------------------------------------------------------------------------
+# Display list
+# ---------------------------------------------------------------------------
+
+def _op(name):
+    def record(self, *args, **kwargs):
+        self.ops.append((name, args, kwargs))
+    record.__name__ = name
+    return record
+
+
+class DisplayList:
+    """Positioned drawing operations, recorded with the same signatures as
+    PIL.ImageDraw (plus Image.paste) and replayed in order by rasterize()."""
+
+    def __init__(self):
+        self.ops = []
+
+    text           = _op("text")
+    multiline_text = _op("multiline_text")
+    line           = _op("line")
+    rectangle      = _op("rectangle")
+    polygon        = _op("polygon")
+    ellipse        = _op("ellipse")
+    paste          = _op("paste")
+
+    def rasterize(self, size):
+        """A white 1-bit image of ``size`` with every operation drawn on it."""
+        img = PIL.Image.new("1", size, 1)
+        d   = PIL.ImageDraw.Draw(img)
+        for name, args, kwargs in self.ops:
+            getattr(img if name == "paste" else d, name)(*args, **kwargs)
+        return img
+
+
+# ---------------------------------------------------------------------------
+# Styled runs and Markdown blocks
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r'\S+|\s+')
+
+def wrap_runs(runs, fonts, max_w, default_style="regular"):
+    """Word-wrap styled runs. Returns lines = [[(text, style), ...], ...]."""
+    lines = [[]]
+    cur_w = 0
+    for text, style in runs:
+        if style == "break":
+            lines.append([])
+            cur_w = 0
+            continue
+        font = fonts.get(style, fonts[default_style])
+        for tok in _TOKEN_RE.findall(text):
+            tw = text_length(tok, font)
+            if tok.isspace():
+                if not lines[-1]:
+                    continue
+                if cur_w + tw > max_w:
+                    lines.append([])
+                    cur_w = 0
+                else:
+                    lines[-1].append((tok, style))
+                    cur_w += tw
+            else:
+                if cur_w + tw > max_w and lines[-1]:
+                    lines.append([])
+                    cur_w = 0
+                lines[-1].append((tok, style))
+                cur_w += tw
+    return lines
+
+
+def heading_fonts(fonts, level):
+    """Treat heading runs as bold-by-default at the heading size."""
+    f = fonts[f"h{level}"]
+    return {"regular": f, "bold": f, "italic": f, "bullet": f}
+
+
+class RunsLayout:
+    """Styled runs wrapped to ``max_w``. Each line keeps its height, width and
+    (text, font, advance) segments, so placing it measures nothing."""
+
+    def __init__(self, runs, fonts, max_w, default_style="regular", line_gap=2, align="left"):
+        self.max_w    = max_w
+        self.line_gap = line_gap
+        self.align    = align
+        self.lines    = []
+        default = fonts[default_style]
+        for line in wrap_runs(runs, fonts, max_w, default_style):
+            if line:
+                h = max(text_h(t if t.strip() else "A", fonts.get(s, default)) for t, s in line)
+            else:
+                h = text_h("Ay", default)
+            # Coalesce adjacent same-style tokens into one segment so PIL can
+            # shape the whole string in one text() call. Drawing token-by-token
+            # and advancing by getlength lands the next token inside the
+            # previous glyph's right-side bearing, swallowing spaces.
+            segments = []
+            for t, s in line:
+                if segments and segments[-1][1] == s:
+                    segments[-1][0] += t
+                else:
+                    segments.append([t, s])
+            segs = []
+            for t, s in segments:
+                font = fonts.get(s, default)
+                segs.append((t, font, font.getlength(t)))
+            self.lines.append((h, sum(adv for _, _, adv in segs), segs))
+        self.height = sum(h for h, _, _ in self.lines) + line_gap * (len(self.lines) - 1)
+
+    def place(self, d, x, y):
+        """Draw at (x, y); returns the y below the last line."""
+        last = len(self.lines) - 1
+        for i, (h, line_w, segs) in enumerate(self.lines):
+            if self.align == "center":
+                cx = x + max(0, (self.max_w - line_w) / 2)
+            else:
+                cx = x
+            for text, font, adv in segs:
+                d.text((cx, y), text, font=font, fill=0)
+                cx += adv
+            y += h
+            if i < last:
+                y += self.line_gap
+        return y
+
+
+class BlockLayout:
+    """One block from label_printer._parse_md laid out at ``max_w``."""
+
+    def __init__(self, block, fonts, max_w, line_gap=2, align="left"):
+        self.type  = t = block["type"]
+        self.max_w = max_w
+        self.height = 0
+        if t in ("h1", "h2", "h3"):
+            self.runs = RunsLayout(block["runs"], heading_fonts(fonts, int(t[1])), max_w,
+                                   line_gap=line_gap, align=align)
+            self.height = self.runs.height
+        elif t == "para":
+            self.runs = RunsLayout(block["runs"], fonts, max_w, line_gap=line_gap, align=align)
+            self.height = self.runs.height
+        elif t == "bullet":
+            self.bullet_font = fonts["regular"]
+            self.bullet_w    = text_w("• ", self.bullet_font)
+            self.runs = RunsLayout(block["runs"], fonts, max_w - self.bullet_w,
+                                   line_gap=line_gap, align=align)
+            self.height = self.runs.height
+        elif t == "table":
+            self.col1_w = col1_w = max(40, int(max_w * 0.42))
+            col2_w      = max_w - col1_w - 10
+            bold_fonts  = {**fonts, "regular": fonts["bold"]}
+            self.rows   = []
+            for row in block["rows"]:
+                if len(row) >= 2:
+                    cells = (RunsLayout(row[0], bold_fonts, col1_w, line_gap=line_gap),
+                             RunsLayout(row[1], fonts,      col2_w, line_gap=line_gap))
+                    self.height += max(c.height for c in cells) + 4
+                elif row:
+                    cells = (RunsLayout(row[0], fonts, max_w, line_gap=line_gap),)
+                    self.height += cells[0].height + 4
+                else:
+                    continue
+                self.rows.append(cells)
+
+    def place(self, d, x, y):
+        """Draw at (x, y); returns the y below the block."""
+        t = self.type
+        if t in ("h1", "h2", "h3", "para"):
+            return self.runs.place(d, x, y)
+        if t == "bullet":
+            d.text((x, y), "• ", font=self.bullet_font, fill=0)
+            return self.runs.place(d, x + self.bullet_w, y)
+        if t == "table":
+            for cells in self.rows:
+                if len(cells) == 2:
+                    row_h = max(c.height for c in cells)
+                    cells[0].place(d, x, y)
+                    cells[1].place(d, x + self.col1_w + 10, y)
+                    # Light rule under each row
+                    d.line([(x, y + row_h + 1), (x + self.max_w, y + row_h + 1)], fill=0, width=1)
+                    y += row_h + 4
+                else:
+                    y = cells[0].place(d, x, y) + 4
+        return y
+
+
+class MarkdownLayout:
+    """Parsed Markdown blocks laid out at ``max_w``, ``block_gap`` apart."""
+
+    def __init__(self, blocks, fonts, max_w, block_gap=8, align="left"):
+        self.blocks    = [BlockLayout(b, fonts, max_w, align=align) for b in blocks]
+        self.block_gap = block_gap
+        self.height    = sum(b.height for b in self.blocks) + block_gap * max(0, len(self.blocks) - 1)
+
+    def place(self, d, x, y):
+        """Draw at (x, y); returns the y below the last block."""
+        last = len(self.blocks) - 1
+        for i, b in enumerate(self.blocks):
+            y = b.place(d, x, y)
+            if i < last:
+                y += self.block_gap
+        return y
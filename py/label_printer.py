@@ -2,20 +2,27 @@
 Label generation and Bluetooth printing for the YHK-835E thermal printer.
 """
 
+import functools
 import io
 import re
 import struct
 from pathlib import Path
 
 import PIL.Image
-import PIL.ImageDraw
 import PIL.ImageFont
-import PIL.ImageOps
 import qrcode
 import qrcode.constants
 
+from py.label_layout import (
+    BlockLayout, DisplayList, MarkdownLayout,
+    multiline_bbox, ml_h, ml_w, text_h, text_w,
+)
+
 
 PRINTER_WIDTH = 384
+# Bump whenever a change here alters the pixels or bytes of any label, so
+# py/label_cache.py stops serving renders made by the old code.
+LABEL_RENDERER_VERSION = 1
 _ICON_DIR = Path(__file__).parent / "icons"
 
 
@@ -23,7 +30,9 @@ _ICON_DIR = Path(__file__).parent / "icons"
 # Font helpers
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=None)
 def _find_font(variant="regular"):
+    """Path of the first usable font file for ``variant`` (probed once)."""
     paths = {
         "regular": [
             "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf",
@@ -54,6 +63,10 @@ def _find_font(variant="regular"):
     return None
 
 
+# Loaded fonts are shared by every label render: parsing a TTF costs far more
+# than drawing with it, and a render asks for the same few (variant, size)
+# pairs over and over. FreeTypeFont objects are read-only once loaded.
+@functools.lru_cache(maxsize=256)
 def _get_font(variant, size):
     path = _find_font(variant)
     if path:
@@ -62,26 +75,9 @@ def _get_font(variant, size):
 
 
 # ---------------------------------------------------------------------------
-# Measurement helpers
+# Wrapping
 # ---------------------------------------------------------------------------
 
-def _text_h(draw, text, font):
-    b = draw.textbbox((0, 0), text, font=font)
-    return b[3] - b[1]
-
-def _text_w(draw, text, font):
-    b = draw.textbbox((0, 0), text, font=font)
-    return b[2] - b[0]
-
-def _ml_h(draw, text, font):
-    b = draw.multiline_textbbox((0, 0), text, font=font)
-    return b[3] - b[1]
-
-def _ml_w(draw, text, font):
-    b = draw.multiline_textbbox((0, 0), text, font=font)
-    return b[2] - b[0]
-
-
 def _wrap(text, font, max_w, max_lines=None):
     """Word-wrap, truncate with … if max_lines exceeded."""
     words = text.split()
@@ -224,191 +220,57 @@ def _build_md_fonts(body_size=15):
     }
 
 
-_TOKEN_RE = re.compile(r'\S+|\s+')
-
-def _wrap_runs(runs, fonts, max_w, default_style="regular"):
-    """Word-wrap styled runs. Returns lines = [[(text, style), ...], ...]."""
-    lines = [[]]
-    cur_w = 0
-    for text, style in runs:
-        if style == "break":
-            lines.append([])
-            cur_w = 0
-            continue
-        font = fonts.get(style, fonts[default_style])
-        for tok in _TOKEN_RE.findall(text):
-            tw = font.getlength(tok)
-            if tok.isspace():
-                if not lines[-1]:
-                    continue
-                if cur_w + tw > max_w:
-                    lines.append([])
-                    cur_w = 0
-                else:
-                    lines[-1].append((tok, style))
-                    cur_w += tw
-            else:
-                if cur_w + tw > max_w and lines[-1]:
-                    lines.append([])
-                    cur_w = 0
-                lines[-1].append((tok, style))
-                cur_w += tw
-    return lines
-
-
-def _line_h(d, line, fonts, default_style="regular"):
-    if not line:
-        return _text_h(d, "Ay", fonts[default_style])
-    return max(_text_h(d, t if t.strip() else "A", fonts.get(s, fonts[default_style])) for t, s in line)
-
-
-def _runs_height(d, runs, fonts, max_w, default_style="regular", line_gap=2):
-    lines = _wrap_runs(runs, fonts, max_w, default_style)
-    h = 0
-    for i, line in enumerate(lines):
-        h += _line_h(d, line, fonts, default_style)
-        if i < len(lines) - 1:
-            h += line_gap
-    return h
-
-
-def _draw_runs(d, runs, fonts, x, y, max_w, default_style="regular", line_gap=2, align="left"):
-    lines = _wrap_runs(runs, fonts, max_w, default_style)
-    for i, line in enumerate(lines):
-        # Coalesce adjacent same-style tokens into one segment so PIL can shape
-        # the whole string in one d.text call. Drawing token-by-token and
-        # advancing the cursor by font.getlength causes the next token to land
-        # inside the previous glyph's right-side bearing, swallowing spaces.
-        segments = []
-        for t, s in line:
-            if segments and segments[-1][1] == s:
-                segments[-1][0] += t
-            else:
-                segments.append([t, s])
-        h = _line_h(d, line, fonts, default_style)
-        if align == "center":
-            line_w = sum(fonts.get(s, fonts[default_style]).getlength(t) for t, s in segments)
-            cx = x + max(0, (max_w - line_w) / 2)
-        else:
-            cx = x
-        for text, style in segments:
-            font = fonts.get(style, fonts[default_style])
-            d.text((cx, y), text, font=font, fill=0)
-            cx += font.getlength(text)
-        y += h
-        if i < len(lines) - 1:
-            y += line_gap
-    return y
-
-
-def _heading_fonts(fonts, level):
-    """Treat heading runs as bold-by-default at the heading size."""
-    f = fonts[f"h{level}"]
-    return {"regular": f, "bold": f, "italic": f, "bullet": f}
-
-
-def _block_height(d, block, fonts, max_w, line_gap=2):
-    t = block["type"]
-    if t in ("h1", "h2", "h3"):
-        return _runs_height(d, block["runs"], _heading_fonts(fonts, int(t[1])), max_w, line_gap=line_gap)
-    if t == "para":
-        return _runs_height(d, block["runs"], fonts, max_w, line_gap=line_gap)
-    if t == "bullet":
-        indent = _text_w(d, "• ", fonts["regular"])
-        return _runs_height(d, block["runs"], fonts, max_w - indent, line_gap=line_gap)
-    if t == "table":
-        col1_w = max(40, int(max_w * 0.42))
-        col2_w = max_w - col1_w - 10
-        bold_fonts = {**fonts, "regular": fonts["bold"]}
-        h = 0
-        for row in block["rows"]:
-            if len(row) >= 2:
-                h1 = _runs_height(d, row[0], bold_fonts, col1_w, line_gap=line_gap)
-                h2 = _runs_height(d, row[1], fonts,      col2_w, line_gap=line_gap)
-                h += max(h1, h2) + 4
-            elif row:
-                h += _runs_height(d, row[0], fonts, max_w, line_gap=line_gap) + 4
-        return h
-    return 0
-
-
-def _render_block(d, block, fonts, x, y, max_w, line_gap=2, align="left"):
-    t = block["type"]
-    if t in ("h1", "h2", "h3"):
-        return _draw_runs(d, block["runs"], _heading_fonts(fonts, int(t[1])), x, y, max_w, line_gap=line_gap, align=align)
-    if t == "para":
-        return _draw_runs(d, block["runs"], fonts, x, y, max_w, line_gap=line_gap, align=align)
-    if t == "bullet":
-        bw = _text_w(d, "• ", fonts["regular"])
-        d.text((x, y), "• ", font=fonts["regular"], fill=0)
-        return _draw_runs(d, block["runs"], fonts, x + bw, y, max_w - bw, line_gap=line_gap, align=align)
-    if t == "table":
-        col1_w = max(40, int(max_w * 0.42))
-        col2_w = max_w - col1_w - 10
-        bold_fonts = {**fonts, "regular": fonts["bold"]}
-        for row in block["rows"]:
-            if len(row) >= 2:
-                h1 = _runs_height(d, row[0], bold_fonts, col1_w, line_gap=line_gap)
-                h2 = _runs_height(d, row[1], fonts,      col2_w, line_gap=line_gap)
-                row_h = max(h1, h2)
-                _draw_runs(d, row[0], bold_fonts, x, y, col1_w, line_gap=line_gap)
-                _draw_runs(d, row[1], fonts,      x + col1_w + 10, y, col2_w, line_gap=line_gap)
-                # Light rule under each row
-                d.line([(x, y + row_h + 1), (x + max_w, y + row_h + 1)], fill=0, width=1)
-                y += row_h + 4
-            elif row:
-                y = _draw_runs(d, row[0], fonts, x, y, max_w, line_gap=line_gap) + 4
-        return y
-    return y
-
-
-def _md_height(d, blocks, fonts, max_w, block_gap=8):
-    if not blocks:
-        return 0
-    total = 0
-    for i, b in enumerate(blocks):
-        total += _block_height(d, b, fonts, max_w)
-        if i < len(blocks) - 1:
-            total += block_gap
-    return total
-
-
-def _md_render(d, blocks, fonts, x, y, max_w, block_gap=8, align="left"):
-    for i, b in enumerate(blocks):
-        y = _render_block(d, b, fonts, x, y, max_w, align=align)
-        if i < len(blocks) - 1:
-            y += block_gap
-    return y
-
-
-# Back-compat alias
-def _render_md(d, blocks, fonts, x, y, max_w, align="left"):
-    return _md_render(d, blocks, fonts, x, y, max_w, align=align)
-
-
 # ---------------------------------------------------------------------------
 # Icon drawing — PNG if available in py/icons/, drawn fallback otherwise
 # ---------------------------------------------------------------------------
 
+# point() table for the icon threshold: darker than 128 -> black, else white.
+_ICON_THRESHOLD = [0] * 128 + [255] * 128
+
+
+@functools.lru_cache(maxsize=None)
+def _icon_source(name):
+    """py/icons/<name>.png decoded as RGBA once, or None if missing/unreadable."""
+    path = _ICON_DIR / f"{name}.png"
+    if not path.exists():
+        return None
+    try:
+        with PIL.Image.open(path) as src:
+            return src.convert("RGBA")
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=64)
 def _load_png_icon(name, size):
     """
     Load py/icons/<name>.png, resize to size×size, return as 1-bit PIL image.
     Supports transparent PNGs (dark icon on transparent background works best).
     Returns None if the file doesn't exist or fails to load.
+
+    Memoized per (name, size): callers only paste the result, never draw on it.
     """
-    path = _ICON_DIR / f"{name}.png"
-    if not path.exists():
+    src = _icon_source(name)
+    if src is None:
         return None
     try:
-        src = PIL.Image.open(path).convert("RGBA")
         src = src.resize((size, size), PIL.Image.LANCZOS)
         bg = PIL.Image.new("L", (size, size), 255)
         bg.paste(src.convert("L"), mask=src.split()[3])
-        return bg.point(lambda p: 0 if p < 128 else 255).convert("1")
+        return bg.point(_ICON_THRESHOLD).convert("1")
     except Exception:
         return None
 
 
+# (name, size) pairs the _icon_* helpers draw by default, loaded at import.
+_ICON_DEFAULT_SIZES = (("pin", 15), ("diamond", 11), ("pen", 14))
+
+
+def _warm_icon_cache():
+    for name, size in _ICON_DEFAULT_SIZES:
+        _load_png_icon(name, size)
+
+
 def _icon_pin(img, d, x, y, size=15):
     """Location pin icon. Returns width consumed."""
     icon = _load_png_icon("pin", size)
@@ -450,6 +312,9 @@ def _icon_pen(img, d, x, y, size=14):
     return size + 6
 
 
+_warm_icon_cache()
+
+
 # ---------------------------------------------------------------------------
 # Decorative borders
 # ---------------------------------------------------------------------------
@@ -489,26 +354,23 @@ def create_label_classic(common_name, latin_name, date_str,
     hero = nickname if nickname else common_name
     sub  = common_name if nickname else None
 
-    tmp = PIL.Image.new("1", (1, 1))
-    td  = PIL.ImageDraw.Draw(tmp)
-
     inner_w    = W - margin * 2 - 24
     hero_lines = _wrap(hero, name_font, inner_w)
-    hero_w     = _ml_w(td, hero_lines, name_font)
-    hero_h     = _ml_h(td, hero_lines, name_font)
-    latin_h    = _text_h(td, latin_name, latin_font)
-    date_w     = _text_w(td, date_str, date_font)
-    date_h     = _text_h(td, date_str, date_font)
+    hero_w     = ml_w(hero_lines, name_font)
+    hero_h     = ml_h(hero_lines, name_font)
+    latin_h    = text_h(latin_name, latin_font)
+    date_w     = text_w(date_str, date_font)
+    date_h     = text_h(date_str, date_font)
 
-    sub_h = (_text_h(td, sub, sub_font) + 5) if sub else 0
-    var_h = (_text_h(td, variety, var_font) + 6) if variety else 0
+    sub_h = (text_h(sub, sub_font) + 5) if sub else 0
+    var_h = (text_h(variety, var_font) + 6) if variety else 0
 
     md_segs = _parse_md(extra_notes.strip()) if extra_notes else []
-    note_h  = (_md_height(td, md_segs, md_fonts, inner_w) + 16) if md_segs else 0
+    note    = MarkdownLayout(md_segs, md_fonts, inner_w) if md_segs else None
+    note_h  = (note.height + 16) if note else 0
 
     total_h = pad_t + hero_h + 10 + sub_h + latin_h + var_h + 20 + date_h + note_h + pad_b
-    img = PIL.Image.new("1", (W, total_h), 1)
-    d   = PIL.ImageDraw.Draw(img)
+    d = DisplayList()
 
     bx0, by0, bx1, by1 = margin - 5, 5, W - margin + 5, total_h - 6
     d.rectangle([bx0, by0, bx1, by1], outline=0, width=3)
@@ -542,9 +404,9 @@ def create_label_classic(common_name, latin_name, date_str,
         y += 8
         d.line([(div_m, y), (W - div_m, y)], fill=0, width=1)
         y += 8
-        _render_md(d, md_segs, md_fonts, margin + 15, y, inner_w)
+        note.place(d, margin + 15, y)
 
-    return img
+    return d.rasterize((W, total_h))
 
 
 def create_label_circular(common_name, latin_name, date_str,
@@ -556,8 +418,7 @@ def create_label_circular(common_name, latin_name, date_str,
     md_segs  = _parse_md(extra_notes.strip()) if extra_notes else []
 
     total_h = diameter + 20
-    img = PIL.Image.new("1", (PRINTER_WIDTH, total_h), 1)
-    d   = PIL.ImageDraw.Draw(img)
+    d = DisplayList()
 
     cx, cy, r = PRINTER_WIDTH // 2, diameter // 2 + 10, diameter // 2
     d.ellipse([cx - r, cy - r, cx + r, cy + r], outline=0, width=3)
@@ -574,11 +435,11 @@ def create_label_circular(common_name, latin_name, date_str,
 
     max_text_w = int(r * 1.4)
     hero_lines = _wrap(hero, name_font, max_text_w)
-    hero_h     = _ml_h(d, hero_lines, name_font)
-    latin_h    = _text_h(d, latin_name, latin_font)
-    date_h     = _text_h(d, date_str, date_font)
-    sub_h      = (_text_h(d, sub, sub_font) + 4) if sub else 0
-    var_h      = (_text_h(d, variety, var_font) + 4) if variety else 0
+    hero_h     = ml_h(hero_lines, name_font)
+    latin_h    = text_h(latin_name, latin_font)
+    date_h     = text_h(date_str, date_font)
+    sub_h      = (text_h(sub, sub_font) + 4) if sub else 0
+    var_h      = (text_h(variety, var_font) + 4) if variety else 0
 
     head_h = hero_h + 6 + sub_h + latin_h + var_h + 6 + date_h
 
@@ -590,7 +451,7 @@ def create_label_circular(common_name, latin_name, date_str,
     note_gap  = 10          # space between date and the divider rule
     sep_h     = 12          # space taken by the divider rule + following gap
     chrome    = note_gap + sep_h
-    note_fonts = None
+    note       = None
     note_w_fit = 0
     note_h     = 0
     if md_segs:
@@ -599,10 +460,18 @@ def create_label_circular(common_name, latin_name, date_str,
             # from the printed facts above it.
             base  = _build_md_fonts(body_size)
             fonts = {**base, "regular": base["italic"], "bullet": base["italic"]}
+            # The fit revisits widths; lay each out once and draw the winner.
+            fits  = {}
+
+            def fit(w):
+                if w not in fits:
+                    fits[w] = MarkdownLayout(md_segs, fonts, w, align="center")
+                return fits[w]
+
             w = int(usable_r * 1.7)
             for _ in range(8):
                 w = max(50, min(w, int(2 * usable_r)))
-                nh = _md_height(d, md_segs, fonts, w)
+                nh = fit(w).height
                 total_inner = head_h + chrome + nh
                 top = cy - total_inner // 2
                 far = max(abs((top + total_inner) - cy), abs((top + head_h + chrome) - cy))
@@ -611,11 +480,11 @@ def create_label_circular(common_name, latin_name, date_str,
                     w = new_w
                     break
                 w = new_w
-            nh = _md_height(d, md_segs, fonts, w)
+            nh = fit(w).height
             if head_h + chrome + nh <= 2 * usable_r and w >= 60:
-                note_fonts, note_w_fit, note_h = fonts, w, nh
+                note, note_w_fit, note_h = fits[w], w, nh
                 break
-            note_fonts, note_w_fit, note_h = fonts, max(60, w), nh  # keep last as fallback
+            note, note_w_fit, note_h = fit(max(60, w)), max(60, w), nh  # keep last as fallback
 
     total_inner = head_h + (chrome + note_h if md_segs else 0)
     y = cy - total_inner // 2
@@ -642,9 +511,9 @@ def create_label_circular(common_name, latin_name, date_str,
         div_w = min(note_w_fit, int(usable_r))
         d.line([(cx - div_w // 2, y), (cx + div_w // 2, y)], fill=0, width=1)
         y += sep_h
-        _md_render(d, md_segs, note_fonts, cx - note_w_fit // 2, y, note_w_fit, align="center")
+        note.place(d, cx - note_w_fit // 2, y)
 
-    return img
+    return d.rasterize((PRINTER_WIDTH, total_h))
 
 
 def create_label_minimal(common_name, latin_name, date_str,
@@ -663,25 +532,22 @@ def create_label_minimal(common_name, latin_name, date_str,
     hero = nickname if nickname else common_name
     sub  = common_name if nickname else None
 
-    tmp = PIL.Image.new("1", (1, 1))
-    td  = PIL.ImageDraw.Draw(tmp)
-
     inner_w    = W - 48
     hero_lines = _wrap(hero, name_font, inner_w)
-    hero_w     = _ml_w(td, hero_lines, name_font)
-    hero_h     = _ml_h(td, hero_lines, name_font)
-    latin_h    = _text_h(td, latin_name, latin_font)
-    date_w     = _text_w(td, date_str, date_font)
-    date_h     = _text_h(td, date_str, date_font)
-    sub_h      = (_text_h(td, sub, sub_font) + 4) if sub else 0
-    var_h      = (_text_h(td, variety, var_font) + 4) if variety else 0
+    hero_w     = ml_w(hero_lines, name_font)
+    hero_h     = ml_h(hero_lines, name_font)
+    latin_h    = text_h(latin_name, latin_font)
+    date_w     = text_w(date_str, date_font)
+    date_h     = text_h(date_str, date_font)
+    sub_h      = (text_h(sub, sub_font) + 4) if sub else 0
+    var_h      = (text_h(variety, var_font) + 4) if variety else 0
 
     md_segs = _parse_md(extra_notes.strip()) if extra_notes else []
-    note_h  = (_md_height(td, md_segs, md_fonts, inner_w) + 12) if md_segs else 0
+    note    = MarkdownLayout(md_segs, md_fonts, inner_w) if md_segs else None
+    note_h  = (note.height + 12) if note else 0
 
     total_h = pad + hero_h + 10 + sub_h + latin_h + var_h + 16 + date_h + note_h + pad
-    img = PIL.Image.new("1", (W, total_h), 1)
-    d   = PIL.ImageDraw.Draw(img)
+    d = DisplayList()
 
     y = pad
     d.multiline_text(((W - hero_w) // 2, y), hero_lines, font=name_font, fill=0, align="center")
@@ -708,9 +574,9 @@ def create_label_minimal(common_name, latin_name, date_str,
 
     if md_segs:
         y += 12
-        _render_md(d, md_segs, md_fonts, (W - inner_w) // 2, y, inner_w)
+        note.place(d, (W - inner_w) // 2, y)
 
-    return img
+    return d.rasterize((W, total_h))
 
 
 def create_label_detailed_v(common_name, latin_name, date_str,
@@ -735,29 +601,28 @@ def create_label_detailed_v(common_name, latin_name, date_str,
     md_fonts   = _build_md_fonts(15)
     info_fonts = md_fonts
 
-    tmp = PIL.Image.new("1", (1, 1))
-    td  = PIL.ImageDraw.Draw(tmp)
-
     hero = nickname if nickname else common_name
     sub  = common_name if nickname else None
 
     hero_lines = _wrap(hero, name_font, inner_w)
-    hero_w     = _ml_w(td, hero_lines, name_font)
-    hero_h     = _ml_h(td, hero_lines, name_font)
-    latin_h    = _text_h(td, latin_name, latin_font)
-    date_w     = _text_w(td, date_str, date_font)
-    date_h     = _text_h(td, date_str, date_font)
-    sub_h      = (_text_h(td, sub, sub_font) + 4) if sub else 0
-    var_h      = (_text_h(td, variety, var_font) + 4) if variety else 0
+    hero_w     = ml_w(hero_lines, name_font)
+    hero_h     = ml_h(hero_lines, name_font)
+    latin_h    = text_h(latin_name, latin_font)
+    date_w     = text_w(date_str, date_font)
+    date_h     = text_h(date_str, date_font)
+    sub_h      = (text_h(sub, sub_font) + 4) if sub else 0
+    var_h      = (text_h(variety, var_font) + 4) if variety else 0
 
     plant_segs = _parse_md(notes.strip()) if notes and notes.strip() else []
     # Drop the leading H1: the hero name already provides the title.
     if plant_segs and plant_segs[0]["type"] == "h1":
         plant_segs = plant_segs[1:]
-    plant_note_h = (_md_height(td, plant_segs, md_fonts, inner_w) + 6) if plant_segs else 0
+    plant_note   = MarkdownLayout(plant_segs, md_fonts, inner_w) if plant_segs else None
+    plant_note_h = (plant_note.height + 6) if plant_note else 0
 
     extra_segs  = _parse_md(extra_notes.strip()) if extra_notes and extra_notes.strip() else []
-    extra_note_h = (_md_height(td, extra_segs, md_fonts, inner_w) + 6) if extra_segs else 0
+    extra_note   = MarkdownLayout(extra_segs, md_fonts, inner_w) if extra_segs else None
+    extra_note_h = (extra_note.height + 6) if extra_note else 0
 
     has_info = plant_note_h or extra_note_h
     info_gap = 20 if has_info else 0
@@ -766,8 +631,7 @@ def create_label_detailed_v(common_name, latin_name, date_str,
                + info_gap + plant_note_h + extra_note_h
                + 20 + date_h + pad_b)
 
-    img = PIL.Image.new("1", (W, total_h), 1)
-    d   = PIL.ImageDraw.Draw(img)
+    d = DisplayList()
 
     # Border: thin rectangle + diamond corner ornaments
     bx0, by0, bx1, by1 = margin - 4, 4, W - margin + 4, total_h - 4
@@ -795,11 +659,11 @@ def create_label_detailed_v(common_name, latin_name, date_str,
         d.line([(div_m, y), (W - div_m, y)], fill=0, width=1)
         y += 12
 
-        if plant_segs:
-            y = _md_render(d, plant_segs, md_fonts, tx, y, inner_w) + 6
+        if plant_note:
+            y = plant_note.place(d, tx, y) + 6
 
-        if extra_segs:
-            y = _md_render(d, extra_segs, md_fonts, tx, y, inner_w) + 6
+        if extra_note:
+            y = extra_note.place(d, tx, y) + 6
 
     div_m = margin + 8
     y += 8
@@ -808,7 +672,7 @@ def create_label_detailed_v(common_name, latin_name, date_str,
 
     d.text(((W - date_w) // 2, y), date_str, font=date_font, fill=0)
 
-    return img
+    return d.rasterize((W, total_h))
 
 
 def create_label_detailed_h(common_name, latin_name, date_str,
@@ -840,9 +704,6 @@ def create_label_detailed_h(common_name, latin_name, date_str,
     md_fonts   = _build_md_fonts(14)
     ICON_S     = 14
 
-    tmp = PIL.Image.new("1", (1, 1))
-    td  = PIL.ImageDraw.Draw(tmp)
-
     hero = nickname if nickname else common_name
     sub  = common_name if nickname else None
 
@@ -850,13 +711,13 @@ def create_label_detailed_h(common_name, latin_name, date_str,
     if plant_blocks and plant_blocks[0]["type"] == "h1":
         plant_blocks = plant_blocks[1:]
     extra_blocks = _parse_md(extra_notes.strip()) if extra_notes and extra_notes.strip() else []
-    all_blocks   = plant_blocks + extra_blocks
+    all_blocks   = [BlockLayout(b, md_fonts, COL_W) for b in plant_blocks + extra_blocks]
 
     # Pack blocks into fixed-height columns
     columns      = [[]]
     col_used_h   = [0]
     for b in all_blocks:
-        bh = _block_height(td, b, md_fonts, COL_W)
+        bh = b.height
         gap = BLOCK_GAP if columns[-1] else 0
         if not columns[-1] or col_used_h[-1] + gap + bh <= inner_h:
             columns[-1].append(b)
@@ -873,8 +734,7 @@ def create_label_detailed_h(common_name, latin_name, date_str,
     if n_cols > 0:
         total_w = pad_l + HEADER_W + GUTTER + n_cols * COL_W + (n_cols - 1) * GUTTER + pad_r
 
-    img = PIL.Image.new("1", (total_w, H), 1)
-    d   = PIL.ImageDraw.Draw(img)
+    d = DisplayList()
 
     # Border + corner ornaments
     bx0, by0, bx1, by1 = 4, 4, total_w - 4, H - 4
@@ -886,33 +746,33 @@ def create_label_detailed_h(common_name, latin_name, date_str,
     hy = pad_t + 4
 
     hero_lines = _wrap(hero, name_font, HEADER_W)
-    hero_w     = _ml_w(td, hero_lines, name_font)
-    hero_h     = _ml_h(td, hero_lines, name_font)
+    hero_w     = ml_w(hero_lines, name_font)
+    hero_h     = ml_h(hero_lines, name_font)
     d.multiline_text((hx + (HEADER_W - hero_w) // 2, hy),
                      hero_lines, font=name_font, fill=0, align="center")
     hy += hero_h + 6
 
     if sub:
-        sw = _text_w(td, sub, sub_font)
+        sw = text_w(sub, sub_font)
         d.text((hx + (HEADER_W - sw) // 2, hy), sub, font=sub_font, fill=0)
-        hy += _text_h(td, sub, sub_font) + 4
+        hy += text_h(sub, sub_font) + 4
 
-    lw = _text_w(td, latin_name, latin_font)
+    lw = text_w(latin_name, latin_font)
     d.text((hx + (HEADER_W - lw) // 2, hy), latin_name, font=latin_font, fill=0)
-    hy += _text_h(td, latin_name, latin_font) + 4
+    hy += text_h(latin_name, latin_font) + 4
 
     if variety:
-        vw = _text_w(td, variety, var_font)
+        vw = text_w(variety, var_font)
         d.text((hx + (HEADER_W - vw) // 2, hy), variety, font=var_font, fill=0)
-        hy += _text_h(td, variety, var_font) + 4
+        hy += text_h(variety, var_font) + 4
 
     hy += 6
     d.line([(hx + 12, hy), (hx + HEADER_W - 12, hy)], fill=0, width=1)
     hy += 10
 
     # Date pinned to bottom of header column
-    date_w_px = _text_w(td, date_str, date_font)
-    date_h_px = _text_h(td, date_str, date_font)
+    date_w_px = text_w(date_str, date_font)
+    date_h_px = text_h(date_str, date_font)
     date_y    = H - pad_b - date_h_px - 2
     d.text((hx + (HEADER_W - date_w_px) // 2, date_y), date_str, font=date_font, fill=0)
 
@@ -924,7 +784,7 @@ def create_label_detailed_h(common_name, latin_name, date_str,
         if qr_size >= 60 and qr_size <= avail_h:
             qr_y   = hy + (avail_h - qr_size) // 2
             qr_img = _make_qr_image(plant_url, qr_size)
-            img.paste(qr_img, (hx + (HEADER_W - qr_size) // 2, qr_y))
+            d.paste(qr_img, (hx + (HEADER_W - qr_size) // 2, qr_y))
 
     # ─── content columns ────────────────────────────────────────────────
     col_x = pad_l + HEADER_W + GUTTER
@@ -937,12 +797,12 @@ def create_label_detailed_h(common_name, latin_name, date_str,
         for bi, b in enumerate(col_blocks):
             if bi > 0:
                 cy += BLOCK_GAP
-            cy = _render_block(d, b, md_fonts, col_x, cy, COL_W)
+            cy = b.place(d, col_x, cy)
         col_x += COL_W + GUTTER
 
     # Rotate 90° clockwise → printer-native orientation (PRINTER_WIDTH wide,
     # total_w tall). The header ends up at the top of the strip.
-    return img.transpose(PIL.Image.ROTATE_270)
+    return d.rasterize((total_w, H)).transpose(PIL.Image.ROTATE_270)
 
 
 # ---------------------------------------------------------------------------
@@ -963,52 +823,46 @@ def create_label_stake_wrap(common_name, latin_name, date_str,
 
     hero = nickname if nickname else common_name
 
-    tmp = PIL.Image.new("1", (1, 1))
-    td  = PIL.ImageDraw.Draw(tmp)
-
-    hero_w  = _text_w(td, hero, name_font)
-    latin_w = _text_w(td, latin_name, latin_font)
-    date_w  = _text_w(td, date_str, date_font)
-    var_w   = (_text_w(td, f"'{variety}'", var_font) + 6) if variety else 0
+    hero_w  = text_w(hero, name_font)
+    latin_w = text_w(latin_name, latin_font)
+    date_w  = text_w(date_str, date_font)
+    var_w   = (text_w(f"'{variety}'", var_font) + 6) if variety else 0
     # latin + variety on same line
     latin_line_w = latin_w + var_w
 
     H     = max(hero_w, latin_line_w, date_w) + PAD * 2
     COL_H = SEC_W - PAD * 2
 
-    img = PIL.Image.new("1", (W, H), 1)
-
-    def _draw_rotated_text(section_idx, angle):
-        tmp2 = PIL.Image.new("1", (H, COL_H), 1)
-        td2  = PIL.ImageDraw.Draw(tmp2)
+    # Both faces carry the same text, so lay it out and rasterize it once,
+    # then paste it turned each way.
+    main_h  = text_h(hero, name_font)
+    latin_h = text_h(latin_name, latin_font)
+    date_h  = text_h(date_str, date_font)
+    block   = main_h + 4 + latin_h + 4 + date_h
+    y0      = (COL_H - block) // 2
 
-        main_h  = _text_h(td2, hero, name_font)
-        latin_h = _text_h(td2, latin_name, latin_font)
-        date_h  = _text_h(td2, date_str, date_font)
-        block   = main_h + 4 + latin_h + 4 + date_h
-        y0      = (COL_H - block) // 2
+    face = DisplayList()
+    face.text((H // 2, y0), hero, font=name_font, fill=0, anchor="ma")
 
-        td2.text((H // 2, y0), hero, font=name_font, fill=0, anchor="ma")
-
-        # Latin + variety on same line
-        latin_str = latin_name
-        if variety:
-            latin_str += f"  '{variety}'"
-        td2.text((H // 2, y0 + main_h + 4), latin_str, font=latin_font, fill=0, anchor="ma")
+    # Latin + variety on same line
+    latin_str = latin_name
+    if variety:
+        latin_str += f"  '{variety}'"
+    face.text((H // 2, y0 + main_h + 4), latin_str, font=latin_font, fill=0, anchor="ma")
 
-        td2.text((H // 2, y0 + main_h + 4 + latin_h + 4), date_str,
-                 font=date_font, fill=0, anchor="ma")
+    face.text((H // 2, y0 + main_h + 4 + latin_h + 4), date_str,
+              font=date_font, fill=0, anchor="ma")
+    face_img = face.rasterize((H, COL_H))
 
-        rotated = tmp2.rotate(angle, expand=True)
+    d = DisplayList()
+    for section_idx, angle in ((1, 270), (2, 90)):
+        rotated = face_img.rotate(angle, expand=True)
         sx      = section_idx * SEC_W
         paste_x = sx + (SEC_W - rotated.width) // 2
         paste_y = (H - rotated.height) // 2
-        img.paste(rotated, (paste_x, paste_y))
+        d.paste(rotated, (paste_x, paste_y))
 
-    _draw_rotated_text(1, 270)
-    _draw_rotated_text(2, 90)
-
-    return img
+    return d.rasterize((W, H))
 
 # ---------------------------------------------------------------------------
 # QR code label
@@ -1047,24 +901,20 @@ def create_label_qr(common_name, latin_name, date_str, plant_url,
 
     inner_w = W - margin * 2
 
-    tmp = PIL.Image.new("1", (1, 1))
-    td  = PIL.ImageDraw.Draw(tmp)
-
     hero_lines = _wrap(hero, name_font, inner_w)
-    hero_h     = _ml_h(td, hero_lines, name_font)
-    hero_w     = _ml_w(td, hero_lines, name_font)
-    sub_h      = (_text_h(td, sub, sub_font) + 6) if sub else 0
-    latin_h    = _text_h(td, latin_name, latin_font)
-    var_h      = (_text_h(td, variety, var_font) + 6) if variety else 0
-    date_h     = _text_h(td, date_str, date_font)
+    hero_h     = ml_h(hero_lines, name_font)
+    hero_w     = ml_w(hero_lines, name_font)
+    sub_h      = (text_h(sub, sub_font) + 6) if sub else 0
+    latin_h    = text_h(latin_name, latin_font)
+    var_h      = (text_h(variety, var_font) + 6) if variety else 0
+    date_h     = text_h(date_str, date_font)
 
     qr_size  = int(W * 0.56)
     qr_size  = (qr_size // 4) * 4   # round to multiple of 4 for clean scaling
 
     total_h = pad_t + hero_h + 8 + sub_h + latin_h + 4 + var_h + 18 + qr_size + 14 + date_h + pad_b
 
-    img = PIL.Image.new("1", (W, total_h), 1)
-    d   = PIL.ImageDraw.Draw(img)
+    d = DisplayList()
 
     # Border
     bx0, by0, bx1, by1 = margin - 5, 5, W - margin + 5, total_h - 6
@@ -1093,13 +943,13 @@ def create_label_qr(common_name, latin_name, date_str, plant_url,
     y += 18
 
     qr_img = _make_qr_image(plant_url, qr_size)
-    img.paste(qr_img, ((W - qr_size) // 2, y))
+    d.paste(qr_img, ((W - qr_size) // 2, y))
     y += qr_size + 14
 
-    date_w = _text_w(td, date_str, date_font)
+    date_w = text_w(date_str, date_font)
     d.text(((W - date_w) // 2, y), date_str, font=date_font, fill=0)
 
-    return img
+    return d.rasterize((W, total_h))
 
 
 # ---------------------------------------------------------------------------
@@ -1118,14 +968,11 @@ def create_label_freetext(title, subtitle=None, body_md=None, qr_data=None):
     sub_font   = _get_font("italic",  22)
     md_fonts   = _build_md_fonts(16)
 
-    tmp = PIL.Image.new("1", (1, 1))
-    td  = PIL.ImageDraw.Draw(tmp)
-
     inner_w = W - margin * 2 - 24
 
     title       = (title or "").strip() or " "
     title_lines = _wrap(title, title_font, inner_w)
-    title_bb    = td.multiline_textbbox((0, 0), title_lines, font=title_font, align="center")
+    title_bb    = multiline_bbox(title_lines, title_font, align="center")
     title_w     = title_bb[2] - title_bb[0]
     # multiline_text() anchors at the ascender top, so glyphs reach down to
     # bbox[3]; advance by the full bottom (not bbox[3]-bbox[1]) or the divider
@@ -1135,7 +982,7 @@ def create_label_freetext(title, subtitle=None, body_md=None, qr_data=None):
     sub = (subtitle or "").strip() or None
     if sub:
         sub_wrapped = _wrap(sub, sub_font, inner_w)
-        sub_bb      = td.multiline_textbbox((0, 0), sub_wrapped, font=sub_font, align="center")
+        sub_bb      = multiline_bbox(sub_wrapped, sub_font, align="center")
         sub_w_px    = sub_bb[2] - sub_bb[0]
         sub_h_px    = sub_bb[3]
     else:
@@ -1143,7 +990,8 @@ def create_label_freetext(title, subtitle=None, body_md=None, qr_data=None):
         sub_w_px = sub_h_px = 0
 
     md_segs = _parse_md(body_md.strip()) if body_md and body_md.strip() else []
-    body_h  = _md_height(td, md_segs, md_fonts, inner_w) if md_segs else 0
+    body    = MarkdownLayout(md_segs, md_fonts, inner_w) if md_segs else None
+    body_h  = body.height if body else 0
 
     rule_h = 14 if md_segs else 0
 
@@ -1152,8 +1000,7 @@ def create_label_freetext(title, subtitle=None, body_md=None, qr_data=None):
     qr_h    = (18 + qr_size) if qr_data else 0
 
     total_h = pad_t + title_h + (10 + sub_h_px if sub else 0) + rule_h + body_h + qr_h + pad_b
-    img = PIL.Image.new("1", (W, total_h), 1)
-    d   = PIL.ImageDraw.Draw(img)
+    d = DisplayList()
 
     bx0, by0, bx1, by1 = margin - 5, 5, W - margin + 5, total_h - 6
     d.rectangle([bx0, by0, bx1, by1], outline=0, width=3)
@@ -1177,37 +1024,55 @@ def create_label_freetext(title, subtitle=None, body_md=None, qr_data=None):
         d.line([(div_m, y), (W - div_m, y)], fill=0, width=1)
         d.line([(div_m, y + 2), (W - div_m, y + 2)], fill=0, width=1)
         y += 8
-        y = _render_md(d, md_segs, md_fonts, margin + 15, y, inner_w)
+        y = body.place(d, margin + 15, y)
 
     if qr_data:
         y += 18
         qr_img = _make_qr_image(qr_data, qr_size)
-        img.paste(qr_img, ((W - qr_size) // 2, y))
+        d.paste(qr_img, ((W - qr_size) // 2, y))
 
-    return img
+    return d.rasterize((W, total_h))
 
 
 # ---------------------------------------------------------------------------
 # Rendering to bytes / PNG
 # ---------------------------------------------------------------------------
 
-def label_to_printer_bytes(img: PIL.Image.Image) -> bytes:
-    """Return raw ESC/POS bytes ready to send to the YHK-835E printer."""
+# GS v 0 m=0: print a raster bit image, one bit per dot, black = 1. Its row
+# count is 16 bits, so taller labels have to go out as several bands.
+_RASTER_CMD      = b"\x1d\x76\x30\x00"
+_RASTER_MAX_ROWS = 0xFFFF
+
+
+def label_to_printer_chunks(img: PIL.Image.Image, band_rows=None):
+    """Yield the ESC/POS bytes for ``img`` in pieces: a GS v 0 header, then
+    that band's packed rows, for each band of at most ``band_rows`` rows (the
+    whole label by default, split only past the command's row limit).
+
+    ``img`` is a 1-bit label as the create_label_* functions return; other
+    modes are converted first. Rows are packed straight from the image with
+    PIL's inverting "1;I" raw packer, which also leaves the bits past the
+    right edge white, so narrow labels are the only ones that need a padded
+    copy."""
+    if img.mode != "1":
+        img = img.convert("1")
     if img.width < PRINTER_WIDTH:
         padded = PIL.Image.new("1", (PRINTER_WIDTH, img.height), 1)
         padded.paste(img)
         img = padded
-    if img.size[0] % 8:
-        img2 = PIL.Image.new("1", (img.size[0] + 8 - img.size[0] % 8, img.size[1]), "white")
-        img2.paste(img, (0, 0))
-        img = img2
-    img = PIL.ImageOps.invert(img.convert("L")).convert("1")
-    return (
-        b"\x1d\x76\x30\x00"
-        + struct.pack("2B", img.size[0] // 8 % 256, img.size[0] // 8 // 256)
-        + struct.pack("2B", img.size[1] % 256, img.size[1] // 256)
-        + img.tobytes()
-    )
+    row_bytes = (img.width + 7) // 8
+    rows      = img.height
+    data      = memoryview(img.tobytes("raw", "1;I"))
+    band      = max(1, min(band_rows or rows, _RASTER_MAX_ROWS))
+    for top in range(0, max(rows, 1), band):
+        n = min(band, rows - top)
+        yield _RASTER_CMD + struct.pack("<HH", row_bytes, n)
+        yield data[top * row_bytes:(top + n) * row_bytes]
+
+
+def label_to_printer_bytes(img: PIL.Image.Image, band_rows=None) -> bytes:
+    """Return raw ESC/POS bytes ready to send to the YHK-835E printer."""
+    return b"".join(label_to_printer_chunks(img, band_rows))
 
 
 def label_to_png_bytes(img: PIL.Image.Image) -> bytes:
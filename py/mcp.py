@@ -23,7 +23,7 @@ from flask import Blueprint, Response, request
 
 from py.db import get_conn
 from py.helpers import (
-    load_data,
+    load_summaries,
     load_one,
     save_new_plant,
     update_plant as _update_plant,
@@ -507,7 +507,7 @@ def _call_tool(name: str, args: dict, user: dict) -> str:
     lang = user.get("lang", "en")
 
     if name == "list_plants":
-        plants = load_data(uid)
+        plants = load_summaries(uid)
         include_dead = args.get("include_dead", False)
         include_stash = args.get("include_stash", False)
         if not include_dead:
@@ -0,0 +1,119 @@
+"""Request-scoped identity map, plus a small LRU for per-process caches.
+
+A single request often looks the same row up several times — the ownership
+check in ``login_required_for_plant`` loads the plant, then the view loads it
+again. Lookups routed through ``cached()`` are kept on ``flask.g`` for the rest
+of the request, and the write helpers call ``forget()`` so a view never reads
+back stale data after changing it.
+
+Outside a request (scripts, benchmarks) nothing is cached.
+
+``LRUCache`` outlives requests. Its users put everything the value depends on
+(e.g. a data version) into the key, so entries never need invalidating; stale
+ones just age out.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from flask import g, has_request_context
+
+
+def _table(kind: str) -> Optional[Dict[Hashable, Any]]:
+    if not has_request_context():
+        return None
+    return g.setdefault("_memo", {}).setdefault(kind, {})
+
+
+def cached(kind: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Return the memoized ``kind``/``key`` value, calling ``loader()`` once."""
+    table = _table(kind)
+    if table is None:
+        return loader()
+    if key not in table:
+        table[key] = loader()
+    return table[key]
+
+
+def remember(kind: str, key: Hashable, value: Any) -> None:
+    """Store a value fetched some other way (e.g. in a batch) for ``cached()``."""
+    table = _table(kind)
+    if table is not None:
+        table[key] = value
+
+
+def forget(kind: str, key: Hashable = None) -> None:
+    """Drop one memoized entry, or every entry of ``kind`` when key is None."""
+    table = _table(kind)
+    if table is None:
+        return
+    if key is None:
+        table.clear()
+    else:
+        table.pop(key, None)
+
+
+class LRUCache:
+    """Thread-safe mapping that keeps the ``maxsize`` most recently used keys.
+
+    Entries older than ``ttl`` seconds (if given) count as missing. ``hits``
+    and ``misses`` count get() results. With ``weigh`` (e.g. ``len`` for
+    bytes values), ``maxsize`` bounds the total weight of the values instead
+    of their number; a value heavier than that is not stored."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None,
+                 weigh: Optional[Callable[[Any], int]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.weigh = weigh
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                self._pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        weight = self.weigh(value) if self.weigh else 1
+        with self._lock:
+            self._pop(key)
+            if weight > self.maxsize:
+                return
+            self._data[key] = (value, expires, weight)
+            self._weight += weight
+            while self._weight > self.maxsize:
+                self._pop(next(iter(self._data)))
+
+    def _pop(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._weight -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses,
+                "size": self._weight if self.weigh else len(self._data), "maxsize": self.maxsize}
@@ -8,6 +8,12 @@ language, so each string is translated at most once per language.
 Translation is keyless via deep-translator's GoogleTranslator. Any failure
 (missing dependency, network error, unsupported language) degrades gracefully to
 the original text and never blocks rendering.
+
+Rendering never waits for the translator either: a cache miss shows the
+original and notes the string on ``flask.g``; flush_translation_misses() queues
+a request's misses in ``translation_jobs`` in one write once the response is
+done. Background threads in each worker (or ``flask translation-worker``) fill
+the cache, and later renders pick the result up.
 """
 
 from __future__ import annotations
@@ -17,12 +23,16 @@ import hashlib
 import html
 import json
 import os
+import sqlite3
+import threading
+import time
 from types import SimpleNamespace
 
 import flask
 
-from py.db import get_conn
-from py.helpers import AVAILABLE_LANGS
+from py.db import bump_meta, get_conn, get_meta, set_meta
+from py.helpers import AVAILABLE_LANGS, translatable_texts
+from py.memo import LRUCache, cached, forget, remember
 
 # Languages the UI (and therefore translation targets) supports. Derived from
 # the single language list so adding a language needs no change here.
@@ -37,13 +47,56 @@ _CONFIG_PATH = os.path.join(
 
 
 @functools.lru_cache(maxsize=1)
-def _api_key():
-    """Google Cloud Translation API key from config.json, or None."""
+def _config():
     try:
         with open(_CONFIG_PATH, encoding="utf-8") as f:
-            return (json.load(f).get("google_translation") or {}).get("key") or None
+            return json.load(f)
     except Exception:
-        return None
+        return {}
+
+
+def _api_key():
+    """Google Cloud Translation API key from config.json, or None."""
+    return (_config().get("google_translation") or {}).get("key") or None
+
+
+# In-process LRU in front of translations_cache, one per worker. Only hits are
+# kept. Admin edits and deletes bump the "translations_generation" counter in
+# app_meta; every worker polls it and drops its LRU when it moves.
+# Tunable under "translation_cache" in config.json.
+_LRU_DEFAULTS = {"max_entries": 10000, "ttl_seconds": 3600, "poll_seconds": 2}
+_lru_conf = {**_LRU_DEFAULTS, **(_config().get("translation_cache") or {})}
+_lru = LRUCache(_lru_conf["max_entries"], ttl=_lru_conf["ttl_seconds"])
+_GENERATION_KEY = "translations_generation"
+_generation = None
+_generation_checked = float("-inf")
+
+
+def _sync_generation() -> None:
+    """Drop the LRU if another worker changed translations_cache entries
+    since we last looked. Polls the DB at most every poll_seconds."""
+    global _generation, _generation_checked
+    now = time.monotonic()
+    if now - _generation_checked < _lru_conf["poll_seconds"]:
+        return
+    _generation_checked = now
+    gen = get_meta(get_conn(), _GENERATION_KEY, 0)
+    if gen != _generation:
+        _lru.clear()
+        _generation = gen
+
+
+def _bump_generation(conn) -> None:
+    """Call inside any transaction that rewrites or deletes existing
+    translations_cache rows, so every worker drops its LRU; clear this
+    worker's own with ``_lru.clear()`` once the transaction has committed."""
+    global _generation
+    _generation = bump_meta(conn, _GENERATION_KEY)
+
+
+def translation_cache_stats() -> dict:
+    """Hit/miss counters and size of this worker's translation LRU."""
+    return {**_lru.stats(), "ttl_seconds": _lru.ttl, "generation": _generation}
 
 
 def _machine_translate(text, source_lang, target_lang, fmt="text"):
@@ -62,20 +115,7 @@ def _machine_translate(text, source_lang, target_lang, fmt="text"):
     key = _api_key()
     if key:
         try:
-            import requests
-
-            params = {"q": text, "target": target_lang, "format": fmt, "key": key}
-            if source_lang:
-                params["source"] = source_lang
-            resp = requests.post(
-                "https://translation.googleapis.com/language/translate/v2",
-                data=params,
-                timeout=10,
-            )
-            resp.raise_for_status()
-            translated = resp.json()["data"]["translations"][0]["translatedText"]
-            # In HTML mode the entities are meaningful markup; leave them be.
-            return translated if fmt == "html" else html.unescape(translated)
+            return _api_translate([text], source_lang, target_lang, fmt, key)[0]
         except Exception:
             pass  # fall through to the keyless endpoint
 
@@ -90,21 +130,141 @@ def _machine_translate(text, source_lang, target_lang, fmt="text"):
         return None
 
 
+_API_URL = "https://translation.googleapis.com/language/translate/v2"
+
+# Per-request limits for the v2 endpoint: at most 128 ``q`` values, and we keep
+# the total text well under its ~200 KB body limit.
+_BATCH_MAX_ITEMS = 128
+_BATCH_MAX_CHARS = 30000
+
+
+def _api_translate(texts, source_lang, target_lang, fmt, key):
+    """One Cloud Translation v2 request for ``texts``. Returns the
+    translations in order; raises on any HTTP or shape error."""
+    import requests
+
+    params = [("q", t) for t in texts]
+    params += [("target", target_lang), ("format", fmt), ("key", key)]
+    if source_lang:
+        params.append(("source", source_lang))
+    resp = requests.post(_API_URL, data=params, timeout=10 + len(texts) // 10)
+    resp.raise_for_status()
+    out = [t["translatedText"] for t in resp.json()["data"]["translations"]]
+    if len(out) != len(texts):
+        raise ValueError(f"asked for {len(texts)} translations, got {len(out)}")
+    # In HTML mode the entities are meaningful markup; leave them be.
+    return out if fmt == "html" else [html.unescape(t) for t in out]
+
+
+def _batches(texts):
+    """Split indexes into ``texts`` into runs that fit one API request."""
+    batch, chars = [], 0
+    for i, t in enumerate(texts):
+        if batch and (len(batch) == _BATCH_MAX_ITEMS or chars + len(t) > _BATCH_MAX_CHARS):
+            yield batch
+            batch, chars = [], 0
+        batch.append(i)
+        chars += len(t)
+    if batch:
+        yield batch
+
+
+def _machine_translate_many(texts, source_lang, target_lang, fmt="text"):
+    """Batched _machine_translate(): strings sharing a language pair and format
+    go to the API a batch per request. Anything a batch didn't return
+    (request failed, empty result) is retried one by one through
+    _machine_translate, so one bad string only costs itself. Returns a list
+    aligned with ``texts``, None where translation failed."""
+    results = [None] * len(texts)
+    key = _api_key()
+    if key:
+        for batch in _batches(texts):
+            try:
+                out = _api_translate([texts[i] for i in batch], source_lang, target_lang, fmt, key)
+            except Exception:
+                continue
+            for i, translated in zip(batch, out):
+                results[i] = translated or None
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = _machine_translate(texts[i], source_lang, target_lang, fmt)
+    return results
+
+
 def _hash(text: str, target_lang: str) -> str:
     return hashlib.sha256(f"{target_lang}:{text}".encode("utf-8")).hexdigest()
 
 
 def _cache_get(text: str, target_lang: str) -> str | None:
     h = _hash(text, target_lang)
-    with get_conn() as conn:
-        row = conn.execute(
-            "SELECT translated FROM translations_cache "
-            "WHERE source_hash = ? AND target_lang = ?",
-            (h, target_lang),
-        ).fetchone()
+    return cached("translation", (h, target_lang), lambda: _cache_lookup(h, target_lang))
+
+
+def _cache_lookup(h: str, target_lang: str) -> str | None:
+    _sync_generation()
+    value = _lru.get((h, target_lang))
+    if value is None:
+        value = _cache_select(h, target_lang)
+        if value is not None:
+            _lru.put((h, target_lang), value)
+    return value
+
+
+def _cache_select(h: str, target_lang: str) -> str | None:
+    row = get_conn().execute(
+        "SELECT translated FROM translations_cache "
+        "WHERE source_hash = ? AND target_lang = ?",
+        (h, target_lang),
+    ).fetchone()
     return row["translated"] if row else None
 
 
+# Stay well below SQLite's bound-parameter limit in the IN (...) lists.
+_PREFETCH_CHUNK = 500
+
+
+def prefetch_translations(texts, target_lang: str, source_lang=None) -> None:
+    """Resolve the cache entries for every string a page is about to render
+    with one ``IN (...)`` query, and keep them (hits and misses) for the rest
+    of the request, so the per-string lookups in ``translate_content`` and
+    ``translate_html`` no longer touch the database.
+
+    Applies the same skip rules as ``translate_content``. Outside a request
+    this is a no-op."""
+    if not flask.has_request_context() or target_lang not in SUPPORTED_LANGS:
+        return
+    if source_lang and source_lang == target_lang:
+        return
+    _sync_generation()
+    hashes = []
+    for h in {_hash(t, target_lang) for t in texts if t and len(t.strip()) >= _MIN_LEN}:
+        value = _lru.get((h, target_lang))
+        if value is None:
+            hashes.append(h)
+        else:
+            remember("translation", (h, target_lang), value)
+    found = _cache_select_many(hashes, target_lang)
+    for h in hashes:
+        remember("translation", (h, target_lang), found.get(h))
+        if h in found:
+            _lru.put((h, target_lang), found[h])
+
+
+def _cache_select_many(hashes, target_lang: str) -> dict:
+    """{source_hash: translated} for those of ``hashes`` that are cached."""
+    conn = get_conn()
+    found = {}
+    for i in range(0, len(hashes), _PREFETCH_CHUNK):
+        chunk = hashes[i:i + _PREFETCH_CHUNK]
+        rows = conn.execute(
+            "SELECT source_hash, translated FROM translations_cache "
+            f"WHERE target_lang = ? AND source_hash IN ({','.join('?' * len(chunk))})",
+            [target_lang, *chunk],
+        )
+        found.update((r["source_hash"], r["translated"]) for r in rows)
+    return found
+
+
 def _cache_put(text: str, target_lang: str, translated: str, source_lang=None) -> None:
     h = _hash(text, target_lang)
     with get_conn() as conn:
@@ -116,13 +276,19 @@ def _cache_put(text: str, target_lang: str, translated: str, source_lang=None) -
         ).fetchone()
         if existing and existing["edited"]:
             return
+        # An upsert, not INSERT OR REPLACE, so the translations_fts triggers fire.
         conn.execute(
-            "INSERT OR REPLACE INTO translations_cache "
+            "INSERT INTO translations_cache "
             "(source_hash, target_lang, source_lang, source_text, translated, edited) "
-            "VALUES (?, ?, ?, ?, ?, 0)",
+            "VALUES (?, ?, ?, ?, ?, 0) "
+            "ON CONFLICT(source_hash, target_lang) DO UPDATE SET "
+            "  source_lang = excluded.source_lang, source_text = excluded.source_text, "
+            "  translated = excluded.translated, edited = 0, created_at = datetime('now')",
             (h, target_lang, source_lang, text, translated),
         )
         conn.commit()
+    remember("translation", (h, target_lang), translated)
+    _lru.put((h, target_lang), translated)
 
 
 def translate_content(text, target_lang: str, source_lang=None) -> str:
@@ -147,21 +313,23 @@ def translate_content(text, target_lang: str, source_lang=None) -> str:
     if cached is not None:
         return cached
 
+    _note_miss(text, target_lang, source_lang, "text")
+    return text  # for now; a later render gets the cached translation
+
+
+def _translate_texts(texts, source_lang, target_lang):
+    """_machine_translate_many() for plain text, with the capitalisation fix."""
     # A standalone capitalized word can be misparsed as a proper noun (e.g.
     # "Avocatier" -> "Lawyer" instead of "Avocado"). Translating it lowercased
     # avoids that; we restore the leading capital on the result.
-    leading_upper = text[:1].isupper()
-    to_send = (text[:1].lower() + text[1:]) if leading_upper else text
-
-    result = _machine_translate(to_send, source_lang, target_lang)
-    if not result:
-        return text  # graceful degradation: show the original
-
-    if leading_upper and result[:1].islower():
-        result = result[:1].upper() + result[1:]
+    leading_upper = [t[:1].isupper() for t in texts]
+    to_send = [(t[:1].lower() + t[1:]) if up else t for t, up in zip(texts, leading_upper)]
 
-    _cache_put(text, target_lang, result, source_lang=source_lang)
-    return result
+    results = _machine_translate_many(to_send, source_lang, target_lang)
+    return [
+        r[:1].upper() + r[1:] if r and up and r[:1].islower() else r
+        for r, up in zip(results, leading_upper)
+    ]
 
 
 def translate_html(html_text, target_lang: str, source_lang=None):
@@ -179,41 +347,463 @@ def translate_html(html_text, target_lang: str, source_lang=None):
     if cached is not None:
         return cached
 
-    result = _machine_translate(html_text, source_lang, target_lang, fmt="html")
-    if not result:
-        return None
+    _note_miss(html_text, target_lang, source_lang, "html")
+    return None
+
+
+def _note_miss(text, target_lang, source_lang, fmt) -> None:
+    """Remember a cache miss for flush_translation_misses(). Outside a
+    request (scripts, the MCP worker) it is queued straight away."""
+    if flask.has_request_context():
+        flask.g.setdefault("_translation_misses", []).append((text, target_lang, source_lang, fmt))
+    else:
+        enqueue_translation(text, target_lang, source_lang, fmt)
+
+
+def translations_pending() -> bool:
+    """True if this request showed any string untranslated. Its response
+    must not be cached: the translations will land without anything else
+    the page depends on changing."""
+    return bool(flask.g.get("_translation_misses"))
+
+
+def defer_prewarm(fn, *args) -> None:
+    """Run ``fn(*args)``, a prewarm that follows a committed write, from
+    flush_translation_misses() once the response is built, so it can neither
+    slow down nor fail the write's request. Outside a request it runs now."""
+    if flask.has_request_context():
+        flask.g.setdefault("_deferred_prewarms", []).append((fn, args))
+    else:
+        fn(*args)
+
 
-    _cache_put(html_text, target_lang, result, source_lang=source_lang)
-    return result
+def flush_translation_misses() -> None:
+    """Queue the current request's misses in one transaction, then run its
+    deferred prewarms. Meant to run after the response is built; a locked or
+    broken database only means the strings are queued by a later render or
+    prewarm. Never raises."""
+    misses = flask.g.pop("_translation_misses", None)
+    if misses:
+        try:
+            enqueue_translations(misses)
+        except sqlite3.Error:
+            pass
+    for fn, args in flask.g.pop("_deferred_prewarms", None) or ():
+        try:
+            fn(*args)
+        except sqlite3.Error:
+            pass
+
+
+def translations_generation() -> int:
+    """Counter bumped whenever an existing translation is edited or deleted
+    (see _bump_generation); part of the validators of translated pages."""
+    return get_meta(get_conn(), _GENERATION_KEY, 0)
+
+
+# ---------------------------------------------------------------------------
+# Background translation
+# ---------------------------------------------------------------------------
+
+# Tunable under "translation_worker" in config.json. threads = 0 disables the
+# in-process threads (run `flask translation-worker` instead).
+_WORKER_DEFAULTS = {"threads": 2, "poll_seconds": 5, "max_attempts": 3, "batch_size": _BATCH_MAX_ITEMS,
+                    "retry_failed_after": "-1 day", "stale_running_after": "-10 minutes"}
+_worker_conf = {**_WORKER_DEFAULTS, **(_config().get("translation_worker") or {})}
+
+# Keys this worker queued recently, so a page repeating a missing string
+# doesn't write the same job row on every render.
+_recently_queued = LRUCache(10000, ttl=300)
+_wake = threading.Event()
+_threads_pid = None
+_threads_lock = threading.Lock()
+
+
+def enqueue_translation(text, target_lang, source_lang=None, fmt="text") -> None:
+    """Queue ``text`` for background translation (no-op if already queued).
+    A job that failed is retried once retry_failed_after has passed."""
+    enqueue_translations([(text, target_lang, source_lang, fmt)])
+
+
+def enqueue_translations(items, start_workers=True) -> int:
+    """Queue many ``(text, target_lang, source_lang, fmt)`` items in one
+    transaction; see enqueue_translation(). Returns how many were written.
+    With ``start_workers=False`` the caller works the queue off itself."""
+    rows = {}
+    for text, target_lang, source_lang, fmt in items:
+        h = _hash(text, target_lang)
+        if (h, target_lang) in rows or _recently_queued.get((h, target_lang)):
+            continue
+        rows[(h, target_lang)] = (h, target_lang, source_lang, text, fmt, _worker_conf["retry_failed_after"])
+    if not rows:
+        return 0
+    with get_conn() as conn:
+        conn.executemany(
+            "INSERT INTO translation_jobs (source_hash, target_lang, source_lang, source_text, fmt) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(source_hash, target_lang) DO UPDATE SET "
+            "  status = 'pending', attempts = 0, updated_at = datetime('now') "
+            "WHERE status = 'failed' AND updated_at < datetime('now', ?)",
+            list(rows.values()),
+        )
+        conn.commit()
+    # Only once written, so a failed write doesn't hide the keys for a while.
+    for key in rows:
+        _recently_queued.put(key, True)
+    if start_workers:
+        _start_threads()
+        _wake.set()
+    return len(rows)
+
+
+def content_translation_enabled() -> bool:
+    """The translate_content feature flag from config.json."""
+    return (_config().get("features") or {}).get("translate_content", True)
+
+
+def prewarm_translations(texts, html_texts, source_lang, start_workers=True) -> int:
+    """Queue ``texts`` (plain) and ``html_texts`` (rendered Markdown) for
+    translation into every other supported language, skipping what is
+    already cached, so the first foreign viewer finds them ready. Uses the
+    same skip rules as translate_content/translate_html and honours the
+    translate_content feature flag. Returns the number of jobs written."""
+    if not content_translation_enabled():
+        return 0
+    wanted = [(t, "text") for t in texts if t and len(t.strip()) >= _MIN_LEN]
+    wanted += [(t, "html") for t in html_texts if t]
+    items = []
+    for lang in sorted(SUPPORTED_LANGS - {source_lang}):
+        by_hash = {_hash(t, lang): (t, fmt) for t, fmt in wanted}
+        found = _cache_select_many(list(by_hash), lang)
+        items.extend((t, lang, source_lang, fmt) for h, (t, fmt) in by_hash.items() if h not in found)
+    return enqueue_translations(items, start_workers=start_workers)
+
+
+_RUNNABLE = "(status = 'pending' OR (status = 'running' AND updated_at < datetime('now', ?)))"
+
+
+def _claim_jobs():
+    """Mark up to batch_size runnable jobs as running and return them, or [].
+    They share the oldest job's (source_lang, target_lang, fmt) so they can
+    go out as one request. The conditional UPDATE makes each claim safe
+    across threads and workers."""
+    conn = get_conn()
+    stale = _worker_conf["stale_running_after"]
+    while True:
+        first = conn.execute(
+            f"SELECT source_lang, target_lang, fmt FROM translation_jobs WHERE {_RUNNABLE} "
+            "ORDER BY created_at LIMIT 1",
+            (stale,),
+        ).fetchone()
+        if first is None:
+            return []
+        candidates = conn.execute(
+            f"SELECT rowid, * FROM translation_jobs WHERE {_RUNNABLE} "
+            "AND source_lang IS ? AND target_lang = ? AND fmt = ? "
+            "ORDER BY created_at LIMIT ?",
+            (stale, first["source_lang"], first["target_lang"], first["fmt"], _worker_conf["batch_size"]),
+        ).fetchall()
+        claimed = []
+        with conn:
+            for job in candidates:
+                if conn.execute(
+                    "UPDATE translation_jobs SET status = 'running', attempts = attempts + 1, "
+                    "updated_at = datetime('now') "
+                    "WHERE rowid = ? AND status = ? AND updated_at = ?",
+                    (job["rowid"], job["status"], job["updated_at"]),
+                ).rowcount:
+                    claimed.append(job)
+        if claimed:
+            return claimed
+
+
+def _run_jobs(jobs) -> None:
+    """Translate a claimed batch and settle every job in it."""
+    first = jobs[0]
+    texts = [job["source_text"] for job in jobs]
+    try:
+        if first["fmt"] == "html":
+            results = _machine_translate_many(texts, first["source_lang"], first["target_lang"], fmt="html")
+        else:
+            results = _translate_texts(texts, first["source_lang"], first["target_lang"])
+        error = "no translation returned"
+    except Exception as e:  # the worker must survive anything a job does
+        results, error = [None] * len(jobs), str(e)
+
+    for job, result in zip(jobs, results):
+        if result:
+            _cache_put(job["source_text"], job["target_lang"], result, source_lang=job["source_lang"])
+    with get_conn() as conn:
+        for job, result in zip(jobs, results):
+            if result:
+                conn.execute("DELETE FROM translation_jobs WHERE rowid = ?", (job["rowid"],))
+            else:
+                conn.execute(
+                    "UPDATE translation_jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                    "error_msg = ?, updated_at = datetime('now') WHERE rowid = ?",
+                    (_worker_conf["max_attempts"], error, job["rowid"]),
+                )
+        conn.commit()
+
+
+def run_translation_worker(stop_when_idle=False) -> int:
+    """Work off translation_jobs until stopped (or, with ``stop_when_idle``,
+    until the queue is empty). Returns the number of jobs processed."""
+    done = 0
+    while True:
+        try:
+            jobs = _claim_jobs()
+            if not jobs:
+                if stop_when_idle:
+                    return done
+                _maybe_collect_garbage()
+                _wake.wait(_worker_conf["poll_seconds"])
+                _wake.clear()
+                continue
+            _run_jobs(jobs)
+            done += len(jobs)
+        except sqlite3.Error:
+            if stop_when_idle:
+                raise
+            time.sleep(_worker_conf["poll_seconds"])  # e.g. locked or not migrated yet
+
+
+def _start_threads() -> None:
+    """Start this process's worker threads on first use (again after a fork)."""
+    global _threads_pid
+    if _threads_pid == os.getpid() or _worker_conf["threads"] <= 0:
+        return
+    with _threads_lock:
+        if _threads_pid == os.getpid():
+            return
+        _threads_pid = os.getpid()
+        for i in range(_worker_conf["threads"]):
+            threading.Thread(target=run_translation_worker, name=f"translate-{i}", daemon=True).start()
+
+
+def translation_queue_counts() -> dict:
+    """Number of translation jobs per status."""
+    rows = get_conn().execute("SELECT status, COUNT(*) FROM translation_jobs GROUP BY status")
+    return {status: n for status, n in rows}
+
+
+# ---------------------------------------------------------------------------
+# Garbage collection
+# ---------------------------------------------------------------------------
+
+# Tunable under "translation_gc" in config.json. An idle worker thread runs
+# the collection once every interval_hours (0 = only via `flask
+# gc-translations`, e.g. from cron). Rows younger than min_age are kept, so
+# content written while a run is under way can't lose its fresh translations.
+_GC_DEFAULTS = {"interval_hours": 24, "batch_size": 500, "pause_seconds": 0.05, "min_age": "-1 day"}
+_gc_conf = {**_GC_DEFAULTS, **(_config().get("translation_gc") or {})}
+_GC_LAST_KEY = "translation_gc_last"
+_GC_REPORT_KEY = "translation_gc_report"
+_gc_next_check = 0.0
+
+
+def translation_cache_size() -> dict:
+    """Rows in translations_cache and the bytes it takes on disk, indexes and
+    full-text index included. Without SQLite's dbstat table, bytes falls back
+    to the stored text alone."""
+    conn = get_conn()
+    rows = conn.execute("SELECT COUNT(*) FROM translations_cache").fetchone()[0]
+    btrees = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE rootpage > 0 AND tbl_name IN ("
+        "'translations_cache', 'translations_fts_data', 'translations_fts_idx', "
+        "'translations_fts_docsize', 'translations_fts_config')"
+    )]
+    try:
+        size = sum(
+            conn.execute("SELECT pgsize FROM dbstat WHERE name = ? AND aggregate = TRUE", (name,)).fetchone()[0]
+            for name in btrees
+        )
+    except sqlite3.OperationalError:  # built without SQLITE_ENABLE_DBSTAT_VTAB
+        size = conn.execute(
+            "SELECT SUM(length(source_hash) + length(target_lang) + length(translated) "
+            "+ coalesce(length(source_text), 0)) FROM translations_cache"
+        ).fetchone()[0]
+    return {"rows": rows, "bytes": size or 0}
+
+
+def collect_translation_garbage(live_texts=None) -> dict:
+    """Delete machine translations whose source text is no longer stored
+    anywhere (edited notes leave theirs behind in every language).
+
+    ``live_texts`` defaults to helpers.translatable_texts(). Admin-corrected
+    rows and rows younger than min_age are kept. The table is walked in
+    id order, batch_size rows at a time, each batch deleted in its own
+    short transaction with a pause after it, so writers are never blocked
+    for long. Freed pages are reused by later inserts; the file is not
+    vacuumed. Returns (and records in app_meta) the number of rows deleted
+    and the table size before and after."""
+    live = {_hash(t, lang) for t in (live_texts if live_texts is not None else translatable_texts())
+            for lang in SUPPORTED_LANGS}
+    conn = get_conn()
+    report = {"started_at": time.strftime("%Y-%m-%d %H:%M:%S"), "before": translation_cache_size(), "deleted": 0}
+    last = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, source_hash FROM translations_cache "
+            "WHERE id > ? AND edited = 0 AND created_at < datetime('now', ?) "
+            "ORDER BY id LIMIT ?",
+            (last, _gc_conf["min_age"], _gc_conf["batch_size"]),
+        ).fetchall()
+        if not rows:
+            break
+        last = rows[-1][0]
+        dead = [row_id for row_id, h in rows if h not in live]
+        if not dead:
+            continue
+        with conn:
+            report["deleted"] += conn.execute(
+                "DELETE FROM translations_cache WHERE edited = 0 "
+                f"AND id IN ({','.join('?' * len(dead))})",
+                dead,
+            ).rowcount
+        time.sleep(_gc_conf["pause_seconds"])
+    report["after"] = translation_cache_size()
+    with conn:
+        if report["deleted"]:
+            _bump_generation(conn)
+        set_meta(conn, _GC_REPORT_KEY, json.dumps(report))
+    if report["deleted"]:
+        _lru.clear()
+    return report
+
+
+def last_translation_gc() -> dict | None:
+    """The report of the most recent collect_translation_garbage() run."""
+    value = get_meta(get_conn(), _GC_REPORT_KEY)
+    return json.loads(value) if value else None
+
+
+def _maybe_collect_garbage() -> None:
+    """Run the collection if interval_hours have passed since the last run
+    by any worker. The conditional upsert lets exactly one worker claim it."""
+    global _gc_next_check
+    interval = _gc_conf["interval_hours"] * 3600
+    now = time.time()
+    if interval <= 0 or now < _gc_next_check:
+        return
+    conn = get_conn()
+    last = float(get_meta(conn, _GC_LAST_KEY, 0))
+    if now - last < interval:
+        _gc_next_check = last + interval
+        return
+    _gc_next_check = now + interval
+    with conn:
+        claimed = conn.execute(
+            "INSERT INTO app_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value WHERE value < ?",
+            (_GC_LAST_KEY, now, now - interval),
+        ).rowcount
+    if claimed:
+        collect_translation_garbage()
 
 
 # ---------------------------------------------------------------------------
 # Admin: browse / correct cached content translations
 # ---------------------------------------------------------------------------
 
-def list_cached_translations(query=None, target_lang=None, limit=500):
-    """Return cached content translations for the admin editor, newest first.
-
-    Filters: ``query`` (substring match on source or translated text) and
-    ``target_lang``. Rows missing a stored source text (cached before that
-    column existed) can't be meaningfully edited and are skipped."""
-    sql = [
-        "SELECT source_hash, target_lang, source_lang, source_text, translated, "
-        "edited, created_at FROM translations_cache WHERE source_text IS NOT NULL"
-    ]
+# Ranked editor searches show at most this many matches; refine the query
+# to get past them.
+_SEARCH_RANKED_MAX = 1000
+
+
+def _fts_query(text: str) -> str:
+    """Turn free admin input into an FTS5 query: every word must match, the
+    last one as a prefix (search-as-you-type). Words are quoted, so FTS5
+    syntax in the input is taken literally."""
+    words = [w.replace('"', '""') for w in text.split()]
+    if not words:
+        return ""
+    return " ".join(f'"{w}"' for w in words[:-1]) + (" " if len(words) > 1 else "") + f'"{words[-1]}"*'
+
+
+def search_cached_translations(query=None, target_lang=None, after=None, limit=100):
+    """One page of cached content translations for the admin editor.
+
+    Without ``query``: edited entries first, then newest first, paged by
+    keyset along idx_translations_cache_listing, so deep pages cost the same
+    as the first. With it: full-text matches on source or translated text
+    (translations_fts), best match first. FTS5 has to score every match to
+    rank them, so ranked results stop at the best ``_SEARCH_RANKED_MAX``:
+    each page scores all matches but only ever sorts that many. Either way,
+    pass the returned cursor as ``after`` to get the next page. Rows missing
+    a stored source text (cached before that column existed) can't be
+    meaningfully edited and are skipped.
+
+    Returns ``(rows, cursor)``; ``cursor`` is None on the last page."""
+    cols = ("c.id, c.source_hash, c.target_lang, c.source_lang, c.source_text, "
+            "c.translated, c.edited, c.created_at")
+    where = ["c.source_text IS NOT NULL"]
     params = []
     if target_lang:
-        sql.append("AND target_lang = ?")
+        where.append("c.target_lang = ?")
         params.append(target_lang)
+    try:
+        if query:
+            match = _fts_query(query)
+            if not match:
+                return [], None
+            ranked = (f"SELECT {cols}, f.rank AS rank FROM translations_fts f "
+                      "JOIN translations_cache c ON c.id = f.rowid "
+                      "WHERE translations_fts MATCH ? AND " + " AND ".join(where) +
+                      " ORDER BY f.rank, c.id LIMIT ?")
+            params = [match, *params, _SEARCH_RANKED_MAX]
+            sql = f"SELECT * FROM ({ranked})"
+            order = "rank, id"
+            where = []
+            if after:
+                rank, row_id = after.split("|")
+                where.append("(rank, id) > (?, ?)")
+                params += [float(rank), int(row_id)]
+        else:
+            sql = f"SELECT {cols} FROM translations_cache c"
+            order = "c.edited DESC, c.created_at DESC, c.id DESC"
+            if after:
+                edited, created_at, row_id = after.split("|")
+                where.append("(c.edited, c.created_at, c.id) < (?, ?, ?)")
+                params += [int(edited), created_at, int(row_id)]
+    except ValueError:  # a malformed cursor from the URL: start over
+        return search_cached_translations(query, target_lang, limit=limit)
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(limit + 1)
+    rows = [dict(r) for r in get_conn().execute(sql, params).fetchall()]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
     if query:
-        sql.append("AND (source_text LIKE ? OR translated LIKE ?)")
-        like = f"%{query}%"
-        params += [like, like]
-    sql.append("ORDER BY edited DESC, created_at DESC LIMIT ?")
-    params.append(limit)
-    with get_conn() as conn:
-        rows = conn.execute(" ".join(sql), params).fetchall()
-    return [dict(r) for r in rows]
+        cursor = f"{last['rank']!r}|{last['id']}"
+    else:
+        cursor = f"{last['edited']}|{last['created_at']}|{last['id']}"
+    return rows, cursor
+
+
+def list_cached_translations(query=None, target_lang=None, limit=500):
+    """First ``limit`` rows of search_cached_translations()."""
+    return search_cached_translations(query, target_lang, limit=limit)[0]
+
+
+_BACKFILL_DONE_KEY = "source_text_backfilled"
+
+
+def source_text_backfill_pending() -> bool:
+    """True while cache rows from before the source_text column may still
+    need backfill_source_text(). Once none are left this is recorded in
+    app_meta, and later calls cost one lookup."""
+    conn = get_conn()
+    if get_meta(conn, _BACKFILL_DONE_KEY):
+        return False
+    if conn.execute("SELECT 1 FROM translations_cache WHERE source_text IS NULL LIMIT 1").fetchone():
+        return True
+    with conn:
+        set_meta(conn, _BACKFILL_DONE_KEY, 1)
+    return False
 
 
 def backfill_source_text(candidates) -> int:
@@ -222,22 +812,44 @@ def backfill_source_text(candidates) -> int:
     The cache is keyed by a one-way hash of the source text, so the original
     can't be recovered from the row itself. Instead we take ``candidates`` (every
     string the app might have translated — plant names, notes, rendered note
-    HTML, event notes…), hash each against every target language, and stamp the
-    source text onto any matching row that is still missing it. Returns the number
-    of rows updated."""
-    updated = 0
-    with get_conn() as conn:
-        for text in candidates:
-            if not text:
-                continue
-            for lang in SUPPORTED_LANGS:
-                cur = conn.execute(
-                    "UPDATE translations_cache SET source_text = ? "
-                    "WHERE source_hash = ? AND target_lang = ? AND source_text IS NULL",
-                    (text, _hash(text, lang), lang),
-                )
-                updated += cur.rowcount
-        conn.commit()
+    HTML, event notes…), hash each against the target languages that still have
+    such rows, keep the hashes that hit one of them (read once through the
+    partial index) and stamp the source text onto those rows with one join
+    against a temp table. Rows that match nothing have no source left to
+    recover, so the backfill is then recorded as done (see
+    source_text_backfill_pending).
+    Returns the number of rows updated."""
+    conn = get_conn()
+    missing = {(r[0], r[1]) for r in conn.execute(
+        "SELECT source_hash, target_lang FROM translations_cache WHERE source_text IS NULL")}
+    langs = {lang for _, lang in missing}
+    matches = {}
+    for text in set(candidates):
+        if text:
+            for lang in langs:
+                key = (_hash(text, lang), lang)
+                if key in missing:
+                    matches[key] = text
+    with conn:
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS source_backfill ("
+            "  source_hash TEXT NOT NULL, target_lang TEXT NOT NULL, source_text TEXT NOT NULL,"
+            "  PRIMARY KEY (source_hash, target_lang)) WITHOUT ROWID"
+        )
+        conn.execute("DELETE FROM temp.source_backfill")
+        conn.executemany(
+            "INSERT INTO temp.source_backfill VALUES (?, ?, ?)",
+            ((h, lang, text) for (h, lang), text in matches.items()),
+        )
+        updated = conn.execute(
+            "UPDATE translations_cache SET source_text = b.source_text "
+            "FROM temp.source_backfill b "
+            "WHERE translations_cache.source_text IS NULL "
+            "AND b.source_hash = translations_cache.source_hash "
+            "AND b.target_lang = translations_cache.target_lang"
+        ).rowcount
+        conn.execute("DELETE FROM temp.source_backfill")
+        set_meta(conn, _BACKFILL_DONE_KEY, 1)
     return updated
 
 
@@ -250,8 +862,11 @@ def update_cached_translation(source_hash: str, target_lang: str, translated: st
             "WHERE source_hash = ? AND target_lang = ?",
             (translated, source_hash, target_lang),
         )
+        _bump_generation(conn)
         conn.commit()
-        return cur.rowcount > 0
+    _lru.clear()
+    forget("translation", (source_hash, target_lang))
+    return cur.rowcount > 0
 
 
 def delete_cached_translation(source_hash: str, target_lang: str) -> bool:
@@ -261,8 +876,11 @@ def delete_cached_translation(source_hash: str, target_lang: str) -> bool:
             "DELETE FROM translations_cache WHERE source_hash = ? AND target_lang = ?",
             (source_hash, target_lang),
         )
+        _bump_generation(conn)
         conn.commit()
-        return cur.rowcount > 0
+    _lru.clear()
+    forget("translation", (source_hash, target_lang))
+    return cur.rowcount > 0
 
 
 def tr(text):
@@ -1,8 +1,10 @@
 import hashlib
 import secrets
+import time
 
 from werkzeug.security import generate_password_hash, check_password_hash
 from py.db import get_conn
+from py.memo import cached, forget
 from flask import session, g
 from datetime import date
 
@@ -21,6 +23,7 @@ def generate_api_key(user_id: int) -> str:
             (_hash_key(raw), raw, user_id),
         )
         conn.commit()
+    forget("user", user_id)
     return raw
 
 
@@ -29,6 +32,7 @@ def revoke_api_key(user_id: int) -> None:
     with get_conn() as conn:
         conn.execute("UPDATE users SET api_key_hash = NULL, api_key = NULL WHERE id = ?", (user_id,))
         conn.commit()
+    forget("user", user_id)
 
 
 def get_api_key(user_id: int) -> str | None:
@@ -78,6 +82,10 @@ def get_all_users():
         return conn.execute("SELECT * FROM users ORDER BY id ASC").fetchall()
 
 def get_user_by_id(uid: int):
+    """Fetch a user row (memoized for the request)."""
+    return cached("user", uid, lambda: _get_user_by_id(uid))
+
+def _get_user_by_id(uid: int):
     with get_conn() as conn:
         return conn.execute("SELECT * FROM users WHERE id = ?", (uid,)).fetchone()
 
@@ -85,9 +93,14 @@ def update_user_lang(uid: int, lang: str):
     with get_conn() as conn:
         conn.execute("UPDATE users SET lang=? WHERE id=?", (lang, uid))
         conn.commit()
+    forget("user", uid)
+
+# A resumed session refreshes last_login at most this often (seconds).
+LOGIN_RECORD_INTERVAL = 15 * 60
 
 def login_user(user_row):
     session["uid"] = user_row["id"]
+    session.pop("login_recorded", None)
 
 def record_user_login(user_id: int):
     """
@@ -112,6 +125,24 @@ def record_user_login(user_id: int):
             (user_id, today),
         )
         conn.commit()
+    forget("user", user_id)
+
+def touch_user_login(user_id: int):
+    """
+    Throttled record_user_login for the per-request hook: writes at most once
+    per LOGIN_RECORD_INTERVAL per session, plus on the first request of each
+    day so the daily login table stays exact. The last write time is kept in
+    the session, so it holds across workers.
+    """
+    now = int(time.time())
+    today = date.today().isoformat()
+    last = session.get("login_recorded")
+    if (last and last[0] == user_id and last[1] == today
+            and now - last[2] < LOGIN_RECORD_INTERVAL):
+        return
+    record_user_login(user_id)
+    session["login_recorded"] = [user_id, today, now]
 
 def logout_user():
     session.pop("uid", None)
+    session.pop("login_recorded", None)
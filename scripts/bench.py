@@ -0,0 +1,1054 @@
+#!/usr/bin/env python3
+"""
+Plantlog micro-benchmarks.
+
+Every benchmark builds its own throwaway database in a temp directory, so it
+never touches data/plants.db. Run from anywhere:
+
+    python scripts/bench.py load_data [--sizes 10,1000,10000]
+    python scripts/bench.py query_plans      # exits 1 if a hot query scans
+    python scripts/bench.py startup
+    python scripts/bench.py location_tree --sizes 100,1000,3000
+    python scripts/bench.py translate_batch --sizes 5000   # needs requests
+    python scripts/bench.py markdown --sizes 100,1000
+    python scripts/bench.py labels
+    python scripts/bench.py icons
+    python scripts/bench.py label_golden --golden /tmp/labels.json   # 1st run writes, then checks
+    python scripts/bench.py label_layout
+    python scripts/bench.py escpos --sizes 1,10,50
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from py import db  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _fresh_db():
+    """Point py.db at an empty database in a temp dir and create the schema."""
+    db.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="plantlog-bench-"), "plants.db")
+    db.init_db()
+
+
+def _seed(n_plants, events_per_plant=6, user_id=1):
+    """Insert one user owning ``n_plants`` plants with a few events each."""
+    rnd = random.Random(n_plants)
+    with db.get_conn() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO users (id, username, pw_hash) VALUES (?, ?, 'x')",
+            (user_id, f"bench{user_id}"),
+        )
+        types = {r["code"]: r["id"] for r in conn.execute("SELECT id, code FROM event_types")}
+        codes = ["sow", "sprout", "water", "measure", "custom", "flower"]
+        cur = conn.cursor()
+        for i in range(n_plants):
+            cur.execute(
+                "INSERT INTO plants (common, latin, location, notes, user_id) VALUES (?,?,?,?,?)",
+                (f"Plant {i}", f"Genus species{i % 50}",
+                 f"Greenhouse/Bench {i % 20}/Tray {i % 7}", "Some *notes*", user_id),
+            )
+            pid = cur.lastrowid
+            cur.executemany(
+                "INSERT INTO events (plant_id, event_type_id, happened_on, range_min, range_min_u,"
+                " range_max, range_max_u, measure_val, measure_unit, custom_label, custom_note)"
+                " VALUES (?,?,?,3,'days',10,'days',5,'cm','Note','Text')",
+                [(pid, types[rnd.choice(codes)], f"2024-{1 + j % 12:02d}-{1 + j:02d}")
+                 for j in range(events_per_plant)],
+            )
+        conn.commit()
+
+
+class _QueryCounter:
+    """Count SELECT statements issued through py.helpers.get_conn."""
+
+    def __init__(self, module):
+        self.module = module
+        self.selects = 0
+
+    def __enter__(self):
+        self._real = self.module.get_conn
+
+        def counting_conn():
+            conn = self._real()
+            conn.set_trace_callback(self._trace)
+            return conn
+
+        self.module.get_conn = counting_conn
+        return self
+
+    def __exit__(self, *exc):
+        self.module.get_conn = self._real
+        self._real().set_trace_callback(None)  # the connection is pooled
+
+    def _trace(self, sql):
+        if sql.lstrip().upper().startswith("SELECT"):
+            self.selects += 1
+
+
+def _import_app():
+    """Import the Flask app against the current (throwaway) DB_PATH."""
+    import app
+    return app
+
+
+def _timeit(fn, repeat=3):
+    """Best-of-``repeat`` wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def _load_data_reference(user_id):
+    """The previous load_data, one history SELECT per plant, kept verbatim as
+    the baseline (and oracle) for load_data."""
+    from py import helpers
+
+    with helpers.get_conn() as conn:
+        plants = conn.execute("""
+            SELECT p.*,
+                   st.code        AS state_code,
+                   st.label       AS state_label,
+                   st.icon_class  AS state_icon,
+                   st.color_class AS state_color,
+                   st.sort_rank   AS state_rank
+            FROM plants p
+            LEFT JOIN state_types st ON st.id = p.current_state_id
+            WHERE p.user_id = ?
+        """, (user_id,)).fetchall()
+
+        return [
+            {
+                "id": p["id"],
+                "common": p["common"],
+                "latin": p["latin"],
+                "location": p["location"],
+                "notes": p["notes"],
+                "variety": p["variety"] if "variety" in p.keys() else None,
+                "nickname": p["nickname"] if "nickname" in p.keys() else None,
+                "rusticity": p["rusticity"] if "rusticity" in p.keys() else None,
+                "count": p["count"] if "count" in p.keys() else 1,
+                "history": (hist := helpers._events_for_plant(conn, p["id"])),
+                "current": hist[-1] if hist else None,
+                "state": helpers._resolve_state(
+                    None if p["state_label"] is None else {
+                        "code":        p["state_code"],
+                        "label":       p["state_label"],
+                        "icon_class":  p["state_icon"],
+                        "color_class": p["state_color"],
+                    },
+                    hist, conn
+                ),
+                "state_rank": p["state_rank"] if p["state_rank"] is not None else 999
+            }
+            for p in plants
+        ]
+
+
+def bench_load_data(args):
+    """Dashboard loader: load_data with batched history vs. the old
+    load_data, one history query per plant. Both build the same plant dicts
+    (checked first), so the timings compare the whole call."""
+    from py import helpers
+
+    print(f"{'plants':>8} {'batched q':>10} {'batched ms':>11} {'per-plant q':>12} {'per-plant ms':>13}")
+    for n in args.sizes:
+        _fresh_db()
+        _seed(n)
+        if helpers.load_data(1) != _load_data_reference(1):
+            print(f"{n:>8} load_data differs from the old implementation")
+            sys.exit(1)
+        with _QueryCounter(helpers) as qc:
+            helpers.load_data(1)
+        batched_q = qc.selects
+        with _QueryCounter(helpers) as qc:
+            _load_data_reference(1)
+        per_plant_q = qc.selects
+        batched_ms = _timeit(lambda: helpers.load_data(1), repeat=5)
+        per_plant_ms = _timeit(lambda: _load_data_reference(1), repeat=5)
+        print(f"{n:>8} {batched_q:>10} {batched_ms:>11.1f} {per_plant_q:>12} {per_plant_ms:>13.1f}")
+
+
+# Lookup tables small enough that a full scan is the right plan.
+_SCAN_OK = {"et", "st", "event_types", "state_types"}
+_SCAN_RE = re.compile(r"\bSCAN (\w+)(?! USING (?:COVERING )?INDEX| VIRTUAL TABLE INDEX)")
+
+
+def bench_query_plans(args):
+    """Check with EXPLAIN QUERY PLAN that the hot queries use an index.
+
+    The statements are captured from the real code paths through the
+    connection's trace callback, so the check follows any change to the SQL."""
+    _fresh_db()
+    _seed(50)
+    app = _import_app()
+    from py import helpers, translate, users
+
+    key = users.generate_api_key(1)
+    client = app.app.test_client()
+    conn = db.get_conn()
+    plant_id = conn.execute("SELECT MIN(id) FROM plants").fetchone()[0]
+
+    def refresh_state():
+        with db.get_conn() as c:
+            helpers._refresh_current_state(c.cursor(), plant_id)
+
+    cases = {
+        "_events_for_plant":       lambda: helpers._events_for_plant(db.get_conn(), plant_id),
+        "load_data":               lambda: helpers.load_data(1),
+        "load_summaries":          lambda: helpers.load_summaries(1),
+        "load_summaries_page":     lambda: helpers.load_summaries(1, after_id=10, limit=20, location="Bench"),
+        "_refresh_current_state":  refresh_state,
+        "api_print_queue_pending": lambda: client.get("/api/print_queue/pending", headers={"X-API-Key": key}),
+        "get_user_by_api_key":     lambda: users.get_user_by_api_key(key),
+        "translations_listing":    lambda: translate.search_cached_translations(after="0|2026-01-01 00:00:00|1"),
+        "translations_search":     lambda: translate.search_cached_translations("basil", "fr", after="-1.0|1"),
+    }
+    failures = 0
+    for name, fn in cases.items():
+        statements = []
+        db.get_conn().set_trace_callback(statements.append)
+        fn()
+        conn = db.get_conn()
+        conn.set_trace_callback(None)
+        for sql in statements:
+            if not re.match(r"\s*(SELECT|UPDATE|DELETE)\b", sql, re.I):
+                continue
+            if "'main'." in sql:  # FTS5's own shadow-table statements
+                continue
+            plan = [r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+            scans = [t for line in plan for t in _SCAN_RE.findall(line) if t not in _SCAN_OK]
+            status = "SCAN " + ", ".join(scans) if scans else "ok"
+            failures += bool(scans)
+            print(f"{name:<24} {status:<12} {' | '.join(plan)}")
+    sys.exit(1 if failures else 0)
+
+
+def bench_startup(args):
+    """init_db() cost per worker boot: fresh DB, full re-run, current DB."""
+    _fresh_db()
+    _seed(100)
+
+    def fresh():
+        db.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="plantlog-bench-"), "plants.db")
+        db.init_db()
+
+    print(f"{'case':<22} {'ms':>8}")
+    print(f"{'empty database':<22} {_timeit(fresh):>8.2f}")
+    _fresh_db()
+    _seed(100)
+    print(f"{'full migration run':<22} {_timeit(lambda: db.init_db(force=True)):>8.2f}")
+    print(f"{'schema current':<22} {_timeit(db.init_db, repeat=20):>8.2f}")
+
+
+def _location_tree_reference(plants):
+    """The previous, quadratic build_location_tree, kept verbatim as the
+    oracle for the equivalence check."""
+    from py.helpers import LOCATION_SEP, parse_location_path
+    from collections import defaultdict, OrderedDict
+
+    # count how many plants live at each exact full_path
+    path_counts = defaultdict(int)
+    no_location_count = 0
+
+    for p in plants:
+        path = parse_location_path(p.get("location"))
+        if not path:
+            no_location_count += 1
+        else:
+            full = LOCATION_SEP.join(path)
+            path_counts[full] += 1
+            # also credit every ancestor
+            for depth in range(1, len(path)):
+                ancestor = LOCATION_SEP.join(path[:depth])
+                path_counts[ancestor] += 0  # ensure key exists but don't double-count
+
+    # build a set of all nodes (including intermediates)
+    all_nodes = {}  # full_path -> path segments
+    for p in plants:
+        path = parse_location_path(p.get("location"))
+        for depth in range(1, len(path) + 1):
+            fp = LOCATION_SEP.join(path[:depth])
+            if fp not in all_nodes:
+                all_nodes[fp] = path[:depth]
+
+    # compute cumulative count for each node (plants at node + all descendants)
+    def count_for(fp):
+        return sum(
+            cnt for pfp, cnt in path_counts.items()
+            if pfp == fp or pfp.startswith(fp + LOCATION_SEP)
+        )
+
+    # build flat sorted list depth-first
+    result = []
+
+    def _recurse(prefix, depth):
+        children = sorted(
+            (fp for fp, segs in all_nodes.items()
+             if len(segs) == depth + 1 and (
+                 prefix is None and depth == 0 or
+                 (prefix is not None and fp.startswith(prefix + LOCATION_SEP) and len(fp.split(LOCATION_SEP)) == depth + 1)
+                 or (depth == 0)
+             )),
+        )
+        # top level: segments of length 1
+        if depth == 0:
+            children = sorted(fp for fp, segs in all_nodes.items() if len(segs) == 1)
+        else:
+            children = sorted(
+                fp for fp, segs in all_nodes.items()
+                if len(segs) == depth + 1 and fp.startswith(prefix + LOCATION_SEP)
+            )
+        for fp in children:
+            segs = all_nodes[fp]
+            result.append({
+                "label":     segs[-1],
+                "full_path": fp,
+                "depth":     depth,
+                "count":     count_for(fp),
+            })
+            _recurse(fp, depth + 1)
+
+    _recurse(None, 0)
+
+    if no_location_count:
+        result.append({
+            "label":     None,
+            "full_path": None,
+            "depth":     0,
+            "count":     no_location_count,
+        })
+
+    return result
+
+
+def _random_locations(rnd, n):
+    """Plant dicts with nested, messy locations: blanks, stray separators,
+    padding, shared prefixes and plants on intermediate nodes."""
+    segs = ["Greenhouse", "Bench 1", "Bench 2", "Tray", "Cell", "A", "a", "B ", "Z", "Bench"]
+    plants = []
+    for _ in range(n):
+        r = rnd.random()
+        if r < 0.05:
+            loc = rnd.choice([None, "", "  ", "/", " / "])
+        else:
+            depth = rnd.randint(1, 5)
+            loc = "/".join(rnd.choice(segs) + rnd.choice(["", str(rnd.randint(0, 30))]) for _ in range(depth))
+            if rnd.random() < 0.1:
+                loc = rnd.choice(["/", " /", "//"]) + loc + rnd.choice(["", "/", " / "])
+        plants.append({"location": loc})
+    return plants
+
+
+def bench_location_tree(args):
+    """build_location_tree: equivalence with the old version, then timings."""
+    from py.helpers import build_location_tree
+
+    rnd = random.Random(0)
+    for case in range(500):
+        plants = _random_locations(rnd, rnd.randint(0, 60))
+        got, want = build_location_tree(plants), _location_tree_reference(plants)
+        if got != want:
+            print(f"MISMATCH in case {case}:\n  {plants!r}\n  got  {got!r}\n  want {want!r}")
+            sys.exit(1)
+    print("500 random cases identical to the previous implementation")
+
+    print(f"{'plants':>8} {'nodes':>8} {'trie ms':>9} {'old ms':>9}")
+    for n in args.sizes:
+        plants = [{"location": f"Greenhouse {i % 7}/Bench {i % 31}/Tray {i % 97}/Cell {i}"} for i in range(n)]
+        nodes = len(build_location_tree(plants))
+        new_ms = _timeit(lambda: build_location_tree(plants))
+        old_ms = _timeit(lambda: _location_tree_reference(plants), repeat=1)
+        print(f"{n:>8} {nodes:>8} {new_ms:>9.1f} {old_ms:>9.1f}")
+
+
+class _StubTranslateAPI:
+    """Local stand-in for the Cloud Translation v2 endpoint. Answers
+    "[<target>] <q>" for every q and fails the whole request with a 500 if any
+    q contains FAIL. Counts requests and strings."""
+
+    def __init__(self):
+        import http.server
+        import threading
+        from urllib.parse import parse_qs
+
+        stub = self
+        self.requests = self.strings = 0
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+                stub.requests += 1
+                stub.strings += len(form["q"])
+                if any("FAIL" in q for q in form["q"]):
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = {"data": {"translations": [
+                    {"translatedText": f"[{form['target'][0]}] {q}"} for q in form["q"]]}}
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+def bench_translate_batch(args):
+    """Background translation against a local stub API: requests per string,
+    and per-item fallback when a batch fails."""
+    from py import translate
+
+    stub = _StubTranslateAPI()
+    translate._API_URL = stub.url
+    translate._api_key = lambda: "stub-key"
+    translate._worker_conf["threads"] = 0  # drain in this thread only
+
+    print(f"{'strings':>8} {'requests':>9} {'sent':>7} {'ms':>9} {'translated':>11} {'failed':>7}")
+    for n in args.sizes:
+        _fresh_db()
+        translate._recently_queued.clear()
+        translate._lru.clear()
+        stub.requests = stub.strings = 0
+        texts = [f"Note number {i} about the Plant" for i in range(n)] + ["This one will FAIL"]
+        for t in texts:
+            translate.enqueue_translation(t, "fr", "en")
+        t0 = time.perf_counter()
+        translate.run_translation_worker(stop_when_idle=True)
+        ms = (time.perf_counter() - t0) * 1000
+        conn = db.get_conn()
+        translated = conn.execute("SELECT COUNT(*) FROM translations_cache").fetchone()[0]
+        wrong = conn.execute(
+            "SELECT COUNT(*) FROM translations_cache WHERE translated != '[fr] ' || "
+            "lower(substr(source_text, 1, 1)) || substr(source_text, 2)").fetchone()[0]
+        failed = translate.translation_queue_counts().get("failed", 0)
+        print(f"{n + 1:>8} {stub.requests:>9} {stub.strings:>7} {ms:>9.1f} {translated:>11} {failed:>7}")
+        if translated != n or failed != 1 or wrong:
+            print(f"UNEXPECTED: {translated} cached (want {n}), {failed} failed (want 1), {wrong} mismatched")
+            sys.exit(1)
+
+
+_NOTE_WORDS = ("water", "daily", "repot", "compost", "seedlings", "south window", "mist", "fertilise",
+               "légèrement", "vattne", "полив", "pinch out", "aphids", "neem oil", "hardening off")
+
+
+def _random_note(rnd):
+    """A plant note in the shapes people actually write: plain sentences with
+    line breaks, emphasis, lists, the odd table or code block, links."""
+    def sentence():
+        words = [rnd.choice(_NOTE_WORDS) for _ in range(rnd.randint(3, 14))]
+        if rnd.random() < 0.3:
+            i = rnd.randrange(len(words))
+            words[i] = rnd.choice(["**", "*", "`"]).join(["", words[i], ""])
+        return " ".join(words).capitalize() + rnd.choice([".", ".", "!", "?"])
+
+    blocks = []
+    for _ in range(rnd.randint(1, 5)):
+        kind = rnd.random()
+        if kind < 0.5:
+            blocks.append("\n".join(sentence() for _ in range(rnd.randint(1, 3))))
+        elif kind < 0.7:
+            blocks.append("\n".join(f"{rnd.choice('-*')} {sentence()}" for _ in range(rnd.randint(2, 5))))
+        elif kind < 0.8:
+            blocks.append(f"{'#' * rnd.randint(1, 3)} {sentence()}")
+        elif kind < 0.9:
+            rows = [f"| {rnd.randint(1, 31)}/{rnd.randint(1, 12)} | {rnd.randint(1, 90)} cm |"
+                    for _ in range(rnd.randint(1, 6))]
+            blocks.append("\n".join(["| date | height |", "|---|---|", *rows]))
+        elif kind < 0.95:
+            blocks.append("```\n" + "\n".join(sentence() for _ in range(2)) + "\n```")
+        else:
+            blocks.append(f"See [the guide](https://example.org/{rnd.randint(1, 999)}) & <b>notes</b>")
+    return "\n\n".join(blocks)
+
+
+def bench_markdown(args):
+    """render_markdown: output identical to markdown.markdown() on a notes
+    corpus, then per-note cost uncached (one-shot vs reused converter) and
+    cached, for a page that renders every note twice (display + tr_md)."""
+    import markdown
+    from py import helpers
+
+    rnd = random.Random(0)
+    corpus = [_random_note(rnd) for _ in range(2000)]
+    corpus += ["", "   ", "a  \nb", "<div>raw *html*</div>", "```\nunclosed", "| a |\n|---|", "1. x\n2. y"]
+    ext = helpers._MD_EXTENSIONS
+    for _ in range(2):  # cold, then from the cache
+        for text in corpus:
+            if str(helpers.render_markdown(text)) != markdown.markdown(text, extensions=ext):
+                print(f"MISMATCH for {text!r}")
+                sys.exit(1)
+    print(f"{len(corpus)} notes render identically to markdown.markdown()")
+
+    print(f"{'notes':>8} {'one-shot ms':>12} {'reused ms':>10} {'cached ms':>10} {'page ms':>9}")
+    for n in args.sizes:
+        notes = [_random_note(rnd) for _ in range(n)]
+
+        def cold():
+            helpers._markdown_cache.clear()
+            for t in notes:
+                helpers.render_markdown(t)
+
+        def page():
+            for t in notes:
+                helpers.render_markdown(t)
+                helpers.render_markdown(t)
+
+        one_shot = _timeit(lambda: [markdown.markdown(t, extensions=ext) for t in notes], repeat=1)
+        reused = _timeit(cold, repeat=1)
+        cached = _timeit(lambda: [helpers.render_markdown(t) for t in notes])
+        page_ms = _timeit(page)
+        print(f"{n:>8} {one_shot:>12.1f} {reused:>10.1f} {cached:>10.2f} {page_ms:>9.2f}")
+
+
+_LABEL_NOTES = (
+    "# Care\n\nWater **twice a week** in summer, *sparingly* in winter.\n\n"
+    "- Full sun\n- Free-draining soil\n\n| Month | Feed |\n|---|---|\n| May | Tomato feed |\n| Jun | Tomato feed |"
+)
+
+
+def _label_cases():
+    """One representative render per label style, as (name, callable)."""
+    from py import label_printer as lp
+
+    args = ("Cherry tomato", "Solanum lycopersicum", "01-05-2025", "Sungold", "Goldie", "Pinch out side shoots")
+    url = "https://plants.example.org/p/42"
+    return [
+        ("classic",     lambda: lp.create_label_classic(*args)),
+        ("circular",    lambda: lp.create_label_circular(*args)),
+        ("minimal",     lambda: lp.create_label_minimal(*args)),
+        ("detailed_v",  lambda: lp.create_label_detailed_v(*args[:5], "Greenhouse/Bench 1", _LABEL_NOTES, args[5])),
+        ("detailed_h",  lambda: lp.create_label_detailed_h(*args[:5], "Greenhouse/Bench 1", _LABEL_NOTES, args[5],
+                                                           plant_url=url)),
+        ("qr",          lambda: lp.create_label_qr(*args[:3], url, *args[3:])),
+        ("stake_wrap",  lambda: lp.create_label_stake_wrap(*args)),
+        ("freetext",    lambda: lp.create_label_freetext("Strawberry jam", "June 2025", _LABEL_NOTES, url)),
+    ]
+
+
+def bench_labels(args):
+    """Render latency per label style: uncached (fonts probed and parsed on
+    every _get_font call, as before the font cache), first render after
+    start-up, and with the shared font cache warm."""
+    import PIL.ImageFont
+    from py import label_printer as lp
+
+    cached_get_font = lp._get_font
+
+    def uncached_get_font(variant, size):
+        path = lp._find_font.__wrapped__(variant)
+        return PIL.ImageFont.truetype(path, size) if path else PIL.ImageFont.load_default()
+
+    def uncached(fn):
+        def run():
+            lp._get_font = uncached_get_font
+            try:
+                fn()
+            finally:
+                lp._get_font = cached_get_font
+        return run
+
+    def first(fn):
+        def run():
+            lp._find_font.cache_clear()
+            lp._get_font.cache_clear()
+            fn()
+        return run
+
+    truetype = PIL.ImageFont.truetype
+    loads = [0]
+
+    def counted(fn):
+        def counting_truetype(*a, **kw):
+            loads[0] += 1
+            return truetype(*a, **kw)
+        loads[0] = 0
+        PIL.ImageFont.truetype = counting_truetype
+        try:
+            fn()
+        finally:
+            PIL.ImageFont.truetype = truetype
+        return loads[0]
+
+    print(f"{'style':<12} {'uncached ms':>12} {'first ms':>9} {'cached ms':>10} {'TTF loads':>12}")
+    for name, fn in _label_cases():
+        uncached_ms = _timeit(uncached(fn), repeat=10)
+        first_ms = _timeit(first(fn), repeat=10)
+        fn()
+        warm_ms = _timeit(fn, repeat=20)
+        before, after = counted(uncached(fn)), counted(fn)
+        print(f"{name:<12} {uncached_ms:>12.1f} {first_ms:>9.1f} {warm_ms:>10.1f} {before:>5} -> {after:<3}")
+
+
+def _golden_cases():
+    """Every label style across the inputs that change its layout: nickname
+    or not, variety or not, no/short/long Markdown notes, QR or not."""
+    from py import label_printer as lp
+
+    md = ("# Title\n\nSome **bold** and *italic* text that wraps across several lines to test wrapping.\n\n"
+          "- bullet one\n- bullet **two** long long long long long long long long\n\n"
+          "| Key | Value |\n|---|---|\n| Sun | Full |\n| Water | Often |\n\n> quoted line\n\nline1\nline2")
+    long_md = "\n\n".join([md] * 6)
+    url = "https://plants.example.org/p/42"
+    cases = []
+    for nick in (None, "Goldie"):
+        for var in (None, "Sungold"):
+            for extra in (None, "Pinch out *side* shoots", md):
+                args = ("Cherry tomato with a long name", "Solanum lycopersicum", "01-05-2025", var, nick, extra)
+                tag = f"nick={nick} var={var} extra={len(extra or '')}"
+                cases += [
+                    (f"classic {tag}",    lambda a=args: lp.create_label_classic(*a)),
+                    (f"circular {tag}",   lambda a=args: lp.create_label_circular(*a)),
+                    (f"minimal {tag}",    lambda a=args: lp.create_label_minimal(*a)),
+                    (f"stake_wrap {tag}", lambda a=args: lp.create_label_stake_wrap(*a)),
+                    (f"qr {tag}",         lambda a=args: lp.create_label_qr(*a[:3], url, *a[3:])),
+                ]
+                for notes in (None, md, long_md):
+                    ntag = f"{tag} notes={len(notes or '')}"
+                    cases += [
+                        (f"detailed_v {ntag}", lambda a=args, n=notes: lp.create_label_detailed_v(*a[:5], "Bench 1", n, a[5])),
+                        (f"detailed_h {ntag}", lambda a=args, n=notes: lp.create_label_detailed_h(*a[:5], "Bench 1", n, a[5],
+                                                                                                 plant_url=url)),
+                    ]
+    for title in ("Jam", "A much longer title for the strawberry jam jars"):
+        for sub in (None, "June 2025"):
+            for body in (None, md, long_md):
+                for qr in (None, url):
+                    tag = f"title={len(title)} sub={sub} body={len(body or '')} qr={bool(qr)}"
+                    cases.append((f"freetext {tag}", lambda a=(title, sub, body, qr): lp.create_label_freetext(*a)))
+    return cases
+
+
+def bench_label_golden(args):
+    """Label pixels and printer bytes against a golden set. Writes digests
+    to --golden on the first run (e.g. before a renderer change) and compares
+    with them afterwards; exits 1 on any difference. Digests depend on the
+    installed fonts, so write and check on the same machine."""
+    import hashlib
+    from py import label_printer as lp
+
+    digests = {}
+    for name, fn in _golden_cases():
+        img = fn()
+        pixels = hashlib.sha256(f"{img.mode} {img.size}".encode() + img.tobytes()).hexdigest()
+        printer = hashlib.sha256(lp.label_to_printer_bytes(img)).hexdigest()
+        digests[name] = [pixels, printer]
+    if not os.path.exists(args.golden):
+        with open(args.golden, "w", encoding="utf-8") as f:
+            json.dump(digests, f, indent=1, sort_keys=True)
+        print(f"wrote {len(digests)} label digests to {args.golden}")
+        return
+    with open(args.golden, encoding="utf-8") as f:
+        golden = json.load(f)
+    bad = 0
+    for name, (pixels, printer) in golden.items():
+        got = digests.get(name)
+        if got != [pixels, printer]:
+            bad += 1
+            what = "missing" if got is None else ", ".join(
+                k for k, a, b in (("pixels", pixels, got[0]), ("printer bytes", printer, got[1])) if a != b)
+            print(f"DIFFERS  {name}: {what}")
+    print(f"{len(golden)} labels, {bad} differ")
+    if bad:
+        sys.exit(1)
+
+
+def _markdown_reference(blocks, fonts, max_w, align="left"):
+    """The previous two-pass Markdown path, kept verbatim as the baseline
+    for label_layout: _md_height wraps and measures every block on a 1x1
+    scratch image to size the canvas, then _md_render wraps and measures
+    it all again while drawing. Returns the rendered note."""
+    import PIL.Image
+    import PIL.ImageDraw
+    from py.label_layout import heading_fonts
+
+    token_re = re.compile(r'\S+|\s+')
+
+    def _text_h(d, text, font):
+        b = d.textbbox((0, 0), text, font=font)
+        return b[3] - b[1]
+
+    def _text_w(d, text, font):
+        b = d.textbbox((0, 0), text, font=font)
+        return b[2] - b[0]
+
+    def _wrap_runs(runs, fonts, max_w, default_style="regular"):
+        lines = [[]]
+        cur_w = 0
+        for text, style in runs:
+            if style == "break":
+                lines.append([])
+                cur_w = 0
+                continue
+            font = fonts.get(style, fonts[default_style])
+            for tok in token_re.findall(text):
+                tw = font.getlength(tok)
+                if tok.isspace():
+                    if not lines[-1]:
+                        continue
+                    if cur_w + tw > max_w:
+                        lines.append([])
+                        cur_w = 0
+                    else:
+                        lines[-1].append((tok, style))
+                        cur_w += tw
+                else:
+                    if cur_w + tw > max_w and lines[-1]:
+                        lines.append([])
+                        cur_w = 0
+                    lines[-1].append((tok, style))
+                    cur_w += tw
+        return lines
+
+    def _line_h(d, line, fonts, default_style="regular"):
+        if not line:
+            return _text_h(d, "Ay", fonts[default_style])
+        return max(_text_h(d, t if t.strip() else "A", fonts.get(s, fonts[default_style])) for t, s in line)
+
+    def _runs_height(d, runs, fonts, max_w, default_style="regular", line_gap=2):
+        lines = _wrap_runs(runs, fonts, max_w, default_style)
+        h = 0
+        for i, line in enumerate(lines):
+            h += _line_h(d, line, fonts, default_style)
+            if i < len(lines) - 1:
+                h += line_gap
+        return h
+
+    def _draw_runs(d, runs, fonts, x, y, max_w, default_style="regular", line_gap=2, align="left"):
+        lines = _wrap_runs(runs, fonts, max_w, default_style)
+        for i, line in enumerate(lines):
+            segments = []
+            for t, s in line:
+                if segments and segments[-1][1] == s:
+                    segments[-1][0] += t
+                else:
+                    segments.append([t, s])
+            h = _line_h(d, line, fonts, default_style)
+            if align == "center":
+                line_w = sum(fonts.get(s, fonts[default_style]).getlength(t) for t, s in segments)
+                cx = x + max(0, (max_w - line_w) / 2)
+            else:
+                cx = x
+            for text, style in segments:
+                font = fonts.get(style, fonts[default_style])
+                d.text((cx, y), text, font=font, fill=0)
+                cx += font.getlength(text)
+            y += h
+            if i < len(lines) - 1:
+                y += line_gap
+        return y
+
+    def _block_height(d, block, fonts, max_w, line_gap=2):
+        t = block["type"]
+        if t in ("h1", "h2", "h3"):
+            return _runs_height(d, block["runs"], heading_fonts(fonts, int(t[1])), max_w, line_gap=line_gap)
+        if t == "para":
+            return _runs_height(d, block["runs"], fonts, max_w, line_gap=line_gap)
+        if t == "bullet":
+            indent = _text_w(d, "• ", fonts["regular"])
+            return _runs_height(d, block["runs"], fonts, max_w - indent, line_gap=line_gap)
+        if t == "table":
+            col1_w = max(40, int(max_w * 0.42))
+            col2_w = max_w - col1_w - 10
+            bold_fonts = {**fonts, "regular": fonts["bold"]}
+            h = 0
+            for row in block["rows"]:
+                if len(row) >= 2:
+                    h1 = _runs_height(d, row[0], bold_fonts, col1_w, line_gap=line_gap)
+                    h2 = _runs_height(d, row[1], fonts,      col2_w, line_gap=line_gap)
+                    h += max(h1, h2) + 4
+                elif row:
+                    h += _runs_height(d, row[0], fonts, max_w, line_gap=line_gap) + 4
+            return h
+        return 0
+
+    def _render_block(d, block, fonts, x, y, max_w, line_gap=2, align="left"):
+        t = block["type"]
+        if t in ("h1", "h2", "h3"):
+            return _draw_runs(d, block["runs"], heading_fonts(fonts, int(t[1])), x, y, max_w,
+                              line_gap=line_gap, align=align)
+        if t == "para":
+            return _draw_runs(d, block["runs"], fonts, x, y, max_w, line_gap=line_gap, align=align)
+        if t == "bullet":
+            bw = _text_w(d, "• ", fonts["regular"])
+            d.text((x, y), "• ", font=fonts["regular"], fill=0)
+            return _draw_runs(d, block["runs"], fonts, x + bw, y, max_w - bw, line_gap=line_gap, align=align)
+        if t == "table":
+            col1_w = max(40, int(max_w * 0.42))
+            col2_w = max_w - col1_w - 10
+            bold_fonts = {**fonts, "regular": fonts["bold"]}
+            for row in block["rows"]:
+                if len(row) >= 2:
+                    h1 = _runs_height(d, row[0], bold_fonts, col1_w, line_gap=line_gap)
+                    h2 = _runs_height(d, row[1], fonts,      col2_w, line_gap=line_gap)
+                    row_h = max(h1, h2)
+                    _draw_runs(d, row[0], bold_fonts, x, y, col1_w, line_gap=line_gap)
+                    _draw_runs(d, row[1], fonts,      x + col1_w + 10, y, col2_w, line_gap=line_gap)
+                    d.line([(x, y + row_h + 1), (x + max_w, y + row_h + 1)], fill=0, width=1)
+                    y += row_h + 4
+                elif row:
+                    y = _draw_runs(d, row[0], fonts, x, y, max_w, line_gap=line_gap) + 4
+            return y
+        return y
+
+    td = PIL.ImageDraw.Draw(PIL.Image.new("1", (1, 1)))
+    height = sum(_block_height(td, b, fonts, max_w) for b in blocks) + 8 * max(0, len(blocks) - 1)
+    img = PIL.Image.new("1", (max_w, max(1, height)), 1)
+    d = PIL.ImageDraw.Draw(img)
+    y = 0
+    for i, b in enumerate(blocks):
+        y = _render_block(d, b, fonts, 0, y, max_w, align=align)
+        if i < len(blocks) - 1:
+            y += 8
+    return img
+
+
+def bench_label_layout(args):
+    """Single-pass label layout: font measurement calls (getbbox/getlength)
+    per render and render time, with py.label_layout's measurement caches
+    cold (each render on its own) and warm (a worker printing a run of
+    labels). The "+" cases carry six times the usual notes. Then the notes
+    alone, old two-pass path against MarkdownLayout: pixel-identical, with
+    calls and cold render time for each."""
+    import PIL.ImageFont
+    from py import label_layout, label_printer as lp
+
+    long_notes = "\n\n".join([_LABEL_NOTES] * 6)
+    args_ = ("Cherry tomato", "Solanum lycopersicum", "01-05-2025", "Sungold", "Goldie")
+    url = "https://plants.example.org/p/42"
+    cases = _label_cases() + [
+        ("detailed_v+", lambda: lp.create_label_detailed_v(*args_, "Greenhouse/Bench 1", long_notes, "Pinch out")),
+        ("detailed_h+", lambda: lp.create_label_detailed_h(*args_, "Greenhouse/Bench 1", long_notes, "Pinch out",
+                                                            plant_url=url)),
+        ("freetext+",   lambda: lp.create_label_freetext("Strawberry jam", "June 2025", long_notes, url)),
+    ]
+    caches = (label_layout.text_bbox, label_layout.multiline_bbox, label_layout.text_length)
+
+    def cold(fn):
+        def run():
+            for cache in caches:
+                cache.cache_clear()
+            fn()
+        return run
+
+    font_cls = PIL.ImageFont.FreeTypeFont
+    calls = [0]
+
+    def counted(fn):
+        originals = {name: getattr(font_cls, name) for name in ("getbbox", "getlength")}
+
+        def counting(orig):
+            def method(self, *a, **kw):
+                calls[0] += 1
+                return orig(self, *a, **kw)
+            return method
+
+        calls[0] = 0
+        for name, orig in originals.items():
+            setattr(font_cls, name, counting(orig))
+        try:
+            fn()
+        finally:
+            for name, orig in originals.items():
+                setattr(font_cls, name, orig)
+        return calls[0]
+
+    print(f"{'style':<12} {'measure calls':>14} {'cold ms':>8} {'warm ms':>8}")
+    for name, fn in cases:
+        fn()
+        n_calls = counted(cold(fn))
+        cold_ms = _timeit(cold(fn), repeat=20)
+        warm_ms = _timeit(fn, repeat=20)
+        print(f"{name:<12} {n_calls:>14} {cold_ms:>8.2f} {warm_ms:>8.2f}")
+
+    fonts = lp._build_md_fonts(15)
+    max_w = lp.PRINTER_WIDTH - 24
+
+    def single_pass(blocks, align="left"):
+        note = label_layout.MarkdownLayout(blocks, fonts, max_w, align=align)
+        dl = label_layout.DisplayList()
+        note.place(dl, 0, 0)
+        return dl.rasterize((max_w, max(1, note.height)))
+
+    notes = {n: lp._parse_md("\n\n".join([_LABEL_NOTES] * n)) for n in (1, 6, 24)}
+    bad = sum(single_pass(blocks, align).tobytes() != _markdown_reference(blocks, fonts, max_w, align).tobytes()
+              for blocks in notes.values() for align in ("left", "center"))
+    print(f"\n{len(notes) * 2} notes, {bad} differ from the two-pass renderer")
+    if bad:
+        sys.exit(1)
+    print(f"{'notes':<12} {'old calls':>10} {'new calls':>10} {'old ms':>8} {'new ms':>8}")
+    for n, blocks in notes.items():
+        old = lambda: _markdown_reference(blocks, fonts, max_w)  # noqa: E731
+        new = cold(lambda: single_pass(blocks))
+        label = f"x{n}"
+        print(f"{label:<12} {counted(old):>10} {counted(new):>10} "
+              f"{_timeit(old, repeat=10):>8.2f} {_timeit(new, repeat=10):>8.2f}")
+
+
+def _escpos_reference(img):
+    """The previous label_to_printer_bytes (pad, 1 -> L, invert, L -> 1,
+    pack), kept verbatim as the oracle for the escpos check."""
+    import struct
+    import PIL.Image
+    import PIL.ImageOps
+    from py.label_printer import PRINTER_WIDTH
+
+    if img.width < PRINTER_WIDTH:
+        padded = PIL.Image.new("1", (PRINTER_WIDTH, img.height), 1)
+        padded.paste(img)
+        img = padded
+    if img.size[0] % 8:
+        img2 = PIL.Image.new("1", (img.size[0] + 8 - img.size[0] % 8, img.size[1]), "white")
+        img2.paste(img, (0, 0))
+        img = img2
+    img = PIL.ImageOps.invert(img.convert("L")).convert("1")
+    return (
+        b"\x1d\x76\x30\x00"
+        + struct.pack("2B", img.size[0] // 8 % 256, img.size[0] // 8 // 256)
+        + struct.pack("2B", img.size[1] % 256, img.size[1] // 256)
+        + img.tobytes()
+    )
+
+
+def bench_escpos(args):
+    """label_to_printer_bytes: byte-identical to the old encoder on the
+    golden label set plus odd widths, banded output carrying the same rows,
+    then encode time on long stake_wrap and freetext labels."""
+    import PIL.Image
+    from py import label_printer as lp
+
+    images = [fn() for _, fn in _golden_cases()]
+    images += [PIL.Image.new("1", (w, 7), 1) for w in (1, 100, 383, 385, 390)]
+    bad = sum(lp.label_to_printer_bytes(img) != _escpos_reference(img) for img in images)
+    print(f"{len(images)} images, {bad} differ from the old encoder")
+
+    def unband(data):
+        rows, pos = [], 0
+        while pos < len(data):
+            row_bytes, n = data[pos + 4] | data[pos + 5] << 8, data[pos + 6] | data[pos + 7] << 8
+            rows.append(data[pos + 8:pos + 8 + row_bytes * n])
+            pos += 8 + row_bytes * n
+        return b"".join(rows)
+
+    whole = [lp.label_to_printer_bytes(img)[8:] for img in images]
+    banded = sum(unband(lp.label_to_printer_bytes(img, band_rows=64)) != w for img, w in zip(images, whole))
+    print(f"banded (64 rows): {banded} differ in raster data")
+    if bad or banded:
+        sys.exit(1)
+
+    print(f"{'label':<18} {'size':>11} {'old ms':>8} {'new ms':>8}")
+    for n in args.sizes:
+        cases = [
+            ("stake_wrap", lp.create_label_stake_wrap(" ".join(["Cherry tomato"] * n), "Solanum lycopersicum",
+                                                      "01-05-2025", "Sungold")),
+            ("freetext", lp.create_label_freetext("Strawberry jam", "June 2025", "\n\n".join([_LABEL_NOTES] * n))),
+        ]
+        for name, img in cases:
+            old_ms = _timeit(lambda: _escpos_reference(img), repeat=10)
+            new_ms = _timeit(lambda: lp.label_to_printer_bytes(img), repeat=10)
+            label = f"{name} x{n}"
+            print(f"{label:<18} {img.width:>5}x{img.height:<5} {old_ms:>8.2f} {new_ms:>8.2f}")
+
+
+def _icon_reference(name, size):
+    """The previous, uncached _load_png_icon with its per-pixel lambda
+    threshold, kept verbatim as the oracle for the icon check."""
+    import PIL.Image
+    from py.label_printer import _ICON_DIR
+
+    path = _ICON_DIR / f"{name}.png"
+    if not path.exists():
+        return None
+    try:
+        src = PIL.Image.open(path).convert("RGBA")
+        src = src.resize((size, size), PIL.Image.LANCZOS)
+        bg = PIL.Image.new("L", (size, size), 255)
+        bg.paste(src.convert("L"), mask=src.split()[3])
+        return bg.point(lambda p: 0 if p < 128 else 255).convert("1")
+    except Exception:
+        return None
+
+
+def bench_icons(args):
+    """_load_png_icon: pixel-identical to the old version at every size,
+    then per-icon cost uncached (old), on a cache miss, and on a hit."""
+    from py import label_printer as lp
+
+    names = sorted(p.stem for p in lp._ICON_DIR.glob("*.png")) + ["missing"]
+    for name in names:
+        for size in range(4, 97):
+            got, want = lp._load_png_icon(name, size), _icon_reference(name, size)
+            if (got is None) != (want is None) or (got is not None and (
+                    got.mode, got.size, got.tobytes()) != (want.mode, want.size, want.tobytes())):
+                print(f"MISMATCH for {name} at {size}px")
+                sys.exit(1)
+    print(f"{len(names)} icons x 93 sizes pixel-identical to the previous implementation")
+
+    def miss(name, size):
+        lp._load_png_icon.cache_clear()
+        lp._load_png_icon(name, size)
+
+    print(f"{'icon':<10} {'size':>5} {'old ms':>8} {'miss ms':>8} {'hit us':>8}")
+    for name, size in lp._ICON_DEFAULT_SIZES:
+        old_ms = _timeit(lambda: _icon_reference(name, size), repeat=20)
+        miss_ms = _timeit(lambda: miss(name, size), repeat=20)
+        lp._load_png_icon(name, size)
+        hit_us = _timeit(lambda: lp._load_png_icon(name, size), repeat=20) * 1000
+        print(f"{name:<10} {size:>5} {old_ms:>8.3f} {miss_ms:>8.3f} {hit_us:>8.2f}")
+
+
+BENCHMARKS = {
+    "load_data": bench_load_data,
+    "query_plans": bench_query_plans,
+    "startup": bench_startup,
+    "location_tree": bench_location_tree,
+    "translate_batch": bench_translate_batch,
+    "markdown": bench_markdown,
+    "labels": bench_labels,
+    "icons": bench_icons,
+    "label_golden": bench_label_golden,
+    "label_layout": bench_label_layout,
+    "escpos": bench_escpos,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--sizes", default="10,1000,10000",
+                        type=lambda s: [int(x) for x in s.split(",") if x],
+                        help="comma-separated problem sizes (default: 10,1000,10000)")
+    parser.add_argument("--golden", default="label_golden.json",
+                        help="digest file for label_golden (default: label_golden.json)")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -207,6 +207,19 @@ def load_config() -> dict:
 
 # ── Bluetooth printing ────────────────────────────────────────────────────────
 
+def _raster_height(data: bytes) -> int:
+    """Total rows in a run of ESC/POS GS v 0 raster commands. Tall labels come
+    as several bands; each header has the band's bytes per row at 4-5 and its
+    height at 6-7 (little-endian)."""
+    height = pos = 0
+    while data[pos:pos + 4] == b"\x1d\x76\x30\x00" and len(data) >= pos + 8:
+        row_bytes = data[pos + 4] | (data[pos + 5] << 8)
+        rows      = data[pos + 6] | (data[pos + 7] << 8)
+        height += rows
+        pos    += 8 + row_bytes * rows
+    return height
+
+
 class Printer:
     """Persistent Bluetooth RFCOMM connection with auto-reconnect."""
 
@@ -231,8 +244,7 @@ class Printer:
         self._connect()
 
     def print_bytes(self, data: bytes):
-        # Height is encoded at bytes 6-7 (little-endian) in the ESC/POS GS v 0 header
-        height = data[6] | (data[7] << 8)
+        height = _raster_height(data)
         try:
             self._send(data, height)
         except (OSError, BrokenPipeError):
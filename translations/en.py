@@ -186,6 +186,10 @@ translations = {
     "admin_tr_translation": "Translation",
     "admin_tr_edited": "Edited",
     "admin_tr_empty": "No cached translations yet.",
+    "admin_tr_cache_stats": "In-memory cache (this worker): {hits} hits, {misses} misses, {size}/{maxsize} entries.",
+    "admin_tr_gc_report": "Last clean-up ({at}): {deleted} stale entries removed, {rows_before} → {rows_after} entries, {mb_before} → {mb_after} MB.",
+    "admin_tr_first_page": "First page",
+    "admin_tr_next_page": "Next page",
     "admin_tr_reset_hint": "Discard this translation and let it auto-translate again",
     "admin_tr_reset_confirm": "Discard this translation and re-translate it automatically next time?",
 
@@ -186,6 +186,10 @@ translations = {
     "admin_tr_translation": "Traduction",
     "admin_tr_edited": "Modifiée",
     "admin_tr_empty": "Aucune traduction en cache pour l'instant.",
+    "admin_tr_cache_stats": "Cache en mémoire (ce processus) : {hits} succès, {misses} échecs, {size}/{maxsize} entrées.",
+    "admin_tr_gc_report": "Dernier nettoyage ({at}) : {deleted} entrées obsolètes supprimées, {rows_before} → {rows_after} entrées, {mb_before} → {mb_after} Mo.",
+    "admin_tr_first_page": "Première page",
+    "admin_tr_next_page": "Page suivante",
     "admin_tr_reset_hint": "Supprimer cette traduction et la régénérer automatiquement",
     "admin_tr_reset_confirm": "Supprimer cette traduction et la régénérer automatiquement la prochaine fois ?",
 
@@ -162,6 +162,10 @@ translations = {
     'admin_tr_translation': 'Oversettelse',
     'admin_tr_edited': 'Endret',
     'admin_tr_empty': 'Ingen mellomlagrede oversettelser ennå.',
+    'admin_tr_cache_stats': 'Minnebuffer (denne prosessen): {hits} treff, {misses} bom, {size}/{maxsize} oppføringer.',
+    'admin_tr_gc_report': 'Siste opprydding ({at}): {deleted} utdaterte oppføringer fjernet, {rows_before} → {rows_after} oppføringer, {mb_before} → {mb_after} MB.',
+    'admin_tr_first_page': 'Første side',
+    'admin_tr_next_page': 'Neste side',
     'admin_tr_reset_hint': 'Forkast denne oversettelsen og oversett automatisk på nytt',
     'admin_tr_reset_confirm': 'Forkaste denne oversettelsen og oversette automatisk på nytt neste gang?',
     'Help': 'Hjelp',
@@ -186,6 +186,10 @@ translations = {
     "admin_tr_translation": "Перевод",
     "admin_tr_edited": "Изменено",
     "admin_tr_empty": "Пока нет кэшированных переводов.",
+    "admin_tr_cache_stats": "Кэш в памяти (этот процесс): {hits} попаданий, {misses} промахов, {size}/{maxsize} записей.",
+    "admin_tr_gc_report": "Последняя очистка ({at}): удалено устаревших записей: {deleted}, {rows_before} → {rows_after} записей, {mb_before} → {mb_after} МБ.",
+    "admin_tr_first_page": "Первая страница",
+    "admin_tr_next_page": "Следующая страница",
     "admin_tr_reset_hint": "Удалить этот перевод и перевести заново автоматически",
     "admin_tr_reset_confirm": "Удалить этот перевод и автоматически перевести заново в следующий раз?",
 